@@ -0,0 +1,302 @@
+"""Endpoint benchmark: latency, upstream calls and allocations per API route
+
+Runs the FastAPI app in-process against the upstream stand-in
+(benchmarks.standin), so no Blazegraph or pokeapi.co is needed, and drives
+every main route with a rotating set of Pokemon IDs and types. For each route
+it reports p50/p95/p99 latency, SPARQL and PokeAPI requests per call (counted
+by the stand-in) and the Python memory allocated while serving one request
+(peak and retained, from tracemalloc in a separate pass so tracing does not
+skew the timings).
+
+With --cache warm (default) caches fill during warmup and the numbers are
+steady-state; --cache cold invalidates the response and SPARQL result caches
+before every request (in-process indexes and the species cache stay built).
+Results are written as JSON; --compare flags routes that got slower, make
+more upstream calls or allocate more than a previous run.
+
+    cd Backend && python -m benchmarks.endpoints [--backend memory] [--latency 20] [--cache cold]
+    cd Backend && python -m benchmarks.endpoints --compare benchmarks/results/baseline.json
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import secrets
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from benchmarks.standin import FIXTURES_DIR, FixtureStore, Standin
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+# Admin token the in-process app is started with (--cache cold invalidates caches through the admin API)
+BENCHMARK_ADMIN_TOKEN = secrets.token_hex(16)
+
+# Route name -> path template ({id} and {type} rotate through --ids and --types)
+ROUTES = {
+    "search": "/api/pokemon/search",
+    "list": "/api/pokemon?limit=151",
+    "detail": "/api/pokemon/{id}",
+    "forms": "/api/pokemon/{id}/forms",
+    "card": "/api/pokemon/{id}/card",
+    "type": "/api/pokemon/type/{type}",
+    "evolution-chain": "/api/pokemon/evolution-chain/{id}",
+    "recommendations": "/api/recommendations?pokemon_id={id}",
+}
+
+# Metrics compared by --compare: latencies and allocations relative to
+# --threshold, upstream calls on any increase
+_LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+_CALL_METRICS = ("sparql_calls", "pokeapi_calls")
+_ALLOC_METRICS = ("alloc_peak_kib",)
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return {"p50_ms": value, "p95_ms": value, "p99_ms": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50_ms": cuts[49], "p95_ms": cuts[94], "p99_ms": cuts[98]}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+class RouteBenchmark:
+    """Drives one route through a TestClient and collects its measurements"""
+
+    def __init__(self, client, store: FixtureStore, name: str, template: str,
+                 ids: List[int], types: List[str], cold: bool):
+        self.client = client
+        self.store = store
+        self.name = name
+        self.template = template
+        self.ids = ids
+        self.types = types
+        self.cold = cold
+        self.errors: Dict[int, int] = {}
+        self._iteration = 0
+
+    def _next_path(self) -> str:
+        i = self._iteration
+        self._iteration += 1
+        return self.template.format(id=self.ids[i % len(self.ids)], type=self.types[i % len(self.types)])
+
+    def request(self):
+        """One request: (elapsed ms, SPARQL calls, PokeAPI calls)"""
+        path = self._next_path()
+        if self.cold:
+            invalidated = self.client.post("/api/admin/cache/invalidate",
+                                           headers={"X-Admin-Token": BENCHMARK_ADMIN_TOKEN})
+            if invalidated.status_code != 200:
+                raise SystemExit(f"Cannot invalidate caches: HTTP {invalidated.status_code}")
+        before = self.store.snapshot()
+        started = time.perf_counter()
+        response = self.client.get(path)
+        elapsed = (time.perf_counter() - started) * 1000
+        after = self.store.snapshot()
+        if response.status_code >= 400:
+            self.errors[response.status_code] = self.errors.get(response.status_code, 0) + 1
+        return (elapsed,
+                after.get("sparql", 0) - before.get("sparql", 0),
+                after.get("pokeapi", 0) - before.get("pokeapi", 0))
+
+    def run(self, warmup: int, iterations: int, alloc_iterations: int) -> dict:
+        first_ms, first_sparql, first_pokeapi = self.request()
+        for _ in range(warmup - 1):
+            self.request()
+        self.errors.clear()
+
+        timings, sparql_calls, pokeapi_calls = [], 0, 0
+        for _ in range(iterations):
+            elapsed, sparql, pokeapi = self.request()
+            timings.append(elapsed)
+            sparql_calls += sparql
+            pokeapi_calls += pokeapi
+
+        peaks, retained = [], []
+        tracemalloc.start()
+        try:
+            for _ in range(alloc_iterations):
+                tracemalloc.reset_peak()
+                start, _ = tracemalloc.get_traced_memory()
+                self.request()
+                current, peak = tracemalloc.get_traced_memory()
+                peaks.append(peak - start)
+                retained.append(current - start)
+        finally:
+            tracemalloc.stop()
+
+        result = {"path": self.template, "requests": iterations}
+        result.update(_percentiles(timings))
+        result.update({
+            "mean_ms": statistics.fmean(timings) if timings else 0.0,
+            "max_ms": max(timings, default=0.0),
+            "sparql_calls": sparql_calls / max(iterations, 1),
+            "pokeapi_calls": pokeapi_calls / max(iterations, 1),
+            "alloc_peak_kib": statistics.fmean(peaks) / 1024 if peaks else 0.0,
+            "alloc_retained_kib": statistics.fmean(retained) / 1024 if retained else 0.0,
+            "first_request": {"ms": first_ms, "sparql_calls": first_sparql, "pokeapi_calls": first_pokeapi},
+            "errors": {str(status): count for status, count in sorted(self.errors.items())},
+        })
+        return result
+
+
+def run_benchmarks(args) -> dict:
+    """Start the stand-in, import the app against it and benchmark every selected route"""
+    store = FixtureStore(args.fixtures)
+    with Standin(store, latency=args.latency, jitter=args.jitter,
+                 record_sparql=args.record_sparql, record_pokeapi=args.record_pokeapi) as standin:
+        # config reads the environment at import time, so the app is imported only now
+        os.environ["DATA_BACKEND"] = args.backend
+        os.environ["GRAPHDB_ENDPOINT"] = standin.sparql_endpoint
+        os.environ["POKEAPI_BASE_URL"] = standin.pokeapi_base_url
+        os.environ["POKEAPI_CACHE_PATH"] = ":memory:"
+        os.environ["ADMIN_TOKEN"] = BENCHMARK_ADMIN_TOKEN
+        try:
+            from fastapi.testclient import TestClient
+            app = importlib.import_module("main").app
+        except ImportError as e:
+            raise SystemExit(f"Cannot import the API (main.py) to benchmark it: {e}\n"
+                             f"Run from Backend/ with the backend requirements installed.")
+
+        started = time.perf_counter()
+        with TestClient(app) as client:
+            startup_ms = (time.perf_counter() - started) * 1000
+            startup_calls = store.snapshot()
+            routes = {}
+            for name in args.routes:
+                benchmark = RouteBenchmark(client, store, name, ROUTES[name], args.ids, args.types,
+                                           cold=args.cache == "cold")
+                routes[name] = benchmark.run(args.warmup, args.iterations, args.alloc_iterations)
+        counts = store.snapshot()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "backend": args.backend,
+            "cache": args.cache,
+            "latency_ms": args.latency,
+            "jitter_ms": args.jitter,
+            "warmup": args.warmup,
+            "iterations": args.iterations,
+            "alloc_iterations": args.alloc_iterations,
+            "ids": args.ids,
+            "types": args.types,
+            "startup_ms": startup_ms,
+            "startup_sparql_calls": startup_calls.get("sparql", 0),
+            "fixture_misses": counts.get("sparql_misses", 0) + counts.get("pokeapi_misses", 0),
+            "recorded": counts.get("sparql_recorded", 0) + counts.get("pokeapi_recorded", 0),
+        },
+        "routes": routes,
+    }
+
+
+def print_results(results: dict):
+    meta = results["meta"]
+    print(f"backend={meta['backend']} cache={meta['cache']} upstream latency={meta['latency_ms']:g} ms "
+          f"(+{meta['jitter_ms']:g}) iterations={meta['iterations']} startup={meta['startup_ms']:.0f} ms "
+          f"({meta['startup_sparql_calls']} SPARQL calls)")
+    print(f"{'route':<16} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'sparql':>7} {'pokeapi':>7} "
+          f"{'alloc KiB':>10} {'kept KiB':>9}  errors")
+    for name, route in results["routes"].items():
+        errors = ", ".join(f"{count}x{status}" for status, count in route["errors"].items()) or "-"
+        print(f"{name:<16} {route['p50_ms']:8.2f} {route['p95_ms']:8.2f} {route['p99_ms']:8.2f} "
+              f"{route['sparql_calls']:7.2f} {route['pokeapi_calls']:7.2f} "
+              f"{route['alloc_peak_kib']:10.1f} {route['alloc_retained_kib']:9.1f}  {errors}")
+    if meta["fixture_misses"]:
+        print(f"Warning: {meta['fixture_misses']} upstream requests had no fixture "
+              f"(re-record with --record-sparql / --record-pokeapi)")
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta_ms: float) -> List[str]:
+    """Regressions of results against a baseline run, as printable lines"""
+    regressions = []
+    for name, route in results["routes"].items():
+        old = baseline.get("routes", {}).get(name)
+        if old is None:
+            continue
+        for metric in _LATENCY_METRICS + _ALLOC_METRICS:
+            before, after = old.get(metric), route[metric]
+            if before is None:
+                continue
+            noise_floor = min_delta_ms if metric in _LATENCY_METRICS else 0.0
+            if after > before * (1 + threshold) and after - before > noise_floor:
+                regressions.append(f"{name}: {metric} {before:.2f} -> {after:.2f} "
+                                   f"(+{(after / before - 1) * 100 if before else float('inf'):.0f}%)")
+        for metric in _CALL_METRICS:
+            before, after = old.get(metric), route[metric]
+            if before is not None and after > before + 0.01:
+                regressions.append(f"{name}: {metric} per request {before:.2f} -> {after:.2f}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=["sparql", "memory"], default="sparql")
+    parser.add_argument("--cache", choices=["warm", "cold"], default="warm")
+    parser.add_argument("--routes", nargs="+", choices=list(ROUTES), default=list(ROUTES))
+    parser.add_argument("--ids", type=lambda s: [int(v) for v in s.split(",")], default=[1, 4, 25, 150, 445],
+                        help="Comma-separated Pokemon IDs to rotate through (default: 1,4,25,150,445)")
+    parser.add_argument("--types", type=lambda s: s.split(","), default=["fire", "water", "grass", "dragon", "psychic"],
+                        help="Comma-separated type names for the type route")
+    parser.add_argument("--iterations", type=int, default=100, help="Timed requests per route")
+    parser.add_argument("--warmup", type=int, default=10, help="Untimed requests per route first")
+    parser.add_argument("--alloc-iterations", type=int, default=20, help="Requests per route traced for allocations")
+    parser.add_argument("--latency", type=float, default=10.0, help="Stand-in delay per upstream call in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra upstream delay of up to N ms")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="Recorded responses (default: %(default)s)")
+    parser.add_argument("--record-sparql", metavar="URL", help="Record missing SPARQL fixtures from this endpoint")
+    parser.add_argument("--record-pokeapi", metavar="URL", help="Record missing PokeAPI fixtures from this base URL")
+    parser.add_argument("--out", help="Results file (default: benchmarks/results/endpoints-<backend>-<cache>-<time>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Previous results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative latency/allocation increase counted as a regression (default: 0.10)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5,
+                        help="Ignore latency increases smaller than this (noise floor)")
+    args = parser.parse_args()
+    args.warmup = max(args.warmup, 1)
+
+    results = run_benchmarks(args)
+    print_results(results)
+
+    out = args.out or os.path.join(
+        RESULTS_DIR,
+        f"endpoints-{args.backend}-{args.cache}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if {k: baseline["meta"].get(k) for k in ("backend", "cache", "latency_ms")} != \
+                {k: results["meta"][k] for k in ("backend", "cache", "latency_ms")}:
+            print("Warning: baseline was run with different --backend/--cache/--latency settings")
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+"""Microbenchmark: encoding the full search list and a 1000-row page
+
+Compares FastAPI's default path (jsonable_encoder + json.dumps over dicts)
+with the record layer (orjson, plus cached per-entry fragments for the
+search list). Needs only the Turtle files, not GraphDB.
+
+    cd Backend && python -m benchmarks.serialization [--repeat 50]
+"""
+import argparse
+import json
+import time
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+
+from domain.records import SearchEntry
+from services.memory_store import load_store
+from services.serialization import dumps, search_list_response
+
+
+def _default_encode(content) -> bytes:
+    """What JSONResponse does for a route returning plain dicts"""
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def _time_ms(func: Callable, repeat: int) -> float:
+    func()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    store = load_store()
+    entries = store.search_list(100000)
+    entry_dicts = [entry.to_dict() for entry in entries]
+    page = store.pokemon_page(1000)
+    page_dicts = [pokemon.to_dict() for pokemon in page]
+
+    # Same bytes either way, so the comparison is like for like
+    assert json.loads(_default_encode(entry_dicts)) == json.loads(search_list_response(entries).body)
+    assert json.loads(_default_encode(page_dicts)) == json.loads(dumps(page))
+
+    def cold_fragments():
+        fresh = [SearchEntry(e.id, e.name, e.types, e.image_url) for e in entries]
+        return search_list_response(fresh).body
+
+    results = {
+        f"search list ({len(entries)} entries)": {
+            "dicts + jsonable_encoder + json": _time_ms(lambda: _default_encode(entry_dicts), args.repeat),
+            "records + orjson": _time_ms(lambda: dumps(entries), args.repeat),
+            "cached fragments (cold)": _time_ms(cold_fragments, args.repeat),
+            "cached fragments (warm)": _time_ms(lambda: search_list_response(entries).body, args.repeat),
+        },
+        f"pokemon page ({len(page)} rows)": {
+            "dicts + jsonable_encoder + json": _time_ms(lambda: _default_encode(page_dicts), args.repeat),
+            "records + orjson": _time_ms(lambda: dumps(page), args.repeat),
+        },
+    }
+
+    for title, timings in results.items():
+        baseline = next(iter(timings.values()))
+        print(title)
+        for name, ms in timings.items():
+            print(f"  {name:<34} {ms:8.3f} ms  {baseline / ms:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""Upstream stand-in for the endpoint benchmarks: replays recorded SPARQL and PokeAPI responses
+
+Two local servers share one fixture directory:
+
+- SPARQL (POST /sparql): answers are keyed by the response format asked for
+  (JSON results or CSV) and the query text with whitespace collapsed, and
+  stored as fixtures/sparql/<key>.json
+- PokeAPI (GET /api/v2/...): fixtures/pokeapi/<path>.json holds the raw body
+
+Every response is delayed by --latency ms (plus up to --jitter ms), so route
+timings include realistic upstream round trips. Requests without a fixture
+get a 404 and are counted as misses. With --record-sparql / --record-pokeapi
+misses are forwarded to a real upstream and the answer is saved, so fixtures
+are refreshed by running the benchmark once against live services.
+
+The servers get separate ports because the backend caps concurrency per
+upstream host.
+
+    cd Backend && python -m benchmarks.standin --latency 20
+    cd Backend && python -m benchmarks.standin --record-sparql http://localhost:9999/bigdata/namespace/kb/sparql
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+SPARQL_PATH = "/sparql"
+POKEAPI_PREFIX = "/api/v2/"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_SAFE_PATH_RE = re.compile(r"^[a-z0-9-]+(/[a-z0-9-]+)*$")
+
+
+def sparql_key(query: str, accept: str) -> str:
+    """Fixture key of a query: response format + whitespace-normalized text"""
+    kind = "csv" if "text/csv" in accept else "json"
+    text = _WHITESPACE_RE.sub(" ", query).strip()
+    return hashlib.sha256(f"{kind}\n{text}".encode("utf-8")).hexdigest()[:24]
+
+
+class FixtureStore:
+    """Recorded responses on disk, plus per-upstream request counters"""
+
+    def __init__(self, root: str = FIXTURES_DIR):
+        self.root = root
+        self.counts: Counter = Counter()
+        self._lock = threading.Lock()
+        # Fixtures are read once; parsing them per request would show up in the timings
+        self._loaded: Dict[str, Optional[Tuple[str, bytes]]] = {}
+
+    def count(self, name: str):
+        with self._lock:
+            self.counts[name] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        """Copy of the counters (sparql, pokeapi, *_misses, *_recorded)"""
+        with self._lock:
+            return dict(self.counts)
+
+    def _write(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def sparql_path(self, key: str) -> str:
+        return os.path.join(self.root, "sparql", f"{key}.json")
+
+    def load_sparql(self, key: str) -> Optional[Tuple[str, bytes]]:
+        """(content type, body) of a recorded query, or None"""
+        if key not in self._loaded:
+            try:
+                with open(self.sparql_path(key), "rb") as f:
+                    fixture = json.load(f)
+            except FileNotFoundError:
+                return None
+            self._loaded[key] = (fixture["contentType"], fixture["body"].encode("utf-8"))
+        return self._loaded[key]
+
+    def save_sparql(self, key: str, query: str, content_type: str, body: bytes):
+        fixture = {"query": query, "contentType": content_type, "body": body.decode("utf-8")}
+        self._write(self.sparql_path(key), json.dumps(fixture, ensure_ascii=False, indent=2).encode("utf-8"))
+
+    def pokeapi_path(self, resource: str) -> Optional[str]:
+        """Fixture file of a PokeAPI resource path (e.g. pokemon-species/1), None if unsafe"""
+        resource = resource.strip("/")
+        if not _SAFE_PATH_RE.match(resource):
+            return None
+        return os.path.join(self.root, "pokeapi", f"{resource}.json")
+
+    def load_pokeapi(self, resource: str) -> Optional[bytes]:
+        path = self.pokeapi_path(resource)
+        if path is None or not os.path.exists(path):
+            return None
+        if path not in self._loaded:
+            with open(path, "rb") as f:
+                self._loaded[path] = ("application/json", f.read())
+        return self._loaded[path][1]
+
+    def save_pokeapi(self, resource: str, body: bytes):
+        path = self.pokeapi_path(resource)
+        if path is not None:
+            self._write(path, body)
+
+
+def _forward(request: urllib.request.Request) -> Tuple[int, str, bytes]:
+    """Send a request to the real upstream: (status, content type, body)"""
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.status, response.headers.get("Content-Type", ""), response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers.get("Content-Type", "text/plain"), e.read()
+    except (urllib.error.URLError, OSError) as e:
+        return 502, "text/plain", f"upstream unreachable: {e}".encode("utf-8")
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Shared request handling; configured per server through class attributes"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; with Nagle on, keep-alive
+    # responses would wait for a delayed ACK and add ~40 ms to every call
+    disable_nagle_algorithm = True
+    store: FixtureStore = None
+    upstream: Optional[str] = None
+    latency = 0.0
+    jitter = 0.0
+    quiet = True
+
+    def _delay(self):
+        delay = self.latency + (random.random() * self.jitter if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def _send(self, status: int, body: bytes, content_type: str = "text/plain"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+class SparqlHandler(StandinHandler):
+    """POST /sparql with an application/sparql-query or form-encoded body"""
+
+    def do_POST(self):
+        if urlsplit(self.path).path != SPARQL_PATH:
+            self._send(404, b"not found")
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.startswith("application/x-www-form-urlencoded"):
+            query = parse_qs(body.decode("utf-8")).get("query", [""])[0]
+        else:
+            query = body.decode("utf-8")
+        accept = self.headers.get("Accept", "application/sparql-results+json")
+
+        self.store.count("sparql")
+        self._delay()
+        key = sparql_key(query, accept)
+        recorded = self.store.load_sparql(key)
+        if recorded is not None:
+            self._send(200, recorded[1], recorded[0])
+            return
+
+        if self.upstream is None:
+            self.store.count("sparql_misses")
+            print(f"Stand-in: no SPARQL fixture {key} for:\n{query.strip()[:300]}")
+            self._send(404, f"no fixture for query {key}".encode("utf-8"))
+            return
+
+        status, upstream_type, upstream_body = _forward(urllib.request.Request(
+            self.upstream, data=body, method="POST",
+            headers={"Content-Type": content_type or "application/sparql-query", "Accept": accept}
+        ))
+        if status == 200:
+            self.store.save_sparql(key, query, upstream_type, upstream_body)
+            self.store.count("sparql_recorded")
+        self._send(status, upstream_body, upstream_type)
+
+
+class PokeapiHandler(StandinHandler):
+    """GET /api/v2/<resource>/<id>"""
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if not path.startswith(POKEAPI_PREFIX):
+            self._send(404, b"not found")
+            return
+        resource = path[len(POKEAPI_PREFIX):]
+
+        self.store.count("pokeapi")
+        self._delay()
+        recorded = self.store.load_pokeapi(resource)
+        if recorded is not None:
+            self._send(200, recorded, "application/json")
+            return
+
+        if self.upstream is None:
+            self.store.count("pokeapi_misses")
+            self._send(404, b"Not Found")
+            return
+
+        status, upstream_type, upstream_body = _forward(urllib.request.Request(
+            f"{self.upstream.rstrip('/')}/{resource.strip('/')}",
+            headers={"Accept": "application/json", "User-Agent": "pokedex-benchmark-recorder"}
+        ))
+        if status == 200:
+            self.store.save_pokeapi(resource, upstream_body)
+            self.store.count("pokeapi_recorded")
+        self._send(status, upstream_body, upstream_type or "application/json")
+
+
+class Standin:
+    """Both stand-in servers, running on background threads"""
+
+    def __init__(
+        self,
+        store: FixtureStore,
+        host: str = "127.0.0.1",
+        sparql_port: int = 0,
+        pokeapi_port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        record_sparql: Optional[str] = None,
+        record_pokeapi: Optional[str] = None,
+        quiet: bool = True
+    ):
+        """
+        Args:
+            store: Fixture directory and counters
+            host: Interface to bind
+            sparql_port: SPARQL server port (0 picks a free one)
+            pokeapi_port: PokeAPI server port (0 picks a free one)
+            latency: Delay added to every response, in ms
+            jitter: Random extra delay of up to this many ms
+            record_sparql: Real SPARQL endpoint to forward and record misses to
+            record_pokeapi: Real PokeAPI base URL to forward and record misses to
+            quiet: Do not log every request
+        """
+        self.store = store
+        settings = {"store": store, "latency": latency, "jitter": jitter, "quiet": quiet}
+        self.servers = [
+            ThreadingHTTPServer((host, sparql_port), type(
+                "SparqlStandin", (SparqlHandler,), dict(settings, upstream=record_sparql))),
+            ThreadingHTTPServer((host, pokeapi_port), type(
+                "PokeapiStandin", (PokeapiHandler,), dict(settings, upstream=record_pokeapi))),
+        ]
+        for server in self.servers:
+            server.daemon_threads = True
+        self._threads = []
+
+    @property
+    def sparql_endpoint(self) -> str:
+        host, port = self.servers[0].server_address[:2]
+        return f"http://{host}:{port}{SPARQL_PATH}"
+
+    @property
+    def pokeapi_base_url(self) -> str:
+        host, port = self.servers[1].server_address[:2]
+        return f"http://{host}:{port}{POKEAPI_PREFIX.rstrip('/')}"
+
+    def start(self) -> "Standin":
+        for server in self.servers:
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+    def __enter__(self) -> "Standin":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--sparql-port", type=int, default=9997)
+    parser.add_argument("--pokeapi-port", type=int, default=9996)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="Fixture directory (default: %(default)s)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay per response in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra delay of up to N ms")
+    parser.add_argument("--record-sparql", metavar="URL", help="Forward and record SPARQL misses to this endpoint")
+    parser.add_argument("--record-pokeapi", metavar="URL", help="Forward and record PokeAPI misses to this base URL")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    standin = Standin(FixtureStore(args.fixtures), args.host, args.sparql_port, args.pokeapi_port,
+                      args.latency, args.jitter, args.record_sparql, args.record_pokeapi,
+                      quiet=not args.verbose)
+    print(f"SPARQL stand-in on {standin.sparql_endpoint}, PokeAPI stand-in on {standin.pokeapi_base_url} "
+          f"(fixtures: {args.fixtures}, latency {args.latency:g} ms + up to {args.jitter:g} ms)")
+    standin.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Requests: {standin.store.snapshot()}")
+        standin.stop()
+
+
+if __name__ == "__main__":
+    main()
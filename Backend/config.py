@@ -7,9 +7,55 @@ GRAPHDB_ENDPOINT = os.getenv(
     "http://blazegraph:8080/bigdata/namespace/kb/sparql"
 )
 
+# Data backend: "sparql" queries GraphDB per request, "memory" answers read
+# endpoints from the Turtle files loaded into an in-process store at startup
+DATA_BACKEND = os.getenv("DATA_BACKEND", "sparql").lower()
+
+# Turtle files backing the in-memory store (same files that are loaded into GraphDB);
+# with the SPARQL backend the store is built from GraphDB and these are not read
+TTL_DATA_DIR = os.getenv(
+    "TTL_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Recommender", "data")
+)
+TTL_DATA_FILES = [
+    "pokemon_simple.ttl",
+    "pokemon_abilities_aligned.ttl",
+    "pokemon_evolution_links.ttl",
+]
+# Stored per-Pokemon ex:against_*/weakTo/resistantTo triples. Not loaded: the
+# multipliers are derived from the type chart (domain.type_chart); the file is
+# only read by the consistency checker (python -m ingest.check_type_chart)
+TYPE_EFFECTIVENESS_FILE = "pokemon_type_effectiveness_aligned.ttl"
+
+# Binary snapshot of the in-memory store (mmap-loaded; rebuilt when the Turtle
+# files change). Empty to always parse the Turtle files
+SNAPSHOT_PATH = os.getenv(
+    "SNAPSHOT_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "pokedex.snapshot")
+)
+
+# Upper bound on Pokemon held by the forms index (the full dataset fits with room to spare)
+FORMS_INDEX_MAX_ENTRIES = int(os.getenv("FORMS_INDEX_MAX_ENTRIES", "4096"))
+
+# Prepared SPARQL query result cache (per template; cleared on dataset reload)
+SPARQL_CACHE_TTL = float(os.getenv("SPARQL_CACHE_TTL", "300"))
+SPARQL_CACHE_MAX_ENTRIES = int(os.getenv("SPARQL_CACHE_MAX_ENTRIES", "1024"))
+
+# SPARQL profiler: queries slower than SPARQL_SLOW_QUERY_MS are appended (one
+# JSON object per line) to a size-rotated log. Empty path disables the log
+SPARQL_SLOW_QUERY_MS = float(os.getenv("SPARQL_SLOW_QUERY_MS", "500"))
+SPARQL_SLOW_QUERY_LOG = os.getenv(
+    "SPARQL_SLOW_QUERY_LOG",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "sparql-slow.log")
+)
+SPARQL_SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv("SPARQL_SLOW_QUERY_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+SPARQL_SLOW_QUERY_LOG_BACKUPS = int(os.getenv("SPARQL_SLOW_QUERY_LOG_BACKUPS", "3"))
+
 # SPARQL prefixes used across all queries
 SPARQL_PREFIXES = """
+PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
 PREFIX ex: <http://example.org/>
+PREFIX type: <http://example.org/types/>
 PREFIX poke: <http://example.org/pokemon/>
 PREFIX poke_simple: <http://example.org/pokemon/simple/>
 """
@@ -20,11 +66,57 @@ CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_METHODS = ["*"]
 CORS_ALLOW_HEADERS = ["*"]
 
+# Level of the application's log messages (index builds, upstream errors)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
 # API settings
 API_TITLE = "Pokemon API"
 API_VERSION = "1.0.0"
 API_DESCRIPTION = "FastAPI backend for Pokemon data"
+# Shared secret for the mutating admin endpoints (sent as X-Admin-Token).
+# Unset: those endpoints answer 403 to everyone
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
 
 # External search for Images
 POKEMON_COM_IMAGE_BASE_URL = "https://www.pokemon.com/static-assets/content-assets/cms2/img/pokedex/full"
-RECOMMENDER_URL = os.getenv("RECOMMENDER_URL", "http://localhost:3001")
+# Recommendations precomputed per Pokemon by the in-process recommender (upper bound for ?limit)
+RECOMMENDER_TOP_K = int(os.getenv("RECOMMENDER_TOP_K", "20"))
+# Latency budget for the team builder (greedy fill and local search)
+TEAM_BUILDER_BUDGET_MS = float(os.getenv("TEAM_BUILDER_BUDGET_MS", "100"))
+
+# PokeAPI (height, weight and category are not in the RDF data)
+POKEAPI_BASE_URL = os.getenv("POKEAPI_BASE_URL", "https://pokeapi.co/api/v2")
+# Maximum parallel PokeAPI requests when hydrating or prefetching several Pokemon
+POKEAPI_MAX_CONCURRENCY = int(os.getenv("POKEAPI_MAX_CONCURRENCY", "8"))
+# Persistent species cache (SQLite) and the in-memory LRU in front of it
+POKEAPI_CACHE_PATH = os.getenv(
+    "POKEAPI_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "pokeapi_species.sqlite3")
+)
+POKEAPI_MEMORY_CACHE_SIZE = int(os.getenv("POKEAPI_MEMORY_CACHE_SIZE", "2048"))
+# Fetch uncached species inline instead of returning defaults and refreshing in the background
+POKEAPI_BLOCKING_MISS = os.getenv("POKEAPI_BLOCKING_MISS", "false").lower() == "true"
+
+# Shared async HTTP client: connection pool limits and per-host in-flight caps
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_DEFAULT_HOST_CONCURRENCY = int(os.getenv("HTTP_DEFAULT_HOST_CONCURRENCY", "16"))
+SPARQL_MAX_CONCURRENCY = int(os.getenv("SPARQL_MAX_CONCURRENCY", "32"))
+
+# Per-request upstream call tracing (Server-Timing header, /metrics histograms)
+INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION_ENABLED", "true").lower() == "true"
+# Requests making more upstream calls than this are logged as likely N+1 patterns
+UPSTREAM_CALLS_WARN_THRESHOLD = int(os.getenv("UPSTREAM_CALLS_WARN_THRESHOLD", "10"))
+
+# Response cache (GET /api/* JSON, keyed on path, query and dataset version)
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+RESPONSE_CACHE_MAX_ENTRY_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRY_BYTES", str(4 * 1024 * 1024)))
+# Cache-Control max-age for cacheable responses; clients revalidate with If-None-Match afterwards
+RESPONSE_CACHE_MAX_AGE = int(os.getenv("RESPONSE_CACHE_MAX_AGE", "60"))
+
+# Maximum IDs accepted by POST /api/pokemon/batch
+BATCH_MAX_IDS = int(os.getenv("BATCH_MAX_IDS", "300"))
+
+# NDJSON export: uncompressed bytes buffered per streamed chunk
+EXPORT_CHUNK_BYTES = int(os.getenv("EXPORT_CHUNK_BYTES", str(64 * 1024)))
@@ -0,0 +1,134 @@
+"""Compact Pokemon records shared by all routes (slotted, encoded without jsonable_encoder)"""
+from typing import Dict, List, Optional
+
+import orjson
+
+
+class PokemonRecord:
+    """One Pokemon (or form) as returned by the detail, card and list routes
+
+    Attributes are snake_case; to_dict() produces the camelCase API shape.
+    stats is None for card/list rows and omitted from their JSON.
+    """
+
+    __slots__ = ("id", "name", "types", "image_url", "height", "weight",
+                 "abilities", "category", "evolution_chain", "stats")
+
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        types: Optional[List[str]] = None,
+        image_url: str = "",
+        height: int = 0,
+        weight: int = 0,
+        abilities: Optional[List[str]] = None,
+        category: str = "Pokemon",
+        evolution_chain: Optional[List[int]] = None,
+        stats: Optional[Dict[str, int]] = None
+    ):
+        self.id = id
+        self.name = name
+        self.types = types if types is not None else []
+        self.image_url = image_url
+        self.height = height
+        self.weight = weight
+        self.abilities = abilities if abilities is not None else []
+        self.category = category
+        self.evolution_chain = evolution_chain if evolution_chain is not None else []
+        self.stats = stats
+
+    def apply_species(self, species: dict):
+        """Copy PokeAPI species data (height, weight, category) onto the record"""
+        self.height = species["height"]
+        self.weight = species["weight"]
+        self.category = species["category"]
+
+    def copy(self) -> "PokemonRecord":
+        return PokemonRecord(self.id, self.name, list(self.types), self.image_url, self.height,
+                             self.weight, list(self.abilities), self.category,
+                             list(self.evolution_chain), self.stats)
+
+    def to_dict(self) -> dict:
+        data = {
+            "id": self.id,
+            "name": self.name,
+            "types": self.types,
+            "imageUrl": self.image_url,
+            "height": self.height,
+            "weight": self.weight,
+            "abilities": self.abilities,
+            "category": self.category,
+            "evolutionChain": self.evolution_chain,
+        }
+        if self.stats is not None:
+            data["stats"] = self.stats
+        return data
+
+    def __repr__(self) -> str:
+        return f"PokemonRecord(id={self.id!r}, name={self.name!r})"
+
+
+class SearchEntry:
+    """One search-list form (GET /api/pokemon/search, typeahead index)
+
+    Entries are immutable once built, so each caches its own JSON fragment
+    and a list response is just the fragments joined together.
+    """
+
+    __slots__ = ("id", "name", "types", "image_url", "_encoded")
+
+    def __init__(self, id: int, name: str, types: List[str], image_url: str):
+        self.id = id
+        self.name = name
+        self.types = types
+        self.image_url = image_url
+        self._encoded: Optional[bytes] = None
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "name": self.name, "types": self.types, "imageUrl": self.image_url}
+
+    def encoded(self) -> bytes:
+        """JSON object for this entry (computed once)"""
+        if self._encoded is None:
+            self._encoded = orjson.dumps(self.to_dict())
+        return self._encoded
+
+    def __repr__(self) -> str:
+        return f"SearchEntry(id={self.id!r}, name={self.name!r})"
+
+
+# Keys of an export record, in output order (also the valid ?fields= values)
+EXPORT_FIELDS = (
+    "id", "name", "formIndex", "isBaseForm", "generation", "types", "stats",
+    "abilities", "familyId", "evolutionFamily", "against",
+)
+
+
+def export_record(
+    pokemon_id: int,
+    name: str,
+    form_index: int,
+    is_base: bool,
+    generation: int,
+    types: List[str],
+    stats: Dict[str, int],
+    abilities: List[str],
+    family_id: int,
+    family: List[int],
+    against: Dict[str, Optional[float]]
+) -> dict:
+    """One form of the NDJSON export (same shape for both data backends)"""
+    return {
+        "id": pokemon_id,
+        "name": name,
+        "formIndex": form_index,
+        "isBaseForm": is_base,
+        "generation": generation,
+        "types": types,
+        "stats": stats,
+        "abilities": abilities,
+        "familyId": family_id,
+        "evolutionFamily": family,
+        "against": against,
+    }
@@ -0,0 +1,115 @@
+"""18x18 type chart: damage multipliers derived from a Pokemon's types
+
+The per-Pokemon ex:against_* / ex:weakTo / ex:resistantTo data is fully
+determined by the Pokemon's type1/type2, so it is computed from this chart
+(generation 6+ rules, Fairy included) instead of being loaded or queried.
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# ex:against_* suffixes; the row/column order of the chart and of every multiplier vector
+AGAINST_TYPES = [
+    "bug", "dark", "dragon", "electric", "fairy", "fight", "fire", "flying", "ghost",
+    "grass", "ground", "ice", "normal", "poison", "psychic", "rock", "steel", "water",
+]
+
+# Type names whose ex:against_* suffix is not simply the lowercased name
+AGAINST_TYPE_ALIASES = {"fighting": "fight"}
+
+# Display type name of each AGAINST_TYPES entry ("fight" -> "Fighting")
+TYPE_NAMES = [
+    {suffix: name for name, suffix in AGAINST_TYPE_ALIASES.items()}.get(t, t).capitalize()
+    for t in AGAINST_TYPES
+]
+
+# Attacking type -> defending types it does not hit for 1x
+_NON_NEUTRAL: Dict[str, Dict[str, float]] = {
+    "normal": {"rock": 0.5, "ghost": 0, "steel": 0.5},
+    "fire": {"fire": 0.5, "water": 0.5, "grass": 2, "ice": 2, "bug": 2, "rock": 0.5,
+             "dragon": 0.5, "steel": 2},
+    "water": {"fire": 2, "water": 0.5, "grass": 0.5, "ground": 2, "rock": 2, "dragon": 0.5},
+    "electric": {"water": 2, "electric": 0.5, "grass": 0.5, "ground": 0, "flying": 2, "dragon": 0.5},
+    "grass": {"fire": 0.5, "water": 2, "grass": 0.5, "poison": 0.5, "ground": 2, "flying": 0.5,
+              "bug": 0.5, "rock": 2, "dragon": 0.5, "steel": 0.5},
+    "ice": {"fire": 0.5, "water": 0.5, "grass": 2, "ice": 0.5, "ground": 2, "flying": 2,
+            "dragon": 2, "steel": 0.5},
+    "fight": {"normal": 2, "ice": 2, "poison": 0.5, "flying": 0.5, "psychic": 0.5, "bug": 0.5,
+              "rock": 2, "ghost": 0, "dark": 2, "steel": 2, "fairy": 0.5},
+    "poison": {"grass": 2, "poison": 0.5, "ground": 0.5, "rock": 0.5, "ghost": 0.5, "steel": 0,
+               "fairy": 2},
+    "ground": {"fire": 2, "electric": 2, "grass": 0.5, "poison": 2, "flying": 0, "bug": 0.5,
+               "rock": 2, "steel": 2},
+    "flying": {"electric": 0.5, "grass": 2, "fight": 2, "bug": 2, "rock": 0.5, "steel": 0.5},
+    "psychic": {"fight": 2, "poison": 2, "psychic": 0.5, "dark": 0, "steel": 0.5},
+    "bug": {"fire": 0.5, "grass": 2, "fight": 0.5, "poison": 0.5, "flying": 0.5, "psychic": 2,
+            "ghost": 0.5, "dark": 2, "steel": 0.5, "fairy": 0.5},
+    "rock": {"fire": 2, "ice": 2, "fight": 0.5, "ground": 0.5, "flying": 2, "bug": 2, "steel": 0.5},
+    "ghost": {"normal": 0, "psychic": 2, "ghost": 2, "dark": 0.5},
+    "dragon": {"dragon": 2, "steel": 0.5, "fairy": 0},
+    "dark": {"fight": 0.5, "psychic": 2, "ghost": 2, "dark": 0.5, "fairy": 0.5},
+    "steel": {"fire": 0.5, "water": 0.5, "electric": 0.5, "ice": 2, "rock": 2, "steel": 0.5,
+              "fairy": 2},
+    "fairy": {"fire": 0.5, "fight": 2, "poison": 0.5, "dragon": 2, "dark": 2, "steel": 0.5},
+}
+
+
+def _build_chart() -> np.ndarray:
+    chart = np.ones((len(AGAINST_TYPES), len(AGAINST_TYPES)), dtype=np.float32)
+    for attacker, row in _NON_NEUTRAL.items():
+        for defender, multiplier in row.items():
+            chart[AGAINST_TYPES.index(attacker), AGAINST_TYPES.index(defender)] = multiplier
+    return chart
+
+
+# CHART[attack, defend]: multiplier an attack type deals to a single-typed defender
+CHART = _build_chart()
+CHART.flags.writeable = False
+
+# CHART with an extra neutral defender column, so column -1 means "no type"
+_PADDED = np.concatenate([CHART, np.ones((len(AGAINST_TYPES), 1), dtype=np.float32)], axis=1)
+
+
+def against_column(type_name: str) -> Optional[int]:
+    """Column of the chart for a type name (e.g. "Fighting"), or None"""
+    suffix = type_name.lower()
+    suffix = AGAINST_TYPE_ALIASES.get(suffix, suffix)
+    return AGAINST_TYPES.index(suffix) if suffix in AGAINST_TYPES else None
+
+
+def against_matrix(type1: Sequence[int], type2: Sequence[int]) -> np.ndarray:
+    """Multipliers every Pokemon takes from every attack type, in one vectorized lookup
+
+    Args:
+        type1: Chart column of each Pokemon's first type (-1 if unknown)
+        type2: Chart column of each Pokemon's second type (-1 if none)
+
+    Returns:
+        float32 array of shape (n, 18) in AGAINST_TYPES order; rows without
+        a known type1 are NaN, like Pokemon without stored effectiveness data
+    """
+    type1 = np.asarray(type1, dtype=np.int64)
+    type2 = np.asarray(type2, dtype=np.int64)
+    matrix = (_PADDED[:, type1] * _PADDED[:, type2]).T
+    matrix[type1 < 0] = np.nan
+    return np.ascontiguousarray(matrix, dtype=np.float32)
+
+
+def against(type_names: Sequence[str]) -> Dict[str, float]:
+    """ex:against_* suffix -> multiplier for one Pokemon's type names"""
+    columns = [against_column(name) for name in type_names]
+    columns = [column for column in columns if column is not None][:2]
+    columns += [-1] * (2 - len(columns))
+    row = against_matrix([columns[0]], [columns[1]])[0]
+    return dict(zip(AGAINST_TYPES, row.tolist()))
+
+
+def weak_to(multipliers: Sequence[float]) -> List[str]:
+    """ex:weakTo suffixes: attack types dealing more than 1x"""
+    return [t for t, m in zip(AGAINST_TYPES, multipliers) if m > 1]
+
+
+def resistant_to(multipliers: Sequence[float]) -> List[str]:
+    """ex:resistantTo suffixes: attack types dealing less than 1x (immunities included)"""
+    return [t for t, m in zip(AGAINST_TYPES, multipliers) if m < 1]
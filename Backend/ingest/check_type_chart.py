@@ -0,0 +1,141 @@
+"""Consistency check: type-chart multipliers vs the stored effectiveness triples
+
+Diffs what domain.type_chart derives for every Pokemon (from the base
+form's type1/type2, as the store does) against the ex:against_*,
+ex:weakTo and ex:resistantTo triples in TYPE_EFFECTIVENESS_FILE.
+
+Any divergence makes the check fail. A Pokemon whose forms share one
+resource (Mega/alternate forms) carries every form's type2, so for each
+divergence the checker also reports which type combination the stored data
+matches: usually a base-form type2 that FORM_TYPE2 gets wrong.
+
+    cd Backend && python -m ingest.check_type_chart [--verbose]
+"""
+import argparse
+import math
+import os
+from typing import Dict, List, Optional, Set, Tuple
+
+from config import TTL_DATA_DIR, TYPE_EFFECTIVENESS_FILE
+from domain.type_chart import AGAINST_TYPES, against, against_column, resistant_to, weak_to
+from services.memory_store import EX, PokedexStore
+from services.turtle_parser import read_triples
+from utils import extract_value_from_uri
+
+
+class StoredEffectiveness:
+    """Effectiveness triples of one Pokemon resource"""
+
+    def __init__(self):
+        self.against: Dict[str, float] = {}
+        self.weak_to: Set[str] = set()
+        self.resistant_to: Set[str] = set()
+        self.triples = 0
+
+
+def read_stored(data_dir: str) -> Dict[int, StoredEffectiveness]:
+    """National dex id -> stored effectiveness, from the effectiveness and simple files"""
+    numbers: Dict[str, int] = {}
+    for s, p, o in read_triples(os.path.join(data_dir, "pokemon_simple.ttl")):
+        if p == EX + "number":
+            numbers[s] = int(o.lexical)
+
+    stored: Dict[int, StoredEffectiveness] = {}
+    for s, p, o in read_triples(os.path.join(data_dir, TYPE_EFFECTIVENESS_FILE)):
+        if s not in numbers or not p.startswith(EX):
+            continue
+        entry = stored.setdefault(numbers[s], StoredEffectiveness())
+        entry.triples += 1
+        prop = p[len(EX):]
+        if prop.startswith("against_"):
+            entry.against[prop[len("against_"):]] = float(o.lexical)
+        elif prop in ("weakTo", "resistantTo"):
+            column = against_column(extract_value_from_uri(o))
+            suffix = AGAINST_TYPES[column] if column is not None else extract_value_from_uri(o)
+            (entry.weak_to if prop == "weakTo" else entry.resistant_to).add(suffix)
+    return stored
+
+
+def differences(derived: Dict[str, float], entry: StoredEffectiveness) -> List[str]:
+    """Human-readable differences between derived multipliers and stored triples"""
+    diffs = []
+    for t in AGAINST_TYPES:
+        value = derived[t]
+        stored = entry.against.get(t)
+        if stored is None and math.isnan(value):
+            continue
+        if stored is None or math.isnan(value) or not math.isclose(stored, value):
+            diffs.append(f"against_{t}: stored {stored}, derived {None if math.isnan(value) else value}")
+    multipliers = [derived[t] for t in AGAINST_TYPES]
+    for name, stored_set, derived_list in (("weakTo", entry.weak_to, weak_to(multipliers)),
+                                           ("resistantTo", entry.resistant_to, resistant_to(multipliers))):
+        if stored_set != set(derived_list):
+            diffs.append(f"{name}: stored {sorted(stored_set)}, derived {sorted(derived_list)}")
+    return diffs
+
+
+def explaining_types(store: PokedexStore, row: int, entry: StoredEffectiveness) -> Optional[List[str]]:
+    """type1 plus the type2 candidate (or none) that reproduces the stored data, if any"""
+    type1 = store.type_names[store.type1[row]] if store.type1[row] >= 0 else None
+    if type1 is None:
+        return None
+    for type2 in [None] + store.type2_names(row):
+        types = [type1] + ([type2] if type2 else [])
+        if not differences(against(types), entry):
+            return types
+    return None
+
+
+def compare(store: PokedexStore, stored: Dict[int, StoredEffectiveness]) -> Tuple[int, List[tuple]]:
+    """Count of Pokemon whose derived values match, and (id, name, types, diffs) of the rest
+
+    `types` is the combination the stored data matches, or None.
+    """
+    width = len(AGAINST_TYPES)
+    matching = 0
+    inconsistent = []
+    for row, pokemon_id in enumerate(store.ids):
+        entry = stored.get(pokemon_id)
+        if entry is None:
+            continue
+        derived = dict(zip(AGAINST_TYPES, store.against[row * width:(row + 1) * width]))
+        diffs = differences(derived, entry)
+        if diffs:
+            name = store.form_names[store.form_offsets[row]]
+            inconsistent.append((pokemon_id, name, explaining_types(store, row, entry), diffs))
+        else:
+            matching += 1
+    return matching, inconsistent
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", default=TTL_DATA_DIR)
+    parser.add_argument("--verbose", action="store_true", help="Print every differing value")
+    args = parser.parse_args()
+
+    store = PokedexStore.from_turtle(args.data_dir)
+    stored = read_stored(args.data_dir)
+    matching, errors = compare(store, stored)
+
+    missing = sorted(set(store.ids) - set(stored))
+    unknown = sorted(set(stored) - set(store.ids))
+    print(f"Compared {len(set(store.ids) & set(stored))} Pokemon "
+          f"({sum(entry.triples for entry in stored.values())} stored triples): {matching} identical, "
+          f"{len(errors)} inconsistent")
+    if missing:
+        print(f"No stored effectiveness for {len(missing)} Pokemon: {missing}")
+    if unknown:
+        print(f"Stored effectiveness for {len(unknown)} unknown Pokemon: {unknown}")
+
+    for pokemon_id, name, types, diffs in errors:
+        explained = f"stored data matches {'/'.join(types)}" if types else "no type combination matches"
+        print(f"INCONSISTENT: #{pokemon_id} {name} ({len(diffs)} differences; {explained})")
+        if args.verbose:
+            for diff in diffs:
+                print(f"    {diff}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,49 @@
+"""Compile the Turtle data files into the binary store snapshot
+
+The API does this by itself when the snapshot is missing or stale; run it
+ahead of time to ship a prebuilt snapshot, or with --check to verify one
+against the Turtle files.
+
+    cd Backend && python -m ingest.compile_snapshot
+    cd Backend && python -m ingest.compile_snapshot --out /tmp/pokedex.snapshot --check
+"""
+import argparse
+import os
+import time
+
+from config import SNAPSHOT_PATH, TTL_DATA_DIR, TTL_DATA_FILES
+from services.memory_store import PokedexStore
+from services.snapshot import SnapshotError, read_snapshot, source_digest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", default=TTL_DATA_DIR)
+    parser.add_argument("--out", default=SNAPSHOT_PATH, help="Snapshot file (default: %(default)s)")
+    parser.add_argument("--check", action="store_true",
+                        help="Only verify the existing snapshot against the Turtle files")
+    args = parser.parse_args()
+
+    digest = source_digest(os.path.join(args.data_dir, name) for name in TTL_DATA_FILES)
+
+    if not args.check:
+        started = time.perf_counter()
+        store = PokedexStore.from_turtle(args.data_dir)
+        parsed = time.perf_counter()
+        store.save_snapshot(args.out, digest)
+        print(f"Parsed {len(store)} Pokemon in {(parsed - started) * 1000:.0f} ms, "
+              f"wrote {args.out} ({os.path.getsize(args.out):,} bytes) in "
+              f"{(time.perf_counter() - parsed) * 1000:.0f} ms")
+
+    started = time.perf_counter()
+    try:
+        store = PokedexStore.from_snapshot(read_snapshot(args.out, digest))
+    except SnapshotError as e:
+        print(f"Snapshot check failed: {e}")
+        return 1
+    print(f"Snapshot OK: {len(store)} Pokemon, opened in {(time.perf_counter() - started) * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,181 @@
+"""Incremental ingestion: diff fresh Turtle data against the current snapshot
+
+Triples are grouped by subject ("resource") and each resource is hashed
+over its sorted N-Triples statements, so unchanged Pokemon are skipped by
+comparing one digest each; only resources whose hash differs are diffed
+triple by triple. The result is written as
+
+    delta-insert.nt   triples to add (N-Triples, also valid Turtle)
+    delta-delete.nt   triples to remove
+    delta.ru          SPARQL UPDATE: DELETE DATA / INSERT DATA batches
+
+and can be applied straight to the SPARQL endpoint with --apply, instead
+of re-posting every Turtle file.
+
+    cd Backend && python -m ingest.delta --old ../Recommender/data --new /tmp/fresh
+    cd Backend && python -m ingest.delta --old ../Recommender/data --new /tmp/fresh --apply
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import shutil
+import time
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Set
+
+from config import GRAPHDB_ENDPOINT, TTL_DATA_FILES
+from ingest.loader import Loader
+from services.turtle_parser import format_triple, read_triples
+
+
+class Delta(NamedTuple):
+    deleted: List[str]
+    inserted: List[str]
+    added_resources: int
+    changed_resources: int
+    removed_resources: int
+    unchanged_resources: int
+
+
+def turtle_paths(paths: Iterable[str]) -> List[str]:
+    """Expand directories to the data files the store loads (TTL_DATA_FILES)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in TTL_DATA_FILES
+                         if os.path.exists(os.path.join(path, name)))
+        else:
+            files.append(path)
+    return files
+
+
+def load_resources(paths: Iterable[str]) -> Dict[str, Set[str]]:
+    """Subject IRI -> set of N-Triples statements, over all the given files"""
+    resources: Dict[str, Set[str]] = {}
+    for path in turtle_paths(paths):
+        for triple in read_triples(path):
+            resources.setdefault(triple[0], set()).add(format_triple(triple))
+    return resources
+
+
+def resource_hash(statements: Set[str]) -> str:
+    """Content hash of one resource (independent of triple order in the file)"""
+    digest = hashlib.sha256()
+    for statement in sorted(statements):
+        digest.update(statement.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def compute_delta(old: Dict[str, Set[str]], new: Dict[str, Set[str]]) -> Delta:
+    """Triples to delete and insert to turn `old` into `new`"""
+    deleted: List[str] = []
+    inserted: List[str] = []
+    added = changed = removed = unchanged = 0
+
+    for subject, statements in new.items():
+        previous = old.get(subject)
+        if previous is None:
+            added += 1
+            inserted.extend(sorted(statements))
+        elif resource_hash(previous) == resource_hash(statements):
+            unchanged += 1
+        else:
+            changed += 1
+            deleted.extend(sorted(previous - statements))
+            inserted.extend(sorted(statements - previous))
+
+    for subject, statements in old.items():
+        if subject not in new:
+            removed += 1
+            deleted.extend(sorted(statements))
+
+    return Delta(deleted, inserted, added, changed, removed, unchanged)
+
+
+def update_batches(delta: Delta, batch_size: int) -> Iterator[str]:
+    """SPARQL UPDATE operations, at most batch_size triples each (deletes first)"""
+    for operation, statements in (("DELETE DATA", delta.deleted), ("INSERT DATA", delta.inserted)):
+        for start in range(0, len(statements), batch_size):
+            body = "\n".join(statements[start:start + batch_size])
+            yield f"{operation} {{\n{body}\n}}"
+
+
+def write_delta(delta: Delta, out_dir: str, batch_size: int) -> List[str]:
+    """Write the delta files into out_dir and return their paths"""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = [os.path.join(out_dir, name) for name in ("delta-insert.nt", "delta-delete.nt", "delta.ru")]
+    for path, statements in zip(paths, (delta.inserted, delta.deleted)):
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(f"{statement}\n" for statement in statements)
+    with open(paths[2], "w", encoding="utf-8") as f:
+        f.write(" ;\n".join(update_batches(delta, batch_size)))
+        f.write("\n")
+    return paths
+
+
+async def apply_delta(delta: Delta, endpoint: str, batch_size: int, concurrency: int = 4) -> int:
+    """Send the UPDATE batches in parallel (with the loader's retries); returns the batch count
+
+    Deleted and inserted triples are disjoint, so batches can run in any order.
+
+    Raises:
+        httpx.HTTPError: If a batch is still rejected after retries (other batches stay applied)
+    """
+    updates = list(update_batches(delta, batch_size))
+    async with Loader(endpoint, concurrency) as loader:
+        await asyncio.gather(*(loader.update(update) for update in updates))
+    return len(updates)
+
+
+def update_snapshot(old_paths: List[str], new_paths: List[str]):
+    """Copy the fresh files over the snapshot (directory to directory, or file to file)"""
+    if len(old_paths) == 1 and len(new_paths) == 1 and os.path.isdir(old_paths[0]):
+        for path in turtle_paths(new_paths):
+            shutil.copyfile(path, os.path.join(old_paths[0], os.path.basename(path)))
+    elif len(old_paths) == len(new_paths):
+        for old_path, new_path in zip(old_paths, new_paths):
+            shutil.copyfile(new_path, old_path)
+    else:
+        raise ValueError("--update-snapshot needs matching --old/--new files or a single directory each")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--old", nargs="+", required=True, help="Current snapshot: .ttl files or directories")
+    parser.add_argument("--new", nargs="+", required=True, help="Fresh data: .ttl files or directories")
+    parser.add_argument("--out", default="delta", help="Output directory for the delta files")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Triples per DELETE/INSERT DATA batch")
+    parser.add_argument("--apply", action="store_true", help="Send the UPDATE batches to --endpoint")
+    parser.add_argument("--endpoint", default=GRAPHDB_ENDPOINT)
+    parser.add_argument("--concurrency", type=int, default=4, help="UPDATE requests in flight with --apply")
+    parser.add_argument("--update-snapshot", action="store_true",
+                        help="Copy the fresh files over the snapshot once the delta is written/applied")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    old = load_resources(args.old)
+    new = load_resources(args.new)
+    delta = compute_delta(old, new)
+    elapsed = time.perf_counter() - started
+    print(f"Diffed {len(old)} -> {len(new)} resources in {elapsed:.2f}s: "
+          f"{delta.added_resources} added, {delta.changed_resources} changed, "
+          f"{delta.removed_resources} removed, {delta.unchanged_resources} unchanged")
+    print(f"Delta: -{len(delta.deleted)} / +{len(delta.inserted)} triples")
+
+    for path in write_delta(delta, args.out, args.batch_size):
+        print(f"Wrote {path}")
+
+    if args.apply and (delta.deleted or delta.inserted):
+        started = time.perf_counter()
+        sent = asyncio.run(apply_delta(delta, args.endpoint, args.batch_size, args.concurrency))
+        print(f"Applied {sent} UPDATE batches to {args.endpoint} in {time.perf_counter() - started:.2f}s")
+        print("Reload the API's data (POST /api/admin/reload with X-Admin-Token) to pick up the change")
+
+    if args.update_snapshot:
+        update_snapshot(args.old, args.new)
+        print("Snapshot updated")
+
+
+if __name__ == "__main__":
+    main()
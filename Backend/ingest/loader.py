@@ -0,0 +1,285 @@
+"""Bulk loader: stream Turtle files into the SPARQL store in parallel batches
+
+Each file is parsed incrementally into N-Triples batches of --batch-size
+triples, which are sent as SPARQL UPDATE `INSERT DATA` requests by
+--concurrency workers (with retries and exponential backoff). Afterwards
+every file is verified by re-streaming its batches as `VALUES` count
+queries, so a missing triple is reported against the file it came from
+rather than as a wrong grand total.
+
+    cd Backend && python -m ingest.loader --endpoint http://localhost:9999/bigdata/namespace/kb/sparql
+    cd Backend && python -m ingest.loader --dry-run
+    cd Backend && python -m ingest.loader path/to/file.ttl --batch-size 5000 --concurrency 8
+
+Replaces load-data.ps1 (which needed PowerShell and posted whole files).
+See ingest/sparql_standin.py for an in-memory endpoint to test against.
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+
+from config import GRAPHDB_ENDPOINT, TTL_DATA_DIR, TTL_DATA_FILES
+from services.turtle_parser import format_triple, read_triples
+
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def ntriples_batches(path: str, batch_size: int) -> Iterator[List[str]]:
+    """N-Triples statements of a Turtle file, batch_size at a time"""
+    batch: List[str] = []
+    for triple in read_triples(path):
+        batch.append(format_triple(triple))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def insert_data(statements: List[str]) -> str:
+    return "INSERT DATA {\n" + "\n".join(statements) + "\n}"
+
+
+def count_query(statements: List[str]) -> str:
+    """SELECT counting how many of the statements are in the store"""
+    rows = "\n".join(f"({statement[:-2]})" for statement in statements)
+    return f"SELECT (COUNT(*) AS ?count) WHERE {{\nVALUES (?s ?p ?o) {{\n{rows}\n}}\n?s ?p ?o\n}}"
+
+
+class FileReport:
+    """Per-file counters"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.triples = 0
+        self.batches = 0
+        self.verified: Optional[int] = None
+        self.failed_batches = 0
+        self.seconds = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.failed_batches == 0 and (self.verified is None or self.verified == self.triples)
+
+
+class Loader:
+    """Parallel batch uploader for one SPARQL endpoint
+
+    Args:
+        endpoint: SPARQL endpoint accepting both queries and updates
+        concurrency: Requests in flight
+        max_retries: Retries per batch on 429/5xx/connection errors
+        backoff_base: First backoff delay in seconds (doubled per retry, with jitter)
+        timeout: Per-request timeout in seconds
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        concurrency: int = 4,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        timeout: float = 120.0
+    ):
+        self.endpoint = endpoint
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "Loader":
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        self._client = httpx.AsyncClient(timeout=self.timeout, limits=limits)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+        self._client = None
+
+    async def _post(self, data: Dict[str, str], accept: Optional[str] = None) -> httpx.Response:
+        headers = {"Accept": accept} if accept else None
+        attempt = 0
+        while True:
+            try:
+                response = await self._client.post(self.endpoint, data=data, headers=headers)
+                if response.status_code not in RETRY_STATUS:
+                    response.raise_for_status()
+                    return response
+                error: Exception = httpx.HTTPStatusError(
+                    f"HTTP {response.status_code}", request=response.request, response=response
+                )
+            except httpx.TransportError as e:
+                error = e
+            if attempt >= self.max_retries:
+                raise error
+            delay = self.backoff_base * (2 ** attempt)
+            await asyncio.sleep(random.uniform(delay / 2, delay))
+            attempt += 1
+
+    async def update(self, update: str):
+        """Send one SPARQL UPDATE request (retried like every other request)"""
+        await self._post({"update": update})
+
+    async def count(self, statements: Optional[List[str]] = None) -> int:
+        """Triples in the store, or how many of `statements` are present"""
+        query = count_query(statements) if statements else "SELECT (COUNT(*) AS ?count) WHERE { ?s ?p ?o }"
+        response = await self._post({"query": query}, accept="application/sparql-results+json")
+        bindings = response.json()["results"]["bindings"]
+        return int(bindings[0]["count"]["value"]) if bindings else 0
+
+    async def _run(self, path: str, batch_size: int, handle) -> None:
+        """Stream a file's batches through `concurrency` workers calling handle(batch)
+
+        The queue is bounded, so at most about 2 x concurrency batches are in memory.
+        If handle (or parsing) raises, everything is cancelled and the error is
+        re-raised; a dead worker would otherwise leave the producer blocked on
+        a full queue forever.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async def worker():
+            while True:
+                batch = await queue.get()
+                try:
+                    if batch is None:
+                        return
+                    await handle(batch)
+                finally:
+                    queue.task_done()
+
+        async def produce():
+            for batch in ntriples_batches(path, batch_size):
+                await queue.put(batch)
+            for _ in workers:
+                await queue.put(None)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        producer = asyncio.create_task(produce())
+        try:
+            # gather raises as soon as any task fails
+            await asyncio.gather(producer, *workers)
+        finally:
+            for task in [producer, *workers]:
+                task.cancel()
+            await asyncio.gather(producer, *workers, return_exceptions=True)
+
+    async def load_file(self, path: str, batch_size: int, verify: bool = True) -> FileReport:
+        report = FileReport(path)
+        started = time.perf_counter()
+
+        async def upload(batch: List[str]):
+            report.triples += len(batch)
+            report.batches += 1
+            try:
+                await self.update(insert_data(batch))
+            except httpx.HTTPError as e:
+                report.failed_batches += 1
+                print(f"  batch of {len(batch)} triples failed: {e!r}")
+
+        await self._run(path, batch_size, upload)
+        report.seconds = time.perf_counter() - started
+
+        if verify:
+            present = 0
+
+            async def check(batch: List[str]):
+                nonlocal present
+                try:
+                    found = await self.count(batch)
+                except httpx.HTTPError as e:
+                    print(f"  verification of {len(batch)} triples failed: {e!r}")
+                    return
+                present += found
+
+            await self._run(path, batch_size, check)
+            report.verified = present
+        return report
+
+
+def dry_run_file(path: str, batch_size: int) -> FileReport:
+    """Parse and batch a file without sending anything"""
+    report = FileReport(path)
+    started = time.perf_counter()
+    for batch in ntriples_batches(path, batch_size):
+        insert_data(batch)
+        report.triples += len(batch)
+        report.batches += 1
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def print_report(report: FileReport):
+    rate = report.triples / report.seconds if report.seconds else 0.0
+    line = (f"{os.path.basename(report.path)}: {report.triples} triples in {report.batches} batches, "
+            f"{report.seconds:.2f}s ({rate:,.0f} triples/s)")
+    if report.failed_batches:
+        line += f", {report.failed_batches} batches FAILED"
+    if report.verified is not None:
+        status = "ok" if report.verified == report.triples else "MISMATCH"
+        line += f", verified {report.verified}/{report.triples} {status}"
+    print(line)
+
+
+async def load(args: argparse.Namespace) -> List[FileReport]:
+    reports = []
+    async with Loader(args.endpoint, args.concurrency, args.max_retries) as loader:
+        before = await loader.count()
+        print(f"{args.endpoint}: {before} triples before loading")
+        for path in args.files:
+            report = await loader.load_file(path, args.batch_size, verify=not args.no_verify)
+            print_report(report)
+            reports.append(report)
+        after = await loader.count()
+        print(f"{args.endpoint}: {after} triples after loading (+{after - before})")
+    return reports
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*",
+                        help="Turtle files (default: TTL_DATA_FILES from TTL_DATA_DIR)")
+    parser.add_argument("--endpoint", default=GRAPHDB_ENDPOINT)
+    parser.add_argument("--batch-size", type=int, default=2000, help="Triples per INSERT DATA request")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight")
+    parser.add_argument("--max-retries", type=int, default=5, help="Retries per batch")
+    parser.add_argument("--no-verify", action="store_true", help="Skip the per-file count check")
+    parser.add_argument("--dry-run", action="store_true", help="Parse and batch only; send nothing")
+    args = parser.parse_args()
+    if not args.files:
+        args.files = [os.path.join(TTL_DATA_DIR, name) for name in TTL_DATA_FILES]
+
+    missing = [path for path in args.files if not os.path.exists(path)]
+    if missing:
+        print(f"File not found: {', '.join(missing)}")
+        return 1
+
+    started = time.perf_counter()
+    if args.dry_run:
+        reports = []
+        for path in args.files:
+            report = dry_run_file(path, args.batch_size)
+            print_report(report)
+            reports.append(report)
+    else:
+        try:
+            reports = asyncio.run(load(args))
+        except httpx.HTTPError as e:
+            print(f"Cannot reach {args.endpoint}: {e!r}")
+            return 1
+
+    elapsed = time.perf_counter() - started
+    total = sum(report.triples for report in reports)
+    print(f"Total: {total} triples from {len(reports)} files in {elapsed:.2f}s "
+          f"({total / elapsed if elapsed else 0:,.0f} triples/s)")
+    return 0 if all(report.ok for report in reports) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
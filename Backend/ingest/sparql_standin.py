@@ -0,0 +1,124 @@
+"""In-memory SPARQL endpoint stand-in for testing the ingest tools offline
+
+Understands exactly what ingest.loader and ingest.delta send, nothing more:
+
+- update=INSERT DATA { ... } / DELETE DATA { ... } with one N-Triples
+  statement per line (several operations may be joined with ';')
+- query=SELECT (COUNT(*) AS ?count) WHERE { ?s ?p ?o }
+- query=SELECT (COUNT(*) AS ?count) WHERE { VALUES (?s ?p ?o) { (...) ... } ?s ?p ?o }
+
+Responses use the SPARQL JSON results format. --fail-rate answers a
+fraction of requests with 503 to exercise the retry path.
+
+    cd Backend && python -m ingest.sparql_standin --port 9998
+    cd Backend && python -m ingest.loader --endpoint http://127.0.0.1:9998/sparql
+"""
+import argparse
+import json
+import random
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Set
+from urllib.parse import parse_qs, urlsplit
+
+
+_OPERATION_RE = re.compile(r"(INSERT|DELETE) DATA \{\n(.*?)\n\}", re.S)
+_VALUES_ROW_RE = re.compile(r"^\((.*)\)$", re.M)
+
+
+class TripleStore:
+    """A set of N-Triples statements (normalized to end in ' .')"""
+
+    def __init__(self):
+        self.statements: Set[str] = set()
+        self.lock = threading.Lock()
+
+    def update(self, update: str) -> int:
+        changed = 0
+        with self.lock:
+            for operation, body in _OPERATION_RE.findall(update):
+                for line in body.splitlines():
+                    line = line.strip()
+                    if not line:
+                        continue
+                    if operation == "INSERT":
+                        self.statements.add(line)
+                    else:
+                        self.statements.discard(line)
+                    changed += 1
+        return changed
+
+    def count(self, query: str) -> int:
+        if "VALUES" not in query:
+            return len(self.statements)
+        rows = _VALUES_ROW_RE.findall(query)
+        with self.lock:
+            return sum(1 for row in rows if f"{row} ." in self.statements)
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    store = TripleStore()
+    fail_rate = 0.0
+    quiet = False
+
+    def _send(self, status: int, body: bytes, content_type: str = "text/plain"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, params: dict):
+        if self.fail_rate and random.random() < self.fail_rate:
+            self._send(503, b"injected failure")
+            return
+        if "update" in params:
+            changed = self.store.update(params["update"][0])
+            self._send(200, f"{changed} statements".encode("utf-8"))
+        elif "query" in params:
+            count = self.store.count(params["query"][0])
+            results = {
+                "head": {"vars": ["count"]},
+                "results": {"bindings": [{"count": {
+                    "type": "literal",
+                    "datatype": "http://www.w3.org/2001/XMLSchema#integer",
+                    "value": str(count),
+                }}]},
+            }
+            self._send(200, json.dumps(results).encode("utf-8"), "application/sparql-results+json")
+        else:
+            self._send(400, b"expected a query or update parameter")
+
+    def do_GET(self):
+        self._handle(parse_qs(urlsplit(self.path).query))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self._handle(parse_qs(self.rfile.read(length).decode("utf-8")))
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9998)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered 503")
+    parser.add_argument("--quiet", action="store_true", help="Do not log requests")
+    args = parser.parse_args()
+
+    StandinHandler.fail_rate = args.fail_rate
+    StandinHandler.quiet = args.quiet
+    server = ThreadingHTTPServer((args.host, args.port), StandinHandler)
+    print(f"SPARQL stand-in on http://{args.host}:{args.port}/sparql")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
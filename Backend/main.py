@@ -1,32 +1,63 @@
 """Main FastAPI application with Pokemon API routes"""
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional
+from fastapi.responses import HTMLResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional, Tuple
 from urllib.parse import unquote
-import requests
+import asyncio
+import hmac
+import logging
 
 from config import (
-    API_TITLE, API_VERSION, API_DESCRIPTION,
+    API_TITLE, API_VERSION, API_DESCRIPTION, ADMIN_TOKEN, LOG_LEVEL,
     CORS_ORIGINS, CORS_ALLOW_CREDENTIALS, CORS_ALLOW_METHODS, CORS_ALLOW_HEADERS,
-    RECOMMENDER_URL
+    RECOMMENDER_TOP_K, TEAM_BUILDER_BUDGET_MS, DATA_BACKEND, POKEMON_COM_IMAGE_BASE_URL,
+    BATCH_MAX_IDS
 )
 from services.sparql_service import (
-    execute_sparql_query,
-    get_pokemon_forms_from_sparql,
-    get_evolution_chain_from_sparql,
-    _pokemon_forms_cache
+    get_pokemon_rows_bulk,
+    get_pokemon_details_bulk,
+    get_pokemon_details_by_name,
+    get_search_list_from_sparql,
+    explain_query,
+    profiler,
+    query_cache_stats,
+    run_query,
+    template_params
 )
-from services.pokeapi_service import fetch_pokeapi_species_data
+from services.pokeapi_service import fetch_pokeapi_species_data, fetch_pokeapi_species_data_bulk
+from services.http_client import close_http_client, open_http_client
+from services.instrumentation import InstrumentationMiddleware, metrics
+from services.memory_store import PokedexStore, get_store
+from services.dataset import bump_dataset_version, reload_dataset
+from services.forms_index import get_forms_index, get_pokemon_forms
+from services.name_index import get_name_index
+from services.response_cache import ResponseCacheMiddleware, response_cache
+from services.serialization import FastJSONResponse, json_response, search_list_response
+from services.evolution_index import get_evolution_chain, get_evolution_index
+from services.export import ndjson_stream, parse_fields
+from services.search_index import get_search_index
+from services.recommender import get_recommender
+from services.team_builder import TEAM_SIZE, get_team_builder
+from services.similarity_index import get_stat_index
 from domain.pokemon_logic import get_correct_type2_for_form, parse_abilities_from_string
-from utils import format_pokemon_name, extract_value_from_uri, get_pokemon_image_url, is_base_form
+from domain.records import PokemonRecord
+from utils import format_pokemon_name, extract_value_from_uri, get_pokemon_image_url
+
+logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 
 # Initialize FastAPI app
 app = FastAPI(
     title=API_TITLE,
     version=API_VERSION,
-    description=API_DESCRIPTION
+    description=API_DESCRIPTION,
+    default_response_class=FastJSONResponse
 )
 
+# Cache GET /api/* responses (added before CORS so CORS headers stay per-request)
+app.add_middleware(ResponseCacheMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -36,432 +67,568 @@ app.add_middleware(
     allow_headers=CORS_ALLOW_HEADERS,
 )
 
+# Trace upstream calls per request (outermost, so Server-Timing covers the whole request)
+app.add_middleware(InstrumentationMiddleware)
+
+
+@app.on_event("startup")
+async def load_dataset():
+    """Open the upstream connection pool, load the data backend and build the in-process indexes"""
+    await open_http_client()
+    await reload_dataset()
+
+
+@app.on_event("shutdown")
+async def close_upstream_connections():
+    """Close the pooled upstream HTTP connections"""
+    await close_http_client()
+
 
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
+def memory_store() -> Optional[PokedexStore]:
+    """Return the in-memory store if it is the configured data backend"""
+    if DATA_BACKEND == "memory":
+        return get_store()
+    return None
+
+
+# "stats" payload key -> SPARQL variable of the detail query
+STAT_VARIABLES = {
+    "hp": "hp",
+    "attack": "attack",
+    "defense": "defense",
+    "specialAttack": "spAttack",
+    "specialDefense": "spDefense",
+    "speed": "speed",
+}
+
+
 def parse_pokemon_from_binding(
     binding: dict, 
     include_stats: bool = False, 
-    fetch_pokeapi: bool = False
-) -> dict:
-    """Parse SPARQL binding into Pokemon dict
+    pokeapi_data: Optional[dict] = None
+) -> PokemonRecord:
+    """Parse SPARQL binding into a Pokemon record
     
     Args:
         binding: SPARQL query result binding
         include_stats: Whether to include stat fields
-        fetch_pokeapi: Whether to fetch additional data from PokeAPI
+        pokeapi_data: Species data already fetched from PokeAPI (defaults if omitted)
         
     Returns:
-        Dict with Pokemon data
+        PokemonRecord (image URL and evolution chain are set by the caller)
     """
-    pokemon_id = int(binding.get("id", {}).get("value", 0))
-    raw_name = binding.get("name", {}).get("value", "Unknown")
-    
-    # Fetch PokeAPI data if requested
-    if fetch_pokeapi:
-        pokeapi_data = fetch_pokeapi_species_data(pokemon_id)
-    else:
-        pokeapi_data = {"height": 0, "weight": 0, "category": "Pokemon"}
-    
-    pokemon = {
-        "id": pokemon_id,
-        "name": raw_name,
-        "types": [],
-        "imageUrl": "",  # Will be set later
-        "height": pokeapi_data["height"],
-        "weight": pokeapi_data["weight"],
-        "abilities": [],
-        "category": pokeapi_data["category"],
-        "evolutionChain": [],
-    }
+    pokemon = PokemonRecord(
+        int(binding.get("id", {}).get("value", 0)),
+        binding.get("name", {}).get("value", "Unknown")
+    )
+    if pokeapi_data is not None:
+        pokemon.apply_species(pokeapi_data)
     
     # Parse types
     if "type1" in binding:
-        pokemon["types"].append(extract_value_from_uri(binding["type1"]["value"]))
+        pokemon.types.append(extract_value_from_uri(binding["type1"]["value"]))
     if "type2" in binding:
-        pokemon["types"].append(extract_value_from_uri(binding["type2"]["value"]))
+        pokemon.types.append(extract_value_from_uri(binding["type2"]["value"]))
     
     # Parse abilities
     if "abilities" in binding:
         abilities_str = binding["abilities"]["value"]
-        pokemon["abilities"] = parse_abilities_from_string(abilities_str)
+        pokemon.abilities = parse_abilities_from_string(abilities_str)
     
     # Parse stats if requested
     if include_stats:
-        pokemon["stats"] = {
-            "hp": int(binding.get("hp", {}).get("value", 0)),
-            "attack": int(binding.get("attack", {}).get("value", 0)),
-            "defense": int(binding.get("defense", {}).get("value", 0)),
-            "specialAttack": int(binding.get("spAttack", {}).get("value", 0)),
-            "specialDefense": int(binding.get("spDefense", {}).get("value", 0)),
-            "speed": int(binding.get("speed", {}).get("value", 0)),
+        pokemon.stats = {
+            key: int(binding.get(variable, {}).get("value", 0))
+            for key, variable in STAT_VARIABLES.items()
         }
     
     return pokemon
 
 
+def record_from_bindings(
+    bindings: List[dict],
+    include_stats: bool = False,
+    pokeapi_data: Optional[Dict[str, any]] = None
+) -> PokemonRecord:
+    """Record for the form of the first binding, as PokedexStore builds it
+    
+    A Pokemon's forms share one resource, so its rows carry every form's
+    type2 and stat values; the form's own type2 is picked by
+    get_correct_type2_for_form from all type2 values in `bindings` (the rows
+    of one Pokemon), multi-valued stats keep the lowest value and abilities
+    are sorted by name.
+    
+    Args:
+        bindings: Rows of one Pokemon, the form to build first
+        include_stats: Whether to include stat fields
+        pokeapi_data: Species data already fetched from PokeAPI (defaults if omitted)
+    """
+    pokemon = parse_pokemon_from_binding(bindings[0], include_stats, pokeapi_data)
+    type2s = {extract_value_from_uri(b["type2"]["value"]) for b in bindings if "type2" in b}
+    type2 = get_correct_type2_for_form(pokemon.name, type2s)
+    types = []
+    if "type1" in bindings[0]:
+        types.append(extract_value_from_uri(bindings[0]["type1"]["value"]))
+    if type2:
+        types.append(type2)
+    pokemon.types = types
+    
+    if "abilities" in bindings[0]:
+        names = sorted(bindings[0]["abilities"]["value"].split(","))
+        pokemon.abilities = parse_abilities_from_string(",".join(names))
+    if include_stats:
+        for key, variable in STAT_VARIABLES.items():
+            values = [int(b[variable]["value"]) for b in bindings if variable in b]
+            pokemon.stats[key] = min(values) if values else 0
+    return pokemon
+
+
+def forms_from_detail_bindings(
+    pokemon_id: int, 
+    bindings: List[dict], 
+    all_forms: List[dict]
+) -> List[PokemonRecord]:
+    """One detail record per form from a Pokemon's pokemon_details bindings
+    
+    Args:
+        pokemon_id: The Pokemon's national dex number
+        bindings: Its detail bindings (one per name x type2, ordered by name)
+        all_forms: Its forms list (for image URLs)
+        
+    Returns:
+        Records ordered by name, with the type2 resolved per form and image URLs set
+    """
+    # Every row of the Pokemon carries all of its type2 values, so each form
+    # is resolved against the full set
+    by_name: Dict[str, List[dict]] = {}
+    for binding in bindings:
+        by_name.setdefault(binding.get("name", {}).get("value", "Unknown"), []).append(binding)
+    
+    forms = []
+    for pokemon_name, form_bindings in by_name.items():
+        pokemon = record_from_bindings(form_bindings + bindings, include_stats=True)
+        pokemon.image_url = get_pokemon_image_url(pokemon_id, pokemon_name, all_forms)
+        forms.append(pokemon)
+    return forms
+
+
+def records_by_type(
+    bindings: List[dict],
+    type_name: str,
+    all_forms: Dict[int, List[dict]],
+    limit: int = 100
+) -> List[PokemonRecord]:
+    """Forms having a type, from the rows of the Pokemon whose resource has it
+    
+    The resource carries every form's type2, so forms are filtered on their
+    resolved types (Mewtwo is not Fighting, Mega Mewtwo X is); the limit
+    counts forms, as in PokedexStore.by_type.
+    
+    Args:
+        bindings: pokemon_by_type rows, ordered by id and name
+        type_name: Display type name (e.g. "Fire")
+        all_forms: Forms of every Pokemon in the rows, for image URLs
+        limit: Maximum number of records
+    """
+    rows: Dict[Tuple[int, str], List[dict]] = {}
+    for binding in bindings:
+        rows.setdefault((int(binding["id"]["value"]), binding["name"]["value"]), []).append(binding)
+    
+    results = []
+    for (pokemon_id, name), form_bindings in rows.items():
+        pokemon = record_from_bindings(form_bindings)
+        if type_name not in pokemon.types:
+            continue
+        if len(results) >= limit:
+            break
+        pokemon.image_url = get_pokemon_image_url(pokemon_id, name, all_forms.get(pokemon_id))
+        results.append(pokemon)
+    return results
+
+
+async def hydrate_pokemon_details(
+    pokemon_ids: List[int], 
+    evolution_chain: Optional[List[int]] = None
+) -> List[PokemonRecord]:
+    """Build full detail records (as returned by get_pokemon_by_id) for many Pokemon
+    
+    Uses one detail query and one forms query for the whole list, fetches
+    PokeAPI species data concurrently and resolves evolution chains from the
+    index, instead of one get_pokemon_by_id call per Pokemon.
+    
+    Args:
+        pokemon_ids: National dex numbers, in the desired output order
+        evolution_chain: Chain shared by all members (e.g. an evolution family);
+                         computed per Pokemon if omitted
+        
+    Returns:
+        List of Pokemon records in request order; unknown IDs are skipped
+    """
+    store = memory_store()
+    if store:
+        details = {}
+        for pokemon_id in pokemon_ids:
+            pokemon = store.card(pokemon_id, include_stats=True)
+            if pokemon is not None:
+                details[pokemon_id] = pokemon
+    else:
+        bindings = await get_pokemon_details_bulk(pokemon_ids)
+        all_forms = await get_forms_index().get_many(bindings)
+        details = {}
+        for pokemon_id, detail_bindings in bindings.items():
+            pokemon = record_from_bindings(detail_bindings, include_stats=True)
+            forms = all_forms[pokemon_id]
+            pokemon.image_url = get_pokemon_image_url(pokemon_id, pokemon.name, forms)
+            details[pokemon_id] = pokemon
+    
+    species = await fetch_pokeapi_species_data_bulk(list(details))
+    
+    results = []
+    for pokemon_id in pokemon_ids:
+        if pokemon_id not in details:
+            continue
+        pokemon = details[pokemon_id].copy()
+        pokemon.apply_species(species[pokemon_id])
+        pokemon.evolution_chain = (
+            evolution_chain if evolution_chain is not None else await get_evolution_chain(pokemon_id)
+        )
+        results.append(pokemon)
+    
+    return results
+
+
+async def load_pokemon_cards(pokemon_ids: List[int]) -> Dict[int, PokemonRecord]:
+    """Card records (as returned by /card) for many Pokemon
+    
+    Uses one rows query and one forms lookup for the whole list.
+    
+    Returns:
+        Dict mapping each found ID to its card
+    """
+    store = memory_store()
+    if store:
+        cards = {}
+        for pokemon_id in pokemon_ids:
+            pokemon = store.card(pokemon_id)
+            if pokemon is not None:
+                cards[pokemon_id] = pokemon
+        return cards
+    
+    rows = await get_pokemon_rows_bulk(pokemon_ids)
+    all_forms = await get_forms_index().get_many(rows)
+    cards = {}
+    for pokemon_id, bindings in rows.items():
+        # First binding per ID is the alphabetically first name (ORDER BY ?id ?name)
+        pokemon = record_from_bindings(bindings)
+        pokemon.image_url = get_pokemon_image_url(pokemon_id, pokemon.name, all_forms[pokemon_id])
+        cards[pokemon_id] = pokemon
+    return cards
+
+
+async def load_pokemon_forms_details(pokemon_ids: List[int]) -> Dict[int, List[PokemonRecord]]:
+    """Forms lists (as returned by /forms) for many Pokemon
+    
+    Uses one detail query and one forms lookup for the whole list; PokeAPI
+    species data is fetched concurrently for the Pokemon found.
+    
+    Returns:
+        Dict mapping each found ID to its forms
+    """
+    store = memory_store()
+    if store:
+        results = {}
+        for pokemon_id in pokemon_ids:
+            forms = store.forms_detail(pokemon_id)
+            if forms:
+                results[pokemon_id] = forms
+    else:
+        data = await run_query("pokemon_details", id=pokemon_ids)
+        bindings_by_id: Dict[int, List[dict]] = {}
+        for binding in data["results"]["bindings"]:
+            bindings_by_id.setdefault(int(binding["id"]["value"]), []).append(binding)
+        
+        all_forms = await get_forms_index().get_many(bindings_by_id)
+        results = {
+            pokemon_id: forms_from_detail_bindings(pokemon_id, bindings, all_forms[pokemon_id])
+            for pokemon_id, bindings in bindings_by_id.items()
+        }
+    
+    species = await fetch_pokeapi_species_data_bulk(list(results))
+    for pokemon_id, forms in results.items():
+        forms[0].apply_species(species[pokemon_id])
+        evolution_chain = await get_evolution_chain(pokemon_id)
+        for form in forms:
+            form.evolution_chain = evolution_chain
+    return results
+
+
 # ============================================================================
 # API Routes
 # ============================================================================
 
 @app.get("/")
-def root():
+async def root():
     """API health check"""
     return {"status": "ok", "message": "Pokemon API is running"}
 
 
 @app.get("/api/pokemon/search")
-def get_search_list(limit: int = Query(default=1000, le=2000)):
+async def get_search_list(limit: int = Query(default=1000, le=2000)):
     """Lightweight endpoint for search - returns all distinct forms with correct types"""
-    query = f"""
-    SELECT ?id ?name ?type1 ?type2
-    WHERE {{
-      ?pokemon a ex:Pokemon ;
-               ex:number ?id ;
-               ex:name ?name .
-      
-      OPTIONAL {{ ?pokemon ex:type1 ?type1 . }}
-      OPTIONAL {{ ?pokemon ex:type2 ?type2 . }}
-    }}
-    ORDER BY ?id ?name
-    LIMIT {limit}
+    store = memory_store()
+    if store:
+        return search_list_response(store.search_list(limit))
+
+    return search_list_response(await get_search_list_from_sparql(limit))
+
+
+@app.get("/api/pokemon/typeahead")
+async def typeahead(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(default=10, ge=1, le=50)
+):
+    """Ranked name suggestions (exact, prefix, substring, then fuzzy) from the search index"""
+    index = await get_search_index()
+    return index.search(q, limit)
+
+
+@app.get("/api/pokemon/similar")
+async def get_similar_pokemon_batch(
+    ids: List[int] = Query(..., max_length=200),
+    k: int = Query(default=10, ge=1, le=100),
+    type: Optional[str] = Query(default=None),
+    generation: List[int] = Query(default=[])
+):
+    """Nearest neighbours in base-stat space for many Pokemon at once (null for unknown IDs)"""
+    index = get_stat_index()
+    try:
+        mask = index.candidate_mask(type, generation)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return index.similar_many(ids, k, mask)
+
+
+class BatchRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=BATCH_MAX_IDS)
+    level: Literal["card", "detail", "forms"] = "card"
+
+
+@app.post("/api/pokemon/batch")
+async def get_pokemon_batch(request: BatchRequest):
+    """Cards, details or forms for many Pokemon in one round trip
+    
+    All IDs are resolved with a single VALUES-bound query (plus one forms
+    lookup and concurrent PokeAPI enrichment), not one query per ID. Results
+    follow the request order, duplicates included; each entry is either
+    {id, status: 200, data} or {id, status: 404, error}.
     """
+    unique_ids = list(dict.fromkeys(request.ids))
     
-    data = execute_sparql_query(query)
-    
-    # First pass: collect all forms per Pokemon ID to build the form order
-    pokemon_forms_order = {}
-    
-    for binding in data["results"]["bindings"]:
-        pokemon_id = int(binding.get("id", {}).get("value", 0))
-        pokemon_name = binding.get("name", {}).get("value", "Unknown")
-        
-        if pokemon_id not in pokemon_forms_order:
-            pokemon_forms_order[pokemon_id] = []
-        
-        if pokemon_name not in pokemon_forms_order[pokemon_id]:
-            pokemon_forms_order[pokemon_id].append(pokemon_name)
-    
-    # Sort each Pokemon's forms: base first, then alphabetically
-    # Also populate the cache for get_pokemon_forms_from_sparql
-    for pokemon_id in pokemon_forms_order:
-        forms = pokemon_forms_order[pokemon_id]
-        forms.sort(key=lambda name: (not is_base_form(name), name))
-        
-        # Populate cache
-        _pokemon_forms_cache[pokemon_id] = [
-            {"name": name, "type2": None, "is_base": is_base_form(name)} 
-            for name in forms
-        ]
-    
-    # Second pass: group by (id, formatted_name) to collect type data
-    form_data = {}
+    if request.level == "card":
+        found = await load_pokemon_cards(unique_ids)
+    elif request.level == "detail":
+        found = {pokemon.id: pokemon for pokemon in await hydrate_pokemon_details(unique_ids)}
+    else:
+        found = await load_pokemon_forms_details(unique_ids)
     
-    for binding in data["results"]["bindings"]:
-        pokemon_id = int(binding.get("id", {}).get("value", 0))
-        pokemon_name = binding.get("name", {}).get("value", "Unknown")
-        
-        key = (pokemon_id, pokemon_name)
-        
-        if key not in form_data:
-            form_data[key] = {
+    results = []
+    for pokemon_id in request.ids:
+        if pokemon_id in found:
+            results.append({"id": pokemon_id, "status": 200, "data": found[pokemon_id]})
+        else:
+            results.append({
                 "id": pokemon_id,
-                "name": pokemon_name,
-                "type1": None,
-                "type2s": set()
-            }
-        
-        if "type1" in binding and not form_data[key]["type1"]:
-            form_data[key]["type1"] = extract_value_from_uri(binding["type1"]["value"])
-        
-        if "type2" in binding:
-            form_data[key]["type2s"].add(extract_value_from_uri(binding["type2"]["value"]))
+                "status": 404,
+                "error": f"Pokemon with ID {pokemon_id} not found"
+            })
     
-    # Build results
-    results = []
-    for key, form_info in form_data.items():
-        types = []
-        if form_info["type1"]:
-            types.append(form_info["type1"])
-        
-        if form_info["type2s"]:
-            if len(form_info["type2s"]) == 1:
-                types.append(list(form_info["type2s"])[0])
-            else:
-                correct_type2 = get_correct_type2_for_form(
-                    form_info["name"], 
-                    list(form_info["type2s"])
-                )
-                if correct_type2:
-                    types.append(correct_type2)
-        
-        # Generate image URL
-        pokemon_id = form_info["id"]
-        pokemon_name = form_info["name"]
-        form_order = pokemon_forms_order[pokemon_id]
-        form_index = form_order.index(pokemon_name) if pokemon_name in form_order else 0
-        
-        from config import POKEMON_COM_IMAGE_BASE_URL
-        base_url = f"{POKEMON_COM_IMAGE_BASE_URL}/{pokemon_id:03d}"
-        imageUrl = f"{base_url}.png" if form_index == 0 else f"{base_url}_f{form_index + 1}.png"
-        
-        results.append({
-            "id": pokemon_id,
-            "name": pokemon_name,
-            "types": types,
-            "imageUrl": imageUrl
-        })
-    
-    # Sort by ID, then by form order
-    def sort_key(item):
-        pokemon_id = item["id"]
-        pokemon_name = item["name"]
-        form_order = pokemon_forms_order.get(pokemon_id, [])
-        form_index = form_order.index(pokemon_name) if pokemon_name in form_order else 999
-        return (pokemon_id, form_index)
-    
-    results.sort(key=sort_key)
-    return results
+    return json_response({"level": request.level, "results": results})
 
 
 @app.get("/api/pokemon")
-def get_all_pokemon(
+async def get_all_pokemon(
     limit: int = Query(default=151, le=1000), 
-    offset: int = Query(default=0, ge=0)
+    offset: int = Query(default=0, ge=0),
+    after_id: Optional[int] = Query(default=None, ge=0)
 ):
-    """Get all Pokemon with pagination - returns only base forms"""
-    id_query = f"""
-    SELECT DISTINCT ?id
-    WHERE {{
-      ?pokemon a ex:Pokemon ;
-               ex:number ?id .
-    }}
-    ORDER BY ?id
-    OFFSET {offset}
-    LIMIT {limit}
+    """Get all Pokemon with pagination - returns only base forms
+    
+    Pass `after_id` (the last ID of the previous page) for keyset pagination;
+    it takes precedence over `offset`.
     """
+    store = memory_store()
+    if store:
+        return json_response(store.pokemon_page(limit, offset, after_id))
+    
+    # after_id > -1 matches every ID, so offset pagination uses the same template
+    id_data = await run_query(
+        "pokemon_page_ids",
+        after_id=-1 if after_id is None else after_id,
+        offset=0 if after_id is not None else offset,
+        limit=limit
+    )
+    page_ids = [int(b["id"]["value"]) for b in id_data["results"]["bindings"]]
     
-    id_data = execute_sparql_query(id_query)
+    # One bulk query for names and types of the whole page
+    rows = await get_pokemon_rows_bulk(page_ids)
+    all_forms = await get_forms_index().get_many(rows)
     results = []
     
-    for id_binding in id_data["results"]["bindings"]:
-        pokemon_id = int(id_binding["id"]["value"])
+    for pokemon_id in page_ids:
+        if pokemon_id not in rows:
+            continue
         
-        detail_query = f"""
-        SELECT ?id ?name ?type1 ?type2
-        WHERE {{
-          ?pokemon a ex:Pokemon ;
-                   ex:number ?id ;
-                   ex:name ?name .
-          
-          FILTER(?id = {pokemon_id})
-          
-          OPTIONAL {{ ?pokemon ex:type1 ?type1 . }}
-          OPTIONAL {{ ?pokemon ex:type2 ?type2 . }}
-        }}
-        ORDER BY ?name
-        LIMIT 1
-        """
+        # First binding per ID is the alphabetically first name (ORDER BY ?id ?name)
+        pokemon = record_from_bindings(rows[pokemon_id])
         
-        detail_data = execute_sparql_query(detail_query)
+        # Set image URL
+        pokemon.image_url = get_pokemon_image_url(pokemon_id, pokemon.name, all_forms[pokemon_id])
         
-        if detail_data["results"]["bindings"]:
-            binding = detail_data["results"]["bindings"][0]
-            pokemon = parse_pokemon_from_binding(binding)
-            
-            # Set image URL
-            forms = get_pokemon_forms_from_sparql(pokemon_id)
-            pokemon["imageUrl"] = get_pokemon_image_url(pokemon_id, pokemon["name"], forms)
-            
-            results.append(pokemon)
+        results.append(pokemon)
     
-    return results
+    return json_response(results)
 
 
 @app.get("/api/pokemon/{pokemon_id}")
-def get_pokemon_by_id(pokemon_id: int):
+async def get_pokemon_by_id(pokemon_id: int):
     """Get specific Pokemon by ID with full details"""
-    query = f"""
-    SELECT DISTINCT ?id ?name ?type1 ?type2
-           ?hp ?attack ?defense ?spAttack ?spDefense ?speed
-           (GROUP_CONCAT(DISTINCT ?abilityName; separator=",") AS ?abilities)
-    WHERE {{
-      ?pokemon a ex:Pokemon ;
-               ex:number ?id ;
-               ex:name ?name .
-      
-      FILTER(?id = {pokemon_id})
-      
-      OPTIONAL {{ ?pokemon ex:type1 ?type1 . }}
-      OPTIONAL {{ ?pokemon ex:type2 ?type2 . }}
-      OPTIONAL {{ ?pokemon ex:hp ?hp . }}
-      OPTIONAL {{ ?pokemon ex:attack ?attack . }}
-      OPTIONAL {{ ?pokemon ex:defense ?defense . }}
-      OPTIONAL {{ ?pokemon ex:sp_attack ?spAttack . }}
-      OPTIONAL {{ ?pokemon ex:sp_defense ?spDefense . }}
-      OPTIONAL {{ ?pokemon ex:speed ?speed . }}
-      OPTIONAL {{ 
-        ?ability a ex:Ability ;
-                 ex:possessedBy ?pokemon ;
-                 ex:abilityName ?abilityName .
-      }}
-    }}
-    GROUP BY ?id ?name ?type1 ?type2 ?hp ?attack ?defense ?spAttack ?spDefense ?speed
-    LIMIT 1
-    """
-    
-    data = execute_sparql_query(query)
+    store = memory_store()
+    if store:
+        pokemon = store.card(pokemon_id, include_stats=True)
+        if pokemon is None:
+            raise HTTPException(status_code=404, detail=f"Pokemon with ID {pokemon_id} not found")
+        species, evolution_chain = await asyncio.gather(
+            fetch_pokeapi_species_data(pokemon_id),
+            get_evolution_chain(pokemon_id)
+        )
+        pokemon.apply_species(species)
+        pokemon.evolution_chain = evolution_chain
+        return json_response(pokemon)
+    
+    # Detail row, species data, forms and evolution chain are independent
+    details, species, forms, evolution_chain = await asyncio.gather(
+        get_pokemon_details_bulk([pokemon_id]),
+        fetch_pokeapi_species_data(pokemon_id),
+        get_pokemon_forms(pokemon_id),
+        get_evolution_chain(pokemon_id)
+    )
     
-    if not data["results"]["bindings"]:
+    if pokemon_id not in details:
         raise HTTPException(status_code=404, detail=f"Pokemon with ID {pokemon_id} not found")
     
-    binding = data["results"]["bindings"][0]
-    pokemon = parse_pokemon_from_binding(binding, include_stats=True, fetch_pokeapi=True)
+    pokemon = record_from_bindings(details[pokemon_id], include_stats=True, pokeapi_data=species)
     
     # Set image URL and evolution chain
-    forms = get_pokemon_forms_from_sparql(pokemon_id)
-    pokemon["imageUrl"] = get_pokemon_image_url(pokemon_id, pokemon["name"], forms)
-    pokemon["evolutionChain"] = get_evolution_chain_from_sparql(pokemon_id)
+    pokemon.image_url = get_pokemon_image_url(pokemon_id, pokemon.name, forms)
+    pokemon.evolution_chain = evolution_chain
     
-    return pokemon
+    return json_response(pokemon)
 
 
 @app.get("/api/pokemon/name/{pokemon_name}")
-def get_pokemon_by_name(pokemon_name: str):
-    """Get specific Pokemon by formatted name with full details"""
-    pokemon_name = unquote(pokemon_name)
-    
-    query = f"""
-    SELECT DISTINCT ?id ?name ?type1 ?type2
-           ?hp ?attack ?defense ?spAttack ?spDefense ?speed
-           (GROUP_CONCAT(DISTINCT ?abilityName; separator=",") AS ?abilities)
-    WHERE {{
-      ?pokemon a ex:Pokemon ;
-               ex:number ?id ;
-               ex:name ?name .
-      
-      OPTIONAL {{ ?pokemon ex:type1 ?type1 . }}
-      OPTIONAL {{ ?pokemon ex:type2 ?type2 . }}
-      OPTIONAL {{ ?pokemon ex:hp ?hp . }}
-      OPTIONAL {{ ?pokemon ex:attack ?attack . }}
-      OPTIONAL {{ ?pokemon ex:defense ?defense . }}
-      OPTIONAL {{ ?pokemon ex:sp_attack ?spAttack . }}
-      OPTIONAL {{ ?pokemon ex:sp_defense ?spDefense . }}
-      OPTIONAL {{ ?pokemon ex:speed ?speed . }}
-      OPTIONAL {{ 
-        ?ability a ex:Ability ;
-                 ex:possessedBy ?pokemon ;
-                 ex:abilityName ?abilityName .
-      }}
-    }}
-    GROUP BY ?id ?name ?type1 ?type2 ?hp ?attack ?defense ?spAttack ?spDefense ?speed
-    """
+async def get_pokemon_by_name(pokemon_name: str):
+    """Get specific Pokemon by formatted name with full details
     
-    data = execute_sparql_query(query)
+    The name is matched case-insensitively (and URL-decoded) against the name
+    index, so at most one targeted query is sent.
+    """
+    entry = (await get_name_index()).lookup(pokemon_name)
+    if entry is None:
+        raise HTTPException(
+            status_code=404, 
+            detail=f"Pokemon with name '{unquote(pokemon_name)}' not found"
+        )
+    pokemon_id, pokemon_name, form_index = entry
     
-    # Find matching form and collect type2s
-    form_data = {}
-    pokemon_id = None
+    store = memory_store()
+    if store:
+        pokemon = store.named_form(pokemon_id, pokemon_name)
+        bindings = None
+    else:
+        pokemon = None
+        bindings = [
+            binding for binding in await get_pokemon_details_by_name(pokemon_name)
+            if int(binding.get("id", {}).get("value", 0)) == pokemon_id
+        ]
     
-    for binding in data["results"]["bindings"]:
-        raw_name = binding.get("name", {}).get("value", "")
-        
-        if raw_name == pokemon_name:
-            current_id = int(binding.get("id", {}).get("value", 0))
-            if pokemon_id is None:
-                pokemon_id = current_id
-            
-            key = (current_id, raw_name)
-            if key not in form_data:
-                form_data[key] = {"binding": binding, "type2s": set()}
-            
-            if "type2" in binding:
-                form_data[key]["type2s"].add(
-                    extract_value_from_uri(binding["type2"]["value"])
-                )
-    
-    if not form_data:
+    if pokemon is None and not bindings:
         raise HTTPException(
             status_code=404, 
             detail=f"Pokemon with name '{pokemon_name}' not found"
         )
     
-    # Parse Pokemon
-    key = list(form_data.keys())[0]
-    form_info = form_data[key]
-    pokemon = parse_pokemon_from_binding(
-        form_info["binding"], 
-        include_stats=True, 
-        fetch_pokeapi=True
+    # Species data and evolution chain are independent
+    species, evolution_chain = await asyncio.gather(
+        fetch_pokeapi_species_data(pokemon_id),
+        get_evolution_chain(pokemon_id)
     )
     
-    # Fix types
-    types = []
-    if "type1" in form_info["binding"]:
-        types.append(extract_value_from_uri(form_info["binding"]["type1"]["value"]))
-    
-    if form_info["type2s"]:
-        if len(form_info["type2s"]) == 1:
-            types.append(list(form_info["type2s"])[0])
-        else:
-            correct_type2 = get_correct_type2_for_form(
-                pokemon_name, 
-                list(form_info["type2s"])
-            )
-            if correct_type2:
-                types.append(correct_type2)
-    
-    pokemon["types"] = types
-    
-    # Fix image URL
-    forms = get_pokemon_forms_from_sparql(pokemon_id)
-    form_index = next((i for i, f in enumerate(forms) if f["name"] == pokemon_name), 0)
+    if pokemon is not None:
+        pokemon.apply_species(species)
+    else:
+        # One binding per type2 value, resolved for this form
+        pokemon = record_from_bindings(bindings, include_stats=True, pokeapi_data=species)
     
-    from config import POKEMON_COM_IMAGE_BASE_URL
+    # Image URL from the form's position in the forms list (base form first)
     base_url = f"{POKEMON_COM_IMAGE_BASE_URL}/{pokemon_id:03d}"
-    pokemon["imageUrl"] = f"{base_url}.png" if form_index == 0 else f"{base_url}_f{form_index + 1}.png"
+    pokemon.image_url = f"{base_url}.png" if form_index == 0 else f"{base_url}_f{form_index + 1}.png"
     
     # Add evolution chain
-    pokemon["evolutionChain"] = get_evolution_chain_from_sparql(pokemon_id)
+    pokemon.evolution_chain = evolution_chain
     
-    return pokemon
+    return json_response(pokemon)
+
+
+@app.get("/api/pokemon/{pokemon_id}/similar")
+async def get_similar_pokemon(
+    pokemon_id: int,
+    k: int = Query(default=10, ge=1, le=100),
+    type: Optional[str] = Query(default=None),
+    generation: List[int] = Query(default=[])
+):
+    """Pokemon with the closest base stats, optionally filtered by type and generation"""
+    index = get_stat_index()
+    try:
+        mask = index.candidate_mask(type, generation)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    similar = index.similar(pokemon_id, k, mask)
+    if similar is None:
+        raise HTTPException(status_code=404, detail=f"Pokemon with ID {pokemon_id} not found")
+    return similar
 
 
 @app.get("/api/pokemon/{pokemon_id}/forms")
-def get_pokemon_forms_by_id(pokemon_id: int):
+async def get_pokemon_forms_by_id(pokemon_id: int):
     """Get all forms of a Pokemon by ID"""
-    query = f"""
-    SELECT DISTINCT ?id ?name ?type1 ?type2
-           ?hp ?attack ?defense ?spAttack ?spDefense ?speed
-           (GROUP_CONCAT(DISTINCT ?abilityName; separator=",") AS ?abilities)
-    WHERE {{
-      ?pokemon a ex:Pokemon ;
-               ex:number ?id ;
-               ex:name ?name .
-      
-      FILTER(?id = {pokemon_id})
-      
-      OPTIONAL {{ ?pokemon ex:type1 ?type1 . }}
-      OPTIONAL {{ ?pokemon ex:type2 ?type2 . }}
-      OPTIONAL {{ ?pokemon ex:hp ?hp . }}
-      OPTIONAL {{ ?pokemon ex:attack ?attack . }}
-      OPTIONAL {{ ?pokemon ex:defense ?defense . }}
-      OPTIONAL {{ ?pokemon ex:sp_attack ?spAttack . }}
-      OPTIONAL {{ ?pokemon ex:sp_defense ?spDefense . }}
-      OPTIONAL {{ ?pokemon ex:speed ?speed . }}
-      OPTIONAL {{ 
-        ?ability a ex:Ability ;
-                 ex:possessedBy ?pokemon ;
-                 ex:abilityName ?abilityName .
-      }}
-    }}
-    GROUP BY ?id ?name ?type1 ?type2 ?hp ?attack ?defense ?spAttack ?spDefense ?speed
-    ORDER BY ?name
-    """
-    
-    data = execute_sparql_query(query)
+    store = memory_store()
+    if store:
+        forms = store.forms_detail(pokemon_id)
+        if not forms:
+            raise HTTPException(
+                status_code=404, 
+                detail=f"No forms found for Pokemon with ID {pokemon_id}"
+            )
+        species, evolution_chain = await asyncio.gather(
+            fetch_pokeapi_species_data(pokemon_id),
+            get_evolution_chain(pokemon_id)
+        )
+        forms[0].apply_species(species)
+        for form in forms:
+            form.evolution_chain = evolution_chain
+        return json_response(forms)
+    
+    # The forms query, evolution chain, species data and forms list are independent
+    data, evolution_chain, poke_data, all_forms = await asyncio.gather(
+        run_query("pokemon_details", id=[pokemon_id]),
+        get_evolution_chain(pokemon_id),
+        fetch_pokeapi_species_data(pokemon_id),
+        get_pokemon_forms(pokemon_id)
+    )
     
     if not data["results"]["bindings"]:
         raise HTTPException(
@@ -469,160 +636,91 @@ def get_pokemon_forms_by_id(pokemon_id: int):
             detail=f"No forms found for Pokemon with ID {pokemon_id}"
         )
     
-    # Collect all type2 values
-    available_type2s = set()
-    for binding in data["results"]["bindings"]:
-        if "type2" in binding:
-            available_type2s.add(extract_value_from_uri(binding["type2"]["value"]))
+    forms = forms_from_detail_bindings(pokemon_id, data["results"]["bindings"], all_forms)
     
-    # Parse all forms
-    forms_dict = {}
+    # PokeAPI data for first form
+    if forms and poke_data:
+        forms[0].apply_species(poke_data)
     
-    for binding in data["results"]["bindings"]:
-        pokemon = parse_pokemon_from_binding(binding, include_stats=True, fetch_pokeapi=False)
-        pokemon_name = pokemon["name"]
-        
-        if pokemon_name not in forms_dict:
-            # Assign correct type2
-            if len(pokemon["types"]) == 2:
-                correct_type2 = get_correct_type2_for_form(
-                    pokemon_name, 
-                    list(available_type2s)
-                )
-                if correct_type2 and pokemon["types"][1] != correct_type2:
-                    pokemon["types"] = [pokemon["types"][0], correct_type2]
-            elif len(pokemon["types"]) == 1 and available_type2s:
-                correct_type2 = get_correct_type2_for_form(
-                    pokemon_name, 
-                    list(available_type2s)
-                )
-                if correct_type2:
-                    pokemon["types"].append(correct_type2)
-            
-            forms_dict[pokemon_name] = pokemon
-    
-    forms = list(forms_dict.values())
-    
-    # Get evolution chain and PokeAPI data for first form
-    evolution_chain = get_evolution_chain_from_sparql(pokemon_id)
-    
-    if forms:
-        try:
-            poke_data = fetch_pokeapi_species_data(pokemon_id)
-            if poke_data:
-                forms[0]["height"] = poke_data["height"]
-                forms[0]["weight"] = poke_data["weight"]
-                forms[0]["category"] = poke_data["category"]
-        except Exception as e:
-            print(f"Failed to fetch PokeAPI data for Pokemon {pokemon_id}: {e}")
-    
-    # Add evolution chain and image URLs to each form
-    all_forms = get_pokemon_forms_from_sparql(pokemon_id)
+    # Add evolution chain to each form
     for form in forms:
-        form["evolutionChain"] = evolution_chain
-        form["imageUrl"] = get_pokemon_image_url(pokemon_id, form["name"], all_forms)
+        form.evolution_chain = evolution_chain
     
-    return forms
+    return json_response(forms)
 
 
 @app.get("/api/pokemon/{pokemon_id}/card")
-def get_pokemon_card_by_id(pokemon_id: int):
+async def get_pokemon_card_by_id(pokemon_id: int):
     """Get lightweight Pokemon card data for display"""
-    query = f"""
-    SELECT ?id ?name ?type1 ?type2
-    WHERE {{
-      ?pokemon a ex:Pokemon ;
-               ex:number ?id ;
-               ex:name ?name .
-      
-      FILTER(?id = {pokemon_id})
-      
-      OPTIONAL {{ ?pokemon ex:type1 ?type1 . }}
-      OPTIONAL {{ ?pokemon ex:type2 ?type2 . }}
-    }}
-    LIMIT 1
-    """
+    store = memory_store()
+    if store:
+        pokemon = store.card(pokemon_id)
+        if pokemon is None:
+            raise HTTPException(
+                status_code=404, 
+                detail=f"Pokemon with ID {pokemon_id} not found"
+            )
+        return json_response(pokemon)
     
-    data = execute_sparql_query(query)
+    rows, forms = await asyncio.gather(
+        get_pokemon_rows_bulk([pokemon_id]),
+        get_pokemon_forms(pokemon_id)
+    )
     
-    if not data["results"]["bindings"]:
+    if pokemon_id not in rows:
         raise HTTPException(
             status_code=404, 
             detail=f"Pokemon with ID {pokemon_id} not found"
         )
     
-    binding = data["results"]["bindings"][0]
-    pokemon = parse_pokemon_from_binding(binding)
+    pokemon = record_from_bindings(rows[pokemon_id])
     
     # Set image URL
-    forms = get_pokemon_forms_from_sparql(pokemon_id)
-    pokemon["imageUrl"] = get_pokemon_image_url(pokemon_id, pokemon["name"], forms)
+    pokemon.image_url = get_pokemon_image_url(pokemon_id, pokemon.name, forms)
     
-    return pokemon
+    return json_response(pokemon)
 
 
 @app.get("/api/pokemon/type/{type_name}")
-def get_pokemon_by_type(type_name: str):
+async def get_pokemon_by_type(type_name: str):
     """Get all Pokemon of a specific type"""
     type_formatted = type_name.capitalize()
     
-    query = f"""
-    SELECT DISTINCT ?id ?name ?type1 ?type2
-    WHERE {{
-      ?pokemon a ex:Pokemon ;
-               ex:number ?id ;
-               ex:name ?name .
-      
-      {{ ?pokemon ex:type1 "{type_formatted}" . }}
-      UNION
-      {{ ?pokemon ex:type2 "{type_formatted}" . }}
-      
-      OPTIONAL {{ ?pokemon ex:type1 ?type1 . }}
-      OPTIONAL {{ ?pokemon ex:type2 ?type2 . }}
-    }}
-    ORDER BY ?id
-    LIMIT 100
-    """
-    
-    data = execute_sparql_query(query)
-    results = []
-    
-    for binding in data["results"]["bindings"]:
-        try:
-            pokemon = parse_pokemon_from_binding(binding)
-            pokemon_id = pokemon["id"]
-            forms = get_pokemon_forms_from_sparql(pokemon_id)
-            pokemon["imageUrl"] = get_pokemon_image_url(pokemon_id, pokemon["name"], forms)
-            results.append(pokemon)
-        except Exception as e:
-            print(f"Error parsing pokemon: {e}")
-            continue
+    store = memory_store()
+    if store:
+        return json_response(store.by_type(type_formatted))
     
-    return results
+    # Types are IRIs (type:Fire), not string literals
+    try:
+        data = await run_query("pokemon_by_type", type=[type_formatted])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    bindings = [b for b in data["results"]["bindings"] if "id" in b]
+    # Fetch the forms of every Pokemon missing from the index in one query instead of one per row
+    all_forms = await get_forms_index().get_many(sorted({int(b["id"]["value"]) for b in bindings}))
+    return json_response(records_by_type(bindings, type_formatted, all_forms))
 
 
 @app.get("/api/pokemon/evolution-chain/{pokemon_id}")
-def get_evolution_chain_endpoint(pokemon_id: int):
+async def get_evolution_chain_endpoint(pokemon_id: int):
     """Get evolution chain for a Pokemon"""
-    chain_ids = get_evolution_chain_from_sparql(pokemon_id)
-    
-    pokemon_list = []
-    for pid in chain_ids:
-        try:
-            pokemon = get_pokemon_by_id(pid)
-            pokemon_list.append(pokemon)
-        except:
-            continue
-    
-    return pokemon_list
+    chain_ids = await get_evolution_chain(pokemon_id)
+    return json_response(await hydrate_pokemon_details(chain_ids, evolution_chain=chain_ids))
+
+
+@app.get("/api/pokemon/evolution-tree/{pokemon_id}")
+async def get_evolution_tree_endpoint(pokemon_id: int):
+    """Get the full branching evolution family of a Pokemon"""
+    return (await get_evolution_index()).tree(pokemon_id)
 
 
 @app.get("/api/recommendations")
-def get_recommendations(
+async def get_recommendations(
     pokemon_id: Optional[int] = Query(None),
-    limit: int = Query(default=5, le=20)
+    limit: int = Query(default=5, ge=1, le=RECOMMENDER_TOP_K)
 ):
-    """Get Pokemon recommendations based on type effectiveness - proxied to Recommender service"""
+    """Best and worst type matchups for a Pokemon, served from the precomputed recommender"""
     
     if not pokemon_id:
         raise HTTPException(
@@ -630,43 +728,81 @@ def get_recommendations(
             detail="pokemon_id must be provided"
         )
     
-    # Get the target Pokemon name first
-    try:
-        target = get_pokemon_by_id(pokemon_id)
-        pokemon_name = target["name"]
-    except:
+    recommender = await get_recommender()
+    recommendations = recommender.recommend(pokemon_id, limit)
+    if recommendations is None:
         raise HTTPException(status_code=404, detail=f"Pokemon with ID {pokemon_id} not found")
     
-    # Call the Recommender service
+    return recommendations
+
+
+@app.get("/api/team/build")
+async def build_team(
+    team: List[int] = Query(default=[]),
+    opponents: List[int] = Query(default=[]),
+    generation: List[int] = Query(default=[]),
+    max_base_total: Optional[int] = Query(default=None, ge=0),
+    exclude: List[int] = Query(default=[]),
+    size: int = Query(default=TEAM_SIZE, ge=1, le=TEAM_SIZE),
+    budget_ms: float = Query(default=TEAM_BUILDER_BUDGET_MS, gt=0, le=1000)
+):
+    """Fill a team's remaining slots for the best type coverage (optionally against an opposing team)"""
+    builder = await get_team_builder()
     try:
-        response = requests.get(
-            f"{RECOMMENDER_URL}/api/recommend",
-            params={"name": pokemon_name, "limit": limit},
-            timeout=10
+        return builder.build(
+            team=team,
+            opponents=opponents,
+            generations=generation,
+            max_base_total=max_base_total,
+            exclude=exclude,
+            size=size,
+            budget_ms=budget_ms
         )
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Recommender service error: {e}")
-        # Fallback to empty recommendations
-        return {
-            "target": {"id": pokemon_id, "name": pokemon_name},
-            "best": [],
-            "worst": []
-        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/api/export/pokemon")
+async def export_pokemon(
+    request: Request,
+    fields: Optional[str] = Query(default=None, description="Comma-separated fields to keep")
+):
+    """Stream every Pokemon form as NDJSON (one JSON object per line)
+    
+    Each line carries stats, types, abilities, evolution family and the
+    against_* multipliers. The body is gzip-encoded when the client sends
+    Accept-Encoding: gzip.
+    """
+    try:
+        selected = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    use_gzip = "gzip" in request.headers.get("accept-encoding", "").lower()
+    headers = {
+        "Content-Disposition": 'attachment; filename="pokemon.ndjson"',
+        "Vary": "Accept-Encoding",
+    }
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+    
+    # Resolve the evolution index before the stream starts so failures still get a status code
+    evolution = await get_evolution_index()
+    return StreamingResponse(
+        ndjson_stream(evolution, selected, gzip=use_gzip),
+        media_type="application/x-ndjson",
+        headers=headers
+    )
 
 
 @app.get("/api/stats")
-def get_stats():
+async def get_stats():
     """Get database statistics"""
-    query = """
-    SELECT (COUNT(DISTINCT ?pokemon) AS ?count)
-    WHERE {
-      ?pokemon a ex:Pokemon .
-    }
-    """
+    store = memory_store()
+    if store:
+        return store.stats_summary()
     
-    data = execute_sparql_query(query)
+    data = await run_query("pokemon_count")
     count = 0
     
     if data["results"]["bindings"]:
@@ -675,6 +811,78 @@ def get_stats():
     return {"totalPokemon": count}
 
 
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """Reject admin requests without the configured X-Admin-Token"""
+    if not ADMIN_TOKEN or not hmac.compare_digest((x_admin_token or "").encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+@app.post("/api/admin/reload", dependencies=[Depends(require_admin_token)])
+async def reload_data():
+    """Reload the dataset and rebuild all in-process indexes"""
+    await reload_dataset()
+    return {"status": "ok", "message": "Dataset reloaded"}
+
+
+
+@app.post("/api/admin/cache/invalidate", dependencies=[Depends(require_admin_token)])
+async def invalidate_response_cache():
+    """Bump the dataset version so every cached response is invalidated"""
+    version = bump_dataset_version()
+    return {"status": "ok", "datasetVersion": version}
+
+
+@app.get("/api/admin/forms-index", dependencies=[Depends(require_admin_token)])
+async def get_forms_index_stats():
+    """Forms index size and hit/miss counters"""
+    return get_forms_index().stats()
+
+
+@app.get("/api/admin/cache", dependencies=[Depends(require_admin_token)])
+async def get_response_cache_stats():
+    """Response cache size and hit/miss counters"""
+    return response_cache.stats()
+
+
+@app.get("/api/admin/sparql-cache", dependencies=[Depends(require_admin_token)])
+async def get_sparql_cache_stats():
+    """Per-template SPARQL result cache counters"""
+    return query_cache_stats()
+
+
+@app.get("/api/admin/sparql-profile", dependencies=[Depends(require_admin_token)])
+async def get_sparql_profile():
+    """Per-template query latency, response size and rows per result (by total time)"""
+    return profiler.stats()
+
+
+@app.post("/api/admin/sparql-profile/reset", dependencies=[Depends(require_admin_token)])
+async def reset_sparql_profile():
+    """Clear the query profile; returns the profile as it was before the reset"""
+    stats = profiler.stats()
+    profiler.reset()
+    return stats
+
+
+@app.get("/api/admin/sparql-explain/{name}", response_class=HTMLResponse,
+         dependencies=[Depends(require_admin_token)])
+async def get_sparql_explain(name: str, request: Request):
+    """The store's explain plan for a query template; query parameters fill the template (lists comma-separated)"""
+    try:
+        params = template_params(name, dict(request.query_params))
+        plan = await explain_query(name, **params)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown query template '{name}'")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return HTMLResponse(plan)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Request latency, upstream call latency and upstream calls per request (Prometheus text format)"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=5000)
@@ -0,0 +1,68 @@
+"""Dataset lifecycle: (re)loading the data backend and rebuilding derived indexes"""
+import asyncio
+import inspect
+import logging
+from typing import Callable, List
+
+from config import DATA_BACKEND
+from services.memory_store import load_store
+
+
+logger = logging.getLogger(__name__)
+
+
+# Callbacks (plain or async) that rebuild in-process indexes after the data has been (re)loaded
+_reload_hooks: List[Callable] = []
+
+# Incremented whenever the served data may have changed; part of every response cache key
+_dataset_version = 1
+
+
+def dataset_version() -> int:
+    """Current dataset version"""
+    return _dataset_version
+
+
+def bump_dataset_version() -> int:
+    """Mark the served data as changed (invalidates cached responses)"""
+    global _dataset_version
+    _dataset_version += 1
+    return _dataset_version
+
+
+def register_reload_hook(hook: Callable) -> Callable:
+    """Register a callback to run on every dataset reload (usable as a decorator)"""
+    _reload_hooks.append(hook)
+    return hook
+
+
+async def reload_dataset():
+    """Reload the configured data backend and rebuild every registered index
+
+    With the SPARQL backend the columnar store is built from GraphDB rather
+    than the Turtle files. Failures (of that load or of a hook) are logged
+    rather than raised so one unavailable source (e.g. GraphDB still
+    starting) does not prevent the others from building; indexes that failed
+    to build are built lazily on first use instead.
+    """
+    if DATA_BACKEND == "memory":
+        # Parsing is CPU-bound; keep the event loop responsive
+        await asyncio.to_thread(load_store)
+    else:
+        # The columnar store also backs the type-effectiveness engines with the
+        # SPARQL backend; build it from GraphDB so no Turtle files are needed
+        from services.sparql_service import load_store_from_sparql
+        try:
+            await load_store_from_sparql()
+        except Exception as e:
+            logger.warning("Loading the dataset from SPARQL failed: %s", e)
+
+    for hook in _reload_hooks:
+        try:
+            result = hook()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.warning("Dataset reload hook %s failed: %s", hook.__name__, e)
+
+    bump_dataset_version()
@@ -0,0 +1,153 @@
+"""Precomputed evolution graph index with full branching support"""
+import logging
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import DATA_BACKEND
+from services.dataset import register_reload_hook
+from services.memory_store import get_store
+from services.sparql_service import get_evolution_links_from_sparql
+
+
+logger = logging.getLogger(__name__)
+
+
+class EvolutionIndex:
+    """Evolution families built once from (from_id, to_id) links
+
+    Every Pokemon that appears in a link gets a family id (the lowest base id
+    of its connected component); Pokemon without links form a family of one.
+    Lookups are dict accesses, so they are O(1) per call.
+    """
+
+    def __init__(self, links: Iterable[Tuple[int, int]]):
+        self.children: Dict[int, List[int]] = {}
+        self.parents: Dict[int, List[int]] = {}
+        for from_id, to_id in set(links):
+            self.children.setdefault(from_id, []).append(to_id)
+            self.parents.setdefault(to_id, []).append(from_id)
+        for targets in self.children.values():
+            targets.sort()
+        for sources in self.parents.values():
+            sources.sort()
+
+        self.family_of: Dict[int, int] = {}
+        self.families: Dict[int, List[int]] = {}
+        self.stage_of: Dict[int, int] = {}
+        self._build_families()
+
+    def _build_families(self):
+        nodes = sorted(set(self.children) | set(self.parents))
+        for start in nodes:
+            if start in self.family_of:
+                continue
+
+            # Collect the weakly connected component
+            component = {start}
+            pending = [start]
+            while pending:
+                node = pending.pop()
+                for neighbour in self.children.get(node, []) + self.parents.get(node, []):
+                    if neighbour not in component:
+                        component.add(neighbour)
+                        pending.append(neighbour)
+
+            # Kahn's algorithm; ties broken by id so the order is deterministic
+            roots = sorted(n for n in component if n not in self.parents)
+            in_degree = {n: len(self.parents.get(n, [])) for n in component}
+            queue = deque(roots)
+            ordered = []
+            for root in roots:
+                self.stage_of[root] = 0
+            while queue:
+                node = queue.popleft()
+                ordered.append(node)
+                for child in self.children.get(node, []):
+                    self.stage_of[child] = max(self.stage_of.get(child, 0), self.stage_of[node] + 1)
+                    in_degree[child] -= 1
+                    if in_degree[child] == 0:
+                        queue.append(child)
+
+            family_id = roots[0] if roots else min(component)
+            self.families[family_id] = ordered
+            for node in component:
+                self.family_of[node] = family_id
+
+    def family_id(self, pokemon_id: int) -> int:
+        """Family id for a Pokemon (its own id if it has no evolutions)"""
+        return self.family_of.get(pokemon_id, pokemon_id)
+
+    def family(self, pokemon_id: int) -> List[int]:
+        """All family members in topological (base to final) order"""
+        return self.families.get(self.family_id(pokemon_id), [pokemon_id])
+
+    def chain(self, pokemon_id: int) -> List[int]:
+        """Linear evolution chain through a Pokemon, ordered from base to final
+
+        Follows the Pokemon's own ancestry back to its base, then continues
+        along the first branch, so branched evolutions (e.g. Jolteon) are
+        always part of their own chain.
+        """
+        chain = [pokemon_id]
+        current = pokemon_id
+        while current in self.parents:
+            current = self.parents[current][0]
+            chain.insert(0, current)
+        current = pokemon_id
+        while current in self.children:
+            current = self.children[current][0]
+            chain.append(current)
+        return chain
+
+    def tree(self, pokemon_id: int) -> dict:
+        """Full branching family tree containing a Pokemon
+
+        Returns:
+            Dict with keys: familyId, members (topologically ordered ids),
+            stages (id -> evolution stage) and roots (nested {id, evolvesTo} nodes)
+        """
+        family_id = self.family_id(pokemon_id)
+        members = self.family(pokemon_id)
+
+        def node(member_id: int) -> dict:
+            return {
+                "id": member_id,
+                "evolvesTo": [node(child) for child in self.children.get(member_id, [])],
+            }
+
+        return {
+            "familyId": family_id,
+            "members": members,
+            "stages": {str(m): self.stage_of.get(m, 0) for m in members},
+            "roots": [node(m) for m in members if m not in self.parents],
+        }
+
+
+_index: Optional[EvolutionIndex] = None
+
+
+async def _load_links() -> List[Tuple[int, int]]:
+    if DATA_BACKEND == "memory":
+        return get_store().evolution_links()
+    return await get_evolution_links_from_sparql()
+
+
+@register_reload_hook
+async def rebuild_evolution_index() -> EvolutionIndex:
+    """(Re)build the global evolution index from the configured data backend"""
+    global _index
+    _index = EvolutionIndex(await _load_links())
+    logger.info("Built evolution index: %d families", len(_index.families))
+    return _index
+
+
+async def get_evolution_index() -> EvolutionIndex:
+    """Return the global evolution index, building it on first use"""
+    if _index is None:
+        return await rebuild_evolution_index()
+    return _index
+
+
+async def get_evolution_chain(pokemon_id: int) -> List[int]:
+    """Evolution chain for a Pokemon, served from the index"""
+    return (await get_evolution_index()).chain(pokemon_id)
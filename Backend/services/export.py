@@ -0,0 +1,104 @@
+"""Streaming NDJSON export of every Pokemon form"""
+import math
+import zlib
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+import orjson
+
+from config import DATA_BACKEND, EXPORT_CHUNK_BYTES
+from domain.pokemon_logic import parse_abilities_from_string
+from domain.records import EXPORT_FIELDS, export_record
+from domain.type_chart import against as against_types
+from services.evolution_index import EvolutionIndex
+from services.memory_store import STAT_PREDICATES, get_store
+from services.sparql_service import resolve_forms, stream_query
+from utils import extract_value_from_uri
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Validate a comma-separated ?fields= projection (None means every field)
+
+    Raises:
+        ValueError: If a field name is unknown
+    """
+    if not fields:
+        return None
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in selected if field not in EXPORT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown export fields {unknown}; valid fields: {', '.join(EXPORT_FIELDS)}")
+    return list(dict.fromkeys(selected))
+
+
+def _records_from_row(row: Dict[str, str], evolution: EvolutionIndex) -> Iterator[dict]:
+    """Export records for one row of the pokemon_export query (one per form)"""
+    pokemon_id = int(row["id"])
+    type1 = extract_value_from_uri(row["t1"]) if row.get("t1") else None
+    type2s = [extract_value_from_uri(t) for t in row.get("type2s", "").split("|") if t]
+    stats = {key: int(float(row.get(f"stat_{key}") or 0)) for key in STAT_PREDICATES}
+    abilities = parse_abilities_from_string(",".join(row.get("abilities", "").split("|")))
+    generation = int(row["gen"]) if row.get("gen") else 0
+    family = evolution.family(pokemon_id)
+
+    names = [name for name in row.get("names", "").split("|") if name]
+    forms = resolve_forms(names, type2s)
+    # Per Pokemon, from the base form's types (as in the in-memory store)
+    base_types = [type1, forms[0]["type2"]] if type1 and forms else []
+    against = {t: (None if math.isnan(m) else m) for t, m in against_types([t for t in base_types if t]).items()}
+    for form_index, form in enumerate(forms):
+        types = [t for t in (type1, form["type2"]) if t]
+        yield export_record(
+            pokemon_id, form["name"], form_index, form["is_base"], generation, types,
+            stats, abilities, evolution.family_id(pokemon_id), family, against
+        )
+
+
+async def export_records(evolution: EvolutionIndex) -> AsyncIterator[dict]:
+    """Every form of every Pokemon, in national dex order, without materializing the list
+
+    Memory mode walks the store's columns; SPARQL mode consumes a single
+    streamed query with one row per Pokemon.
+    """
+    if DATA_BACKEND == "memory":
+        family = lambda pokemon_id: (evolution.family_id(pokemon_id), evolution.family(pokemon_id))
+        for record in get_store().export_records(family):
+            yield record
+        return
+
+    async for row in stream_query("pokemon_export"):
+        for record in _records_from_row(row, evolution):
+            yield record
+
+
+async def ndjson_stream(
+    evolution: EvolutionIndex,
+    fields: Optional[List[str]] = None,
+    gzip: bool = False,
+    chunk_bytes: int = EXPORT_CHUNK_BYTES
+) -> AsyncIterator[bytes]:
+    """Encoded export body: one JSON object per line, in chunks of about chunk_bytes
+
+    Args:
+        evolution: Evolution index used for the family fields
+        fields: Projection from parse_fields (None for every field)
+        gzip: Compress the stream (a single gzip member)
+        chunk_bytes: Uncompressed bytes buffered before a chunk is sent
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+    buffer = bytearray()
+
+    async for record in export_records(evolution):
+        if fields is not None:
+            record = {field: record[field] for field in fields}
+        buffer += orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+        if len(buffer) >= chunk_bytes:
+            chunk = compressor.compress(bytes(buffer)) if compressor else bytes(buffer)
+            buffer.clear()
+            if chunk:
+                yield chunk
+
+    tail = bytes(buffer)
+    if compressor:
+        tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+        yield tail
@@ -0,0 +1,148 @@
+"""Bounded, warmable index of every Pokemon's forms (base form first)"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from config import DATA_BACKEND, FORMS_INDEX_MAX_ENTRIES
+from services.dataset import register_reload_hook
+from services.memory_store import get_store
+from services.sparql_service import get_pokemon_forms_bulk_from_sparql
+
+
+logger = logging.getLogger(__name__)
+
+
+class FormsIndex:
+    """LRU of forms lists keyed by national dex number
+
+    The whole index is normally loaded up front by warm() (one query, or the
+    in-memory store), so requests only hit GraphDB for IDs evicted by the
+    size bound. Forms lists use the shape of forms_from_bindings: dicts with
+    name, type2 (resolved per form) and is_base, base forms first.
+    """
+
+    def __init__(self, max_entries: int = FORMS_INDEX_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.warmed = False
+        self._forms: "OrderedDict[int, List[dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._forms)
+
+    def _put(self, pokemon_id: int, forms: List[dict]):
+        self._forms[pokemon_id] = forms
+        self._forms.move_to_end(pokemon_id)
+        while len(self._forms) > self.max_entries:
+            self._forms.popitem(last=False)
+            self.evictions += 1
+
+    def put_many(self, forms_by_id: Dict[int, List[dict]]):
+        with self._lock:
+            for pokemon_id, forms in forms_by_id.items():
+                self._put(pokemon_id, forms)
+
+    def lookup(self, pokemon_id: int) -> Optional[List[dict]]:
+        """Cached forms for an ID, or None (counts a hit or a miss)"""
+        with self._lock:
+            forms = self._forms.get(pokemon_id)
+            if forms is None:
+                self.misses += 1
+                return None
+            self._forms.move_to_end(pokemon_id)
+            self.hits += 1
+            return forms
+
+    async def warm(self):
+        """Load the forms of every Pokemon"""
+        if DATA_BACKEND == "memory":
+            store = get_store()
+            forms_by_id = {store.ids[row]: store.forms(row) for row in range(len(store))}
+        else:
+            forms_by_id = await get_pokemon_forms_bulk_from_sparql()
+        self.put_many(forms_by_id)
+        self.warmed = True
+
+    async def get_many(self, pokemon_ids: Iterable[int]) -> Dict[int, List[dict]]:
+        """Forms for many IDs; all misses are fetched with a single query
+
+        Returns:
+            Dict mapping each ID to its forms (empty list for unknown IDs)
+        """
+        results = {}
+        missing = []
+        for pokemon_id in dict.fromkeys(pokemon_ids):
+            forms = self.lookup(pokemon_id)
+            if forms is None:
+                missing.append(pokemon_id)
+            else:
+                results[pokemon_id] = forms
+
+        if missing:
+            if DATA_BACKEND == "memory":
+                store = get_store()
+                fetched = {}
+                for pokemon_id in missing:
+                    row = store.row_of(pokemon_id)
+                    if row is not None:
+                        fetched[pokemon_id] = store.forms(row)
+            else:
+                fetched = await get_pokemon_forms_bulk_from_sparql(missing)
+            self.put_many(fetched)
+            for pokemon_id in missing:
+                results[pokemon_id] = fetched.get(pokemon_id, [])
+        return results
+
+    async def get(self, pokemon_id: int) -> List[dict]:
+        """Forms of one Pokemon (empty list if unknown)"""
+        forms = self.lookup(pokemon_id)
+        if forms is not None:
+            return forms
+        return (await self.get_many([pokemon_id]))[pokemon_id]
+
+    def stats(self) -> dict:
+        """Index size and hit/miss counters"""
+        with self._lock:
+            return {
+                "entries": len(self._forms),
+                "maxEntries": self.max_entries,
+                "warmed": self.warmed,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_index = FormsIndex()
+
+
+@register_reload_hook
+async def rebuild_forms_index() -> FormsIndex:
+    """Replace the global forms index with a freshly warmed one"""
+    global _index
+    index = FormsIndex()
+    await index.warm()
+    _index = index
+    logger.info("Built forms index: %d Pokemon", len(index))
+    return index
+
+
+def get_forms_index() -> FormsIndex:
+    """Return the global forms index (filled lazily if warming failed)"""
+    return _index
+
+
+async def get_pokemon_forms(pokemon_id: int) -> List[dict]:
+    """Get all forms for a Pokemon ID, sorted with base form first
+
+    Args:
+        pokemon_id: The Pokemon's national dex number
+
+    Returns:
+        List of dicts with keys: name, type2, is_base
+    """
+    return await _index.get(pokemon_id)
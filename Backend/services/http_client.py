@@ -0,0 +1,133 @@
+"""Shared async HTTP client with keep-alive pooling and per-host concurrency caps"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from config import (
+    GRAPHDB_ENDPOINT, POKEAPI_BASE_URL,
+    HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE_CONNECTIONS, HTTP_KEEPALIVE_EXPIRY,
+    HTTP_DEFAULT_HOST_CONCURRENCY, SPARQL_MAX_CONCURRENCY, POKEAPI_MAX_CONCURRENCY
+)
+from services.instrumentation import record_upstream_call
+
+
+logger = logging.getLogger(__name__)
+
+# Upstream host -> maximum in-flight requests
+HOST_CONCURRENCY = {
+    urlsplit(GRAPHDB_ENDPOINT).netloc: SPARQL_MAX_CONCURRENCY,
+    urlsplit(POKEAPI_BASE_URL).netloc: POKEAPI_MAX_CONCURRENCY,
+}
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def _release_client(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop):
+    """Close a client created on another event loop
+
+    Its connections belong to that loop, so they are closed there if it is
+    still running; a client whose loop has already ended cannot be closed any
+    more and is dropped (callers should close_http_client() before their loop
+    ends, as the app and the CLIs do).
+    """
+    if client.is_closed:
+        return
+    if loop.is_running() and not loop.is_closed():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    else:
+        logger.warning("Dropping an HTTP client whose event loop has ended without closing it")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the pooled client for the running event loop, creating it on first use
+
+    The client of a previous event loop is closed first (see _release_client).
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        if _client is not None:
+            _release_client(_client, _client_loop)
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+        _client_loop = loop
+        _host_semaphores.clear()
+    return _client
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    host = urlsplit(url).netloc
+    if host not in _host_semaphores:
+        _host_semaphores[host] = asyncio.Semaphore(
+            HOST_CONCURRENCY.get(host, HTTP_DEFAULT_HOST_CONCURRENCY)
+        )
+    return _host_semaphores[host]
+
+
+async def http_request(method: str, url: str, label: Optional[str] = None, **kwargs) -> httpx.Response:
+    """Send a request through the shared pool, respecting the per-host cap
+
+    Args:
+        method: HTTP method
+        url: Absolute URL
+        label: Tag for the call in the request trace and metrics (e.g. the query template name)
+        **kwargs: Passed through to httpx.AsyncClient.request (params, content, headers, timeout, ...)
+
+    Returns:
+        The httpx response (status is not checked)
+    """
+    client = get_http_client()
+    started = time.perf_counter()
+    status = 0
+    try:
+        async with _host_semaphore(url):
+            response = await client.request(method, url, **kwargs)
+            status = response.status_code
+            return response
+    finally:
+        record_upstream_call(url, label, started, status)
+
+
+@asynccontextmanager
+async def http_stream(method: str, url: str, label: Optional[str] = None, **kwargs) -> AsyncIterator[httpx.Response]:
+    """Like http_request, but the body is read incrementally inside the block
+
+    The per-host slot is held until the block exits; the call is timed until then too.
+    """
+    client = get_http_client()
+    started = time.perf_counter()
+    status = 0
+    try:
+        async with _host_semaphore(url):
+            async with client.stream(method, url, **kwargs) as response:
+                status = response.status_code
+                yield response
+    finally:
+        record_upstream_call(url, label, started, status)
+
+
+async def open_http_client() -> httpx.AsyncClient:
+    """Create the pooled client on the current loop (called on application startup)"""
+    return get_http_client()
+
+
+async def close_http_client():
+    """Close the pooled client (called on application shutdown)"""
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+    _host_semaphores.clear()
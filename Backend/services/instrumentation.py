@@ -0,0 +1,288 @@
+"""Per-request instrumentation: upstream call timing, Server-Timing headers and /metrics histograms
+
+Every call made through services.http_client is recorded against the
+request that caused it, classified by upstream (sparql or pokeapi) and
+tagged with a label such as the SPARQL query template name. The
+middleware turns that into a Server-Timing header (time per upstream and
+label, plus the time spent in the app itself) and into Prometheus
+histograms, and flags requests that make more upstream calls than
+UPSTREAM_CALLS_WARN_THRESHOLD, which is how N+1 query patterns show up.
+"""
+import bisect
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from starlette.routing import Match
+
+from config import (
+    GRAPHDB_ENDPOINT, POKEAPI_BASE_URL, INSTRUMENTATION_ENABLED, UPSTREAM_CALLS_WARN_THRESHOLD
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# Upstream host -> name used in headers and metrics
+UPSTREAM_NAMES = {
+    urlsplit(GRAPHDB_ENDPOINT).netloc: "sparql",
+    urlsplit(POKEAPI_BASE_URL).netloc: "pokeapi",
+}
+
+# Histogram bucket upper bounds
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CALL_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class UpstreamCall(NamedTuple):
+    upstream: str
+    label: str
+    started: float
+    duration: float
+    status: int
+
+
+class RequestTrace:
+    """Upstream calls made while serving one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.calls: List[UpstreamCall] = []
+
+    def upstream_wall_time(self) -> float:
+        """Seconds during which at least one upstream call was in flight"""
+        total = 0.0
+        end = None
+        for call in sorted(self.calls, key=lambda c: c.started):
+            call_end = call.started + call.duration
+            if end is None or call.started >= end:
+                total += call.duration
+                end = call_end
+            elif call_end > end:
+                total += call_end - end
+                end = call_end
+        return total
+
+    def by_label(self) -> Dict[Tuple[str, str], Tuple[int, float]]:
+        """(upstream, label) -> (calls, summed seconds)"""
+        totals: Dict[Tuple[str, str], Tuple[int, float]] = {}
+        for call in self.calls:
+            count, duration = totals.get((call.upstream, call.label), (0, 0.0))
+            totals[(call.upstream, call.label)] = (count + 1, duration + call.duration)
+        return totals
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+def upstream_name(url: str) -> str:
+    """Upstream name of a URL (its host if it is not a known upstream)"""
+    host = urlsplit(url).netloc
+    return UPSTREAM_NAMES.get(host, host)
+
+
+def record_upstream_call(url: str, label: Optional[str], started: float, status: int):
+    """Record a finished upstream call (called by services.http_client)
+
+    Args:
+        url: Requested URL
+        label: Query template name or resource kind (defaults to the upstream name)
+        started: time.perf_counter() when the call was issued (queueing for a
+            per-host slot counts as part of the call)
+        status: HTTP status, or 0 if the request failed
+    """
+    if not INSTRUMENTATION_ENABLED:
+        return
+    duration = time.perf_counter() - started
+    upstream = upstream_name(url)
+    label = label or upstream
+    metrics.upstream_duration.observe(duration, upstream=upstream, label=label)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.calls.append(UpstreamCall(upstream, label, started, duration, status))
+
+
+# ============================================================================
+# Metrics
+# ============================================================================
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+    parts = [f'{name}="{value}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram with labels"""
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket counts, then +Inf, sum and count
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + ("+Inf",), series):
+                    cumulative += count
+                    le = f'le="{bound}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series[-2]:.6f}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series[-1]}")
+        return lines
+
+
+class Counter:
+    """Prometheus-style counter with labels"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._values: Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, **labels: str):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class Metrics:
+    """All instrumentation metrics, rendered together for /metrics"""
+
+    def __init__(self):
+        self.request_duration = Histogram(
+            "http_request_duration_seconds", "Time to serve a request, by route", DURATION_BUCKETS)
+        self.upstream_duration = Histogram(
+            "upstream_request_duration_seconds", "Upstream call latency, by upstream and label", DURATION_BUCKETS)
+        self.upstream_calls = Histogram(
+            "upstream_calls_per_request", "Upstream calls made while serving one request", CALL_COUNT_BUCKETS)
+        self.flagged = Counter(
+            "upstream_call_threshold_exceeded_total",
+            f"Requests making more than {UPSTREAM_CALLS_WARN_THRESHOLD} upstream calls")
+
+    def render(self) -> str:
+        lines = []
+        for metric in (self.request_duration, self.upstream_duration, self.upstream_calls, self.flagged):
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+# ============================================================================
+# Middleware
+# ============================================================================
+
+def _calls(count: int) -> str:
+    return f"{count} call" if count == 1 else f"{count} calls"
+
+
+def server_timing(trace: RequestTrace, total: float) -> bytes:
+    """Server-Timing header value: per-upstream and per-label time, app time and total (ms)"""
+    entries = []
+    per_upstream: Dict[str, Tuple[int, float]] = {}
+    for (upstream, label), (count, duration) in trace.by_label().items():
+        calls, summed = per_upstream.get(upstream, (0, 0.0))
+        per_upstream[upstream] = (calls + count, summed + duration)
+        if label != upstream:
+            entries.append(f'{upstream}.{label};dur={duration * 1000:.1f};desc="{_calls(count)}"')
+    entries[:0] = [f'{upstream};dur={duration * 1000:.1f};desc="{_calls(count)}"'
+                   for upstream, (count, duration) in per_upstream.items()]
+    entries.append(f"app;dur={(total - trace.upstream_wall_time()) * 1000:.1f}")
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries).encode("latin-1", "replace")
+
+
+def _route_template(scope) -> str:
+    """Path template of the route serving a request (route templates, not raw paths, keep the label set bounded)"""
+    route = scope.get("route")
+    if route is None and "app" in scope:
+        # Responses served from the response cache never reach the router
+        for candidate in scope["app"].router.routes:
+            if candidate.matches(scope)[0] == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", None) or "unmatched"
+
+
+class InstrumentationMiddleware:
+    """ASGI middleware tracing upstream calls per request
+
+    Adds a Server-Timing header to every HTTP response, records the request
+    in the /metrics histograms once it is complete and logs requests whose
+    upstream call count exceeds UPSTREAM_CALLS_WARN_THRESHOLD.
+    """
+
+    def __init__(self, app, threshold: int = UPSTREAM_CALLS_WARN_THRESHOLD):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not INSTRUMENTATION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace()
+        token = _current_trace.set(trace)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing = server_timing(trace, time.perf_counter() - trace.started)
+                message = dict(message, headers=list(message.get("headers", [])) + [(b"server-timing", timing)])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_trace.reset(token)
+            self._finish(scope, trace, status)
+
+    def _finish(self, scope, trace: RequestTrace, status: int):
+        route = _route_template(scope)
+        total = time.perf_counter() - trace.started
+        calls = len(trace.calls)
+        metrics.request_duration.observe(total, route=route, method=scope["method"], status=str(status))
+        metrics.upstream_calls.observe(calls, route=route)
+
+        if calls > self.threshold:
+            metrics.flagged.inc(route=route)
+            breakdown = ", ".join(
+                f"{upstream} {label} x{count}"
+                for (upstream, label), (count, _) in sorted(trace.by_label().items(), key=lambda item: -item[1][0])
+            )
+            query = scope.get("query_string", b"").decode("latin-1")
+            logger.warning("Upstream call threshold exceeded: %s %s%s made %d upstream calls in %.0f ms (%s)",
+                           scope["method"], scope["path"], "?" + query if query else "", calls,
+                           total * 1000, breakdown)
@@ -0,0 +1,530 @@
+"""In-process columnar Pokedex store built from the Turtle data files
+
+The whole dataset is small (~700 Pokemon resources), so when DATA_BACKEND is
+"memory" the read endpoints are answered from array-backed columns instead of
+SPARQL round trips. The builders below mirror the SPARQL-backed routes in
+main.py (ORDER BY and row LIMITs, type2 resolved per form, lowest value of
+multi-valued stats), so both backends return the same JSON; see
+tests/test_backend_parity.py.
+"""
+import logging
+import math
+import os
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import DATA_BACKEND, POKEMON_COM_IMAGE_BASE_URL, SNAPSHOT_PATH, TTL_DATA_DIR, TTL_DATA_FILES
+from services.snapshot import Snapshot, SnapshotError, read_snapshot, source_digest, write_snapshot
+from services.turtle_parser import RDF_TYPE, Literal, Triple, read_triples
+from domain.pokemon_logic import get_correct_type2_for_form, parse_abilities_from_string
+from domain.type_chart import AGAINST_TYPES, against_column, against_matrix
+from domain.records import PokemonRecord, SearchEntry, export_record
+from utils import extract_value_from_uri, get_pokemon_image_url, is_base_form
+
+
+logger = logging.getLogger(__name__)
+
+
+EX = "http://example.org/"
+POKEMON_CLASS = EX + "Pokemon"
+ABILITY_CLASS = EX + "Ability"
+
+# Column name -> ex: predicate, in the order used by the "stats" payload
+STAT_PREDICATES = {
+    "hp": "hp",
+    "attack": "attack",
+    "defense": "defense",
+    "specialAttack": "sp_attack",
+    "specialDefense": "sp_defense",
+    "speed": "speed",
+}
+
+NO_TYPE = -1
+
+
+class PokedexStore:
+    """Columnar snapshot of the Pokedex keyed by row index (sorted by national dex id)
+
+    Per-Pokemon columns are flat arrays; variable-length data (forms, type2s,
+    abilities) uses CSR-style offset arrays into shared value arrays. A store
+    opened from a binary snapshot has read-only memoryviews over the mapped
+    file in place of the arrays (same indexing, same buffer layout).
+    """
+
+    def __init__(self):
+        self.ids = array("H")
+        self.generation = array("B")
+        self.type1 = array("b")
+        self.stats: Dict[str, array] = {key: array("H") for key in STAT_PREDICATES}
+
+        # Forms: names sorted base-first per Pokemon (same order as the forms index)
+        self.form_offsets = array("H", [0])
+        self.form_names: List[str] = []
+        self.form_type2 = array("b")  # type2 resolved for the form, NO_TYPE if none
+
+        # All ex:type2 values of the Pokemon resource, sorted by name
+        self.type2_offsets = array("H", [0])
+        self.type2_values = array("b")
+
+        self.ability_offsets = array("H", [0])
+        self.ability_ids = array("H")
+        self.ability_names: List[str] = []
+
+        # ex:against_* multipliers, row-major (len(ids) x len(AGAINST_TYPES)), NaN if the
+        # type is unknown; derived from the base form's types (domain.type_chart)
+        self.against = array("f")
+
+        self.evolves_to: Dict[int, List[int]] = {}
+        self.type_names: List[str] = []
+        self._type_codes: Dict[str, int] = {}
+
+        self._search_entries: Optional[List[SearchEntry]] = None
+        self._search_bindings = 0
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_turtle(cls, data_dir: str = TTL_DATA_DIR) -> "PokedexStore":
+        """Build a store from the Turtle data files
+
+        Args:
+            data_dir: Directory containing the files listed in TTL_DATA_FILES
+
+        Returns:
+            Populated PokedexStore
+        """
+        return cls.from_triples(
+            triple for file_name in TTL_DATA_FILES
+            for triple in read_triples(os.path.join(data_dir, file_name))
+        )
+
+    @classmethod
+    def from_triples(cls, triples: Iterable[Triple]) -> "PokedexStore":
+        """Build a store from the triples of the Turtle data files, from any source
+
+        Literals must be turtle_parser.Literal and IRIs plain strings, as
+        read_triples yields them (the SPARQL backend converts its rows).
+        """
+        resources: Dict[str, dict] = {}
+        abilities: Dict[str, dict] = {}
+        links = []
+
+        for s, p, o in triples:
+            if p == RDF_TYPE:
+                if o == POKEMON_CLASS:
+                    resources.setdefault(s, {})
+                elif o == ABILITY_CLASS:
+                    abilities.setdefault(s, {"name": None, "holders": []})
+            elif not p.startswith(EX):
+                continue
+            else:
+                prop = p[len(EX):]
+                if prop.startswith("against_") or prop in ("weakTo", "resistantTo"):
+                    # Derived from the type chart instead (domain.type_chart)
+                    continue
+                elif prop == "evolvesTo":
+                    links.append((s, o))
+                elif prop == "abilityName":
+                    abilities.setdefault(s, {"name": None, "holders": []})["name"] = o.lexical
+                elif prop == "possessedBy":
+                    abilities.setdefault(s, {"name": None, "holders": []})["holders"].append(o)
+                elif prop in ("typeName", "pokemonCount"):
+                    continue
+                else:
+                    value = o.lexical if isinstance(o, Literal) else o
+                    resources.setdefault(s, {}).setdefault(prop, []).append(value)
+
+        store = cls()
+        store._build(resources, abilities, links)
+        return store
+
+    # Snapshot section name -> column attribute (stats columns are "stat.<key>")
+    _SNAPSHOT_COLUMNS = (
+        "ids", "generation", "type1", "form_offsets", "form_type2", "type2_offsets",
+        "type2_values", "ability_offsets", "ability_ids", "against",
+    )
+    _SNAPSHOT_STRINGS = ("form_names", "ability_names", "type_names")
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Snapshot) -> "PokedexStore":
+        """Open a store over a mapped snapshot (see services.snapshot); nothing is parsed
+
+        Raises:
+            SnapshotError: If a column or string list is missing
+        """
+        store = cls()
+        try:
+            for name in cls._SNAPSHOT_COLUMNS:
+                setattr(store, name, snapshot.columns[name])
+            store.stats = {key: snapshot.columns[f"stat.{key}"] for key in STAT_PREDICATES}
+            for name in cls._SNAPSHOT_STRINGS:
+                setattr(store, name, snapshot.strings[name])
+            evolve_from, evolve_to = snapshot.columns["evolve.from"], snapshot.columns["evolve.to"]
+        except KeyError as e:
+            raise SnapshotError(f"Snapshot has no section {e}") from e
+
+        store._type_codes = {name: code for code, name in enumerate(store.type_names)}
+        for from_id, to_id in zip(evolve_from, evolve_to):
+            store.evolves_to.setdefault(from_id, []).append(to_id)
+        return store
+
+    def save_snapshot(self, path: str, digest: bytes):
+        """Write the store's columns as a binary snapshot (see services.snapshot)"""
+        columns = {name: getattr(self, name) for name in self._SNAPSHOT_COLUMNS}
+        columns.update({f"stat.{key}": column for key, column in self.stats.items()})
+        links = self.evolution_links()
+        columns["evolve.from"] = array("H", (from_id for from_id, _ in links))
+        columns["evolve.to"] = array("H", (to_id for _, to_id in links))
+        strings = {name: getattr(self, name) for name in self._SNAPSHOT_STRINGS}
+        write_snapshot(path, digest, columns, strings)
+
+    def _type_code(self, type_uri: str) -> int:
+        name = extract_value_from_uri(type_uri)
+        if name not in self._type_codes:
+            self._type_codes[name] = len(self.type_names)
+            self.type_names.append(name)
+        return self._type_codes[name]
+
+    def _build(self, resources: dict, abilities: dict, links: list):
+        rows = []
+        for uri, props in resources.items():
+            if "number" not in props or "name" not in props:
+                continue
+            rows.append((int(props["number"][0]), uri, props))
+        rows.sort(key=lambda r: r[0])
+
+        uri_to_id = {uri: pokemon_id for pokemon_id, uri, _ in rows}
+
+        ability_order = sorted(
+            (info["name"], uri) for uri, info in abilities.items() if info["name"]
+        )
+        ability_index = {}
+        holders: Dict[str, List[int]] = {}
+        for name, uri in ability_order:
+            ability_index[uri] = len(self.ability_names)
+            self.ability_names.append(name)
+            for holder in abilities[uri]["holders"]:
+                holders.setdefault(holder, []).append(ability_index[uri])
+
+        for pokemon_id, uri, props in rows:
+            self.ids.append(pokemon_id)
+            self.generation.append(int(props.get("generation", ["0"])[0]))
+            type1 = props.get("type1")
+            self.type1.append(self._type_code(type1[0]) if type1 else NO_TYPE)
+            for key, predicate in STAT_PREDICATES.items():
+                # Multi-valued stats (forms share one resource) keep the base value
+                values = [int(v) for v in props.get(predicate, [])]
+                self.stats[key].append(min(values) if values else 0)
+
+            type2s = sorted({self._type_code(t) for t in props.get("type2", [])},
+                            key=lambda c: self.type_names[c])
+            self.type2_values.extend(type2s)
+            self.type2_offsets.append(len(self.type2_values))
+
+            type2_names = [self.type_names[c] for c in type2s]
+            names = sorted(set(props["name"]), key=lambda n: (not is_base_form(n), n))
+            for name in names:
+                resolved = get_correct_type2_for_form(name, type2_names)
+                self.form_names.append(name)
+                self.form_type2.append(self._type_codes[resolved] if resolved else NO_TYPE)
+            self.form_offsets.append(len(self.form_names))
+
+            self.ability_ids.extend(sorted(set(holders.get(uri, []))))
+            self.ability_offsets.append(len(self.ability_ids))
+
+
+        self.against.frombytes(self._derive_against().tobytes())
+
+        for from_uri, to_uri in links:
+            if from_uri in uri_to_id and to_uri in uri_to_id:
+                self.evolves_to.setdefault(uri_to_id[from_uri], []).append(uri_to_id[to_uri])
+        for targets in self.evolves_to.values():
+            targets.sort()
+
+    def _derive_against(self):
+        """Effectiveness matrix from each Pokemon's base-form type1/type2 (vectorized)"""
+        columns = [against_column(name) for name in self.type_names]
+        column = lambda code: -1 if code == NO_TYPE or columns[code] is None else columns[code]
+        type1 = [column(code) for code in self.type1]
+        type2 = [column(self.form_type2[self.form_offsets[row]]) for row in range(len(self.ids))]
+        return against_matrix(type1, type2)
+
+    # ------------------------------------------------------------------
+    # Column access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def row_of(self, pokemon_id: int) -> Optional[int]:
+        """Return the row index for a national dex id, or None if unknown"""
+        row = bisect_left(self.ids, pokemon_id)
+        if row < len(self.ids) and self.ids[row] == pokemon_id:
+            return row
+        return None
+
+    def _type_name(self, code: int) -> Optional[str]:
+        return self.type_names[code] if code != NO_TYPE else None
+
+    def form_range(self, row: int) -> range:
+        return range(self.form_offsets[row], self.form_offsets[row + 1])
+
+    def forms(self, row: int) -> List[dict]:
+        """Forms of a Pokemon in the shape returned by forms_from_bindings"""
+        return [
+            {
+                "name": self.form_names[i],
+                "type2": self._type_name(self.form_type2[i]),
+                "is_base": is_base_form(self.form_names[i]),
+            }
+            for i in self.form_range(row)
+        ]
+
+    def type2_names(self, row: int) -> List[str]:
+        start, end = self.type2_offsets[row], self.type2_offsets[row + 1]
+        return [self.type_names[c] for c in self.type2_values[start:end]]
+
+    def abilities(self, row: int) -> List[str]:
+        start, end = self.ability_offsets[row], self.ability_offsets[row + 1]
+        names = [self.ability_names[i] for i in self.ability_ids[start:end]]
+        return parse_abilities_from_string(",".join(names))
+
+    def stats_of(self, row: int) -> dict:
+        return {key: column[row] for key, column in self.stats.items()}
+
+    def evolution_links(self) -> List[Tuple[int, int]]:
+        """All (from_id, to_id) ex:evolvesTo links"""
+        return [(from_id, to_id) for from_id, targets in self.evolves_to.items() for to_id in targets]
+
+    # ------------------------------------------------------------------
+    # Response builders (mirror the SPARQL-backed routes in main.py)
+    # ------------------------------------------------------------------
+
+    def _first_form(self, row: int) -> int:
+        """Form index of the alphabetically first name (ORDER BY ?name LIMIT 1)"""
+        return min(self.form_range(row), key=lambda i: self.form_names[i])
+
+    def _record(self, row: int, name: str, types: List[str], stats: bool = False) -> PokemonRecord:
+        if stats:
+            return PokemonRecord(self.ids[row], name, types, abilities=self.abilities(row),
+                                 stats=self.stats_of(row))
+        return PokemonRecord(self.ids[row], name, types)
+
+    def _types(self, row: int, type2: Optional[str]) -> List[str]:
+        types = []
+        type1 = self._type_name(self.type1[row])
+        if type1:
+            types.append(type1)
+        if type2:
+            types.append(type2)
+        return types
+
+    def card(self, pokemon_id: int, include_stats: bool = False) -> Optional[PokemonRecord]:
+        """Card/detail record for the Pokemon's first form, or None if unknown"""
+        row = self.row_of(pokemon_id)
+        if row is None or not len(self.form_range(row)):
+            return None
+        form = self._first_form(row)
+        name = self.form_names[form]
+        pokemon = self._record(row, name, self._types(row, self._type_name(self.form_type2[form])),
+                               stats=include_stats)
+        pokemon.image_url = get_pokemon_image_url(pokemon_id, name, self.forms(row))
+        return pokemon
+
+    def named_form(self, pokemon_id: int, name: str) -> Optional[PokemonRecord]:
+        """Detail record for one named form (GET /api/pokemon/name/{name}), or None"""
+        row = self.row_of(pokemon_id)
+        if row is None:
+            return None
+        form = next((i for i in self.form_range(row) if self.form_names[i] == name), None)
+        if form is None:
+            return None
+        return self._record(row, name, self._types(row, self._type_name(self.form_type2[form])),
+                            stats=True)
+
+    def pokemon_page(self, limit: int, offset: int = 0, after_id: Optional[int] = None) -> List[PokemonRecord]:
+        """Rows for GET /api/pokemon, paged by offset or keyset (after_id)"""
+        start = bisect_right(self.ids, after_id) if after_id is not None else offset
+        return [self.card(pokemon_id) for pokemon_id in self.ids[start:start + limit]]
+
+    def forms_detail(self, pokemon_id: int) -> List[PokemonRecord]:
+        """Rows for GET /api/pokemon/{id}/forms (without PokeAPI/evolution enrichment)"""
+        row = self.row_of(pokemon_id)
+        if row is None:
+            return []
+        all_forms = self.forms(row)
+        results = []
+        for i in sorted(self.form_range(row), key=lambda i: self.form_names[i]):
+            name = self.form_names[i]
+            pokemon = self._record(row, name, self._types(row, self._type_name(self.form_type2[i])), stats=True)
+            pokemon.image_url = get_pokemon_image_url(pokemon_id, name, all_forms)
+            results.append(pokemon)
+        return results
+
+    def by_type(self, type_name: str, limit: int = 100) -> List[PokemonRecord]:
+        """Rows for GET /api/pokemon/type/{type}: one per form having the type, by id and name"""
+        code = self._type_codes.get(type_name)
+        if code is None:
+            return []
+        results = []
+        for row in range(len(self.ids)):
+            pokemon_id = self.ids[row]
+            forms = None
+            for i in sorted(self.form_range(row), key=lambda i: self.form_names[i]):
+                if self.type1[row] != code and self.form_type2[i] != code:
+                    continue
+                if len(results) >= limit:
+                    return results
+                forms = forms or self.forms(row)
+                name = self.form_names[i]
+                pokemon = self._record(row, name, self._types(row, self._type_name(self.form_type2[i])))
+                pokemon.image_url = get_pokemon_image_url(pokemon_id, name, forms)
+                results.append(pokemon)
+        return results
+
+    def search_list(self, limit: int) -> List[SearchEntry]:
+        """Rows for GET /api/pokemon/search
+
+        The SPARQL query's LIMIT applies to (name x type2) bindings, so it is
+        applied the same way here before grouping per form. A limit covering
+        every binding (the usual case) is served from a list built once.
+        """
+        if self._search_entries is None:
+            self._search_bindings = sum(
+                len(self.form_range(row)) * max(len(self.type2_names(row)), 1)
+                for row in range(len(self.ids))
+            )
+            self._search_entries = self._build_search_list(self._search_bindings)
+        if limit >= self._search_bindings:
+            return self._search_entries
+        return self._build_search_list(limit)
+
+    def _build_search_list(self, limit: int) -> List[SearchEntry]:
+        results = []
+        remaining = limit
+        for row in range(len(self.ids)):
+            if remaining <= 0:
+                break
+            pokemon_id = self.ids[row]
+            type2s = self.type2_names(row)
+            included = []
+            for name in sorted(self.form_names[i] for i in self.form_range(row)):
+                if remaining <= 0:
+                    break
+                bound = type2s[:remaining] if type2s else []
+                remaining -= max(len(type2s), 1) if len(bound) == len(type2s) else len(bound)
+                included.append((name, bound))
+
+            form_order = sorted((name for name, _ in included),
+                                key=lambda n: (not is_base_form(n), n))
+            base_url = f"{POKEMON_COM_IMAGE_BASE_URL}/{pokemon_id:03d}"
+            for name, bound in sorted(included, key=lambda f: form_order.index(f[0])):
+                types = []
+                type1 = self._type_name(self.type1[row])
+                if type1:
+                    types.append(type1)
+                correct_type2 = get_correct_type2_for_form(name, bound)
+                if correct_type2:
+                    types.append(correct_type2)
+                form_index = form_order.index(name)
+                results.append(SearchEntry(
+                    pokemon_id, name, types,
+                    f"{base_url}.png" if form_index == 0 else f"{base_url}_f{form_index + 1}.png"
+                ))
+        return results
+
+    def export_records(self, family: Callable[[int], Tuple[int, List[int]]]) -> Iterator[dict]:
+        """Export records (see domain.records.export_record), one per form, lazily
+
+        Args:
+            family: Pokemon ID -> (family ID, family members from base to final)
+        """
+        width = len(AGAINST_TYPES)
+        for row in range(len(self.ids)):
+            pokemon_id = self.ids[row]
+            family_id, members = family(pokemon_id)
+            stats = self.stats_of(row)
+            abilities = self.abilities(row)
+            multipliers = self.against[row * width:(row + 1) * width]
+            against = {t: (None if math.isnan(m) else m) for t, m in zip(AGAINST_TYPES, multipliers)}
+            for form_index, form in enumerate(self.forms(row)):
+                yield export_record(
+                    pokemon_id, form["name"], form_index, form["is_base"], self.generation[row],
+                    self._types(row, form["type2"]), stats, abilities, family_id, members, against
+                )
+
+    def stats_summary(self) -> dict:
+        """Payload for GET /api/stats"""
+        return {"totalPokemon": len(self.ids)}
+
+
+# ============================================================================
+# Module-level store used by the API
+# ============================================================================
+
+_store: Optional[PokedexStore] = None
+
+
+def load_store(data_dir: str = TTL_DATA_DIR, snapshot_path: str = SNAPSHOT_PATH) -> PokedexStore:
+    """(Re)load the global store
+
+    The binary snapshot is used when its source checksum matches the Turtle
+    files (or the Turtle files are not deployed); otherwise the Turtle files
+    are parsed and the snapshot is rewritten for the next start. An empty
+    snapshot_path always parses the Turtle files.
+    """
+    global _store
+    started = time.perf_counter()
+    store = None
+    source = data_dir
+    digest = None
+
+    if snapshot_path:
+        try:
+            digest = source_digest(os.path.join(data_dir, name) for name in TTL_DATA_FILES)
+        except OSError:
+            logger.warning("Turtle files not found in %s; using snapshot without checksum check", data_dir)
+        try:
+            store = PokedexStore.from_snapshot(read_snapshot(snapshot_path, digest))
+            source = snapshot_path
+        except SnapshotError as e:
+            logger.info("Snapshot not used: %s", e)
+
+    if store is None:
+        store = PokedexStore.from_turtle(data_dir)
+        if snapshot_path and digest is not None:
+            try:
+                store.save_snapshot(snapshot_path, digest)
+                logger.info("Wrote snapshot %s", snapshot_path)
+            except OSError as e:
+                logger.warning("Could not write snapshot %s: %s", snapshot_path, e)
+
+    _store = store
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info("Loaded in-memory Pokedex store: %d Pokemon from %s in %.1f ms", len(_store), source, elapsed_ms)
+    return _store
+
+
+def set_store(store: PokedexStore) -> PokedexStore:
+    """Install a store built elsewhere as the global store (see load_store_from_sparql)"""
+    global _store
+    _store = store
+    return _store
+
+
+def get_store() -> PokedexStore:
+    """Return the global store, loading it from the Turtle files on first use
+
+    Raises:
+        RuntimeError: With the SPARQL backend, if the store has not been loaded
+            from GraphDB yet (the Turtle files are not needed in that mode)
+    """
+    if _store is None:
+        if DATA_BACKEND != "memory":
+            raise RuntimeError("Dataset not loaded from SPARQL yet; retry or POST /api/admin/reload")
+        return load_store()
+    return _store
@@ -0,0 +1,92 @@
+"""Exact name lookup: formatted form name -> (national dex number, form index)"""
+import logging
+import re
+from typing import Dict, List, NamedTuple, Optional
+from urllib.parse import unquote
+
+from config import DATA_BACKEND
+from services.dataset import register_reload_hook
+from services.memory_store import get_store
+from services.sparql_service import get_pokemon_forms_bulk_from_sparql
+
+
+logger = logging.getLogger(__name__)
+
+
+_WHITESPACE = re.compile(r"\s+")
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+
+class NameEntry(NamedTuple):
+    id: int
+    name: str
+    form_index: int
+
+
+def name_key(name: str) -> str:
+    """Case-insensitive lookup key: URL-decoded, casefolded, whitespace collapsed
+
+    "mega%20charizard%20x" -> "mega charizard x"
+    """
+    return _WHITESPACE.sub(" ", unquote(name)).strip().casefold()
+
+
+def compact_key(name: str) -> str:
+    """Looser key without spaces or punctuation ("mr-mime" -> "mrmime")"""
+    return _NON_ALNUM.sub("", name_key(name))
+
+
+class NameIndex:
+    """Name -> NameEntry for every form, built once from the forms lists
+
+    form_index is the form's position in its Pokemon's forms list (base form
+    first), i.e. what the image URL suffix is derived from. If two Pokemon
+    share a form name the lowest dex number wins, as the old full-scan route
+    did. Compact keys are only kept when they are unambiguous.
+    """
+
+    def __init__(self, forms_by_id: Dict[int, List[dict]]):
+        self._exact: Dict[str, NameEntry] = {}
+        compact: Dict[str, Optional[NameEntry]] = {}
+        for pokemon_id in sorted(forms_by_id):
+            for form_index, form in enumerate(forms_by_id[pokemon_id]):
+                entry = NameEntry(pokemon_id, form["name"], form_index)
+                self._exact.setdefault(name_key(form["name"]), entry)
+                key = compact_key(form["name"])
+                if key not in compact:
+                    compact[key] = entry
+                elif compact[key] is not None and compact[key].name != entry.name:
+                    compact[key] = None
+        self._compact = {key: entry for key, entry in compact.items() if entry is not None}
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def lookup(self, name: str) -> Optional[NameEntry]:
+        """Entry for a (possibly URL-encoded, any-case) form name, or None"""
+        return self._exact.get(name_key(name)) or self._compact.get(compact_key(name))
+
+
+_index: Optional[NameIndex] = None
+
+
+@register_reload_hook
+async def rebuild_name_index() -> NameIndex:
+    """(Re)build the global name index from the configured data backend"""
+    global _index
+    if DATA_BACKEND == "memory":
+        store = get_store()
+        forms_by_id = {store.ids[row]: store.forms(row) for row in range(len(store))}
+    else:
+        # Same query the forms index warms from, so this is normally a cache hit
+        forms_by_id = await get_pokemon_forms_bulk_from_sparql()
+    _index = NameIndex(forms_by_id)
+    logger.info("Built name index: %d forms", len(_index))
+    return _index
+
+
+async def get_name_index() -> NameIndex:
+    """Return the global name index, building it on first use"""
+    if _index is None:
+        return await rebuild_name_index()
+    return _index
@@ -1,39 +1,57 @@
 """Service for interacting with the PokeAPI external service"""
-import requests
-from typing import Dict
+import argparse
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from config import (
+    POKEAPI_BASE_URL, POKEAPI_CACHE_PATH, POKEAPI_MEMORY_CACHE_SIZE,
+    POKEAPI_MAX_CONCURRENCY, POKEAPI_BLOCKING_MISS
+)
+from services.http_client import close_http_client, http_request
+from services.response_cache import mark_uncacheable
+
+
+logger = logging.getLogger(__name__)
+
 
 #Data not available in our RDF store, we fetch from PokeAPI, for compoleteness. It is basically simple data that is coupled to 1 single pokemon only.
 #No difficult queries needed here.
-def fetch_pokeapi_species_data(pokemon_id: int) -> Dict[str, any]:
+
+DEFAULT_SPECIES_DATA = {"height": 0, "weight": 0, "category": "Pokemon"}
+
+
+async def download_species_data(pokemon_id: int, base_url: str = POKEAPI_BASE_URL) -> Optional[Dict[str, any]]:
     """Fetch height, weight, and category from PokeAPI
-    
+
     Args:
         pokemon_id: The Pokemon's national dex number
-        
+        base_url: PokeAPI base URL (overridable to point at a local stand-in)
+
     Returns:
-        Dict with keys: height, weight, category
+        Dict with keys: height, weight, category, or None if the fetch failed
     """
     try:
-        # Get species data for category
-        species_response = requests.get(
-            f"https://pokeapi.co/api/v2/pokemon-species/{pokemon_id}", 
-            timeout=5
+        # Species data (category) and Pokemon data (height/weight) are independent
+        species_response, pokemon_response = await asyncio.gather(
+            http_request("GET", f"{base_url}/pokemon-species/{pokemon_id}", label="pokemon-species", timeout=5),
+            http_request("GET", f"{base_url}/pokemon/{pokemon_id}", label="pokemon", timeout=5),
         )
         if species_response.status_code == 200:
             species_data = species_response.json()
-            
+
             # Get category (genus) from English entry
             category = "Pokemon"
             for genus in species_data.get("genera", []):
                 if genus.get("language", {}).get("name") == "en":
                     category = genus.get("genus", "Pokemon")
                     break
-            
-            # Get Pokemon data for height/weight
-            pokemon_response = requests.get(
-                f"https://pokeapi.co/api/v2/pokemon/{pokemon_id}", 
-                timeout=5
-            )
+
             if pokemon_response.status_code == 200:
                 pokemon_data = pokemon_response.json()
                 return {
@@ -42,6 +60,247 @@ def fetch_pokeapi_species_data(pokemon_id: int) -> Dict[str, any]:
                     "category": category
                 }
     except Exception as e:
-        print(f"PokeAPI fetch error for ID {pokemon_id}: {e}")
-    
-    return {"height": 0, "weight": 0, "category": "Pokemon"}
+        logger.warning("PokeAPI fetch error for ID %d: %s", pokemon_id, e)
+
+    return None
+
+
+class SpeciesCache:
+    """Persistent species-data cache: in-memory LRU in front of a SQLite file
+
+    Height, weight and genus never change, so entries never expire. Misses are
+    refreshed by a background task (unless blocking is requested), so serving
+    works fully offline once the cache is warm.
+    """
+
+    def __init__(
+        self,
+        path: str = POKEAPI_CACHE_PATH,
+        base_url: str = POKEAPI_BASE_URL,
+        memory_size: int = POKEAPI_MEMORY_CACHE_SIZE
+    ):
+        self.path = path
+        self.base_url = base_url
+        self.memory_size = memory_size
+        self.hits = 0
+        self.misses = 0
+
+        self._memory: "OrderedDict[int, Dict[str, any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[int, asyncio.Task] = {}
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS species (
+                   id INTEGER PRIMARY KEY,
+                   height INTEGER NOT NULL,
+                   weight INTEGER NOT NULL,
+                   category TEXT NOT NULL,
+                   fetched_at REAL NOT NULL
+               )"""
+        )
+        self._db.commit()
+
+    def _remember(self, pokemon_id: int, data: Dict[str, any]):
+        self._memory[pokemon_id] = data
+        self._memory.move_to_end(pokemon_id)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get_cached(self, pokemon_id: int) -> Optional[Dict[str, any]]:
+        """Look up a species entry without touching the network"""
+        with self._lock:
+            if pokemon_id in self._memory:
+                self._memory.move_to_end(pokemon_id)
+                return self._memory[pokemon_id]
+
+            row = self._db.execute(
+                "SELECT height, weight, category FROM species WHERE id = ?", (pokemon_id,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            data = {"height": row[0], "weight": row[1], "category": row[2]}
+            self._remember(pokemon_id, data)
+            return data
+
+    def put(self, pokemon_id: int, data: Dict[str, any]):
+        """Store a species entry in memory and on disk"""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO species (id, height, weight, category, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (pokemon_id, data["height"], data["weight"], data["category"], time.time())
+            )
+            self._db.commit()
+            self._remember(pokemon_id, data)
+
+    async def refresh(self, pokemon_id: int) -> Optional[Dict[str, any]]:
+        """Download a species entry and store it; returns None on failure"""
+        data = await download_species_data(pokemon_id, self.base_url)
+        if data is not None:
+            # SQLite commits block on disk; keep them off the event loop
+            await asyncio.to_thread(self.put, pokemon_id, data)
+        return data
+
+    def refresh_in_background(self, pokemon_id: int) -> asyncio.Task:
+        """Schedule a refresh for a missing entry (deduplicated per ID)"""
+        task = self._inflight.get(pokemon_id)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self.refresh(pokemon_id))
+            self._inflight[pokemon_id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(pokemon_id, None))
+        return task
+
+    async def get(self, pokemon_id: int, blocking: bool = POKEAPI_BLOCKING_MISS) -> Dict[str, any]:
+        """Return species data, falling back to defaults while a miss is refreshed
+
+        Args:
+            pokemon_id: The Pokemon's national dex number
+            blocking: Wait for a missing entry instead of refreshing it in the background
+
+        Returns:
+            Dict with keys: height, weight, category
+        """
+        data = self.get_cached(pokemon_id)
+        if data is not None:
+            self.hits += 1
+            return data
+
+        self.misses += 1
+        task = self.refresh_in_background(pokemon_id)
+        if blocking:
+            data = await task
+            if data is not None:
+                return data
+        # Placeholder values must not be served from the response cache later
+        mark_uncacheable()
+        return dict(DEFAULT_SPECIES_DATA)
+
+    async def prefetch(self, pokemon_ids: Iterable[int], concurrency: int = POKEAPI_MAX_CONCURRENCY) -> dict:
+        """Download every missing entry with bounded concurrency
+
+        Args:
+            pokemon_ids: National dex numbers to warm
+            concurrency: Maximum parallel downloads
+
+        Returns:
+            Dict with counts: requested, cached, fetched, failed
+        """
+        pokemon_ids = list(dict.fromkeys(pokemon_ids))
+        missing = [pid for pid in pokemon_ids if self.get_cached(pid) is None]
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch(pokemon_id: int):
+            async with semaphore:
+                return await self.refresh(pokemon_id)
+
+        results = await asyncio.gather(*(fetch(pid) for pid in missing))
+
+        fetched = sum(1 for r in results if r is not None)
+        return {
+            "requested": len(pokemon_ids),
+            "cached": len(pokemon_ids) - len(missing),
+            "fetched": fetched,
+            "failed": len(missing) - fetched,
+        }
+
+    def stats(self) -> dict:
+        """Cache size and hit/miss counters"""
+        with self._lock:
+            stored = self._db.execute("SELECT COUNT(*) FROM species").fetchone()[0]
+            return {
+                "stored": stored,
+                "inMemory": len(self._memory),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_species_cache: Optional[SpeciesCache] = None
+
+
+def get_species_cache() -> SpeciesCache:
+    """Return the process-wide species cache, opening it on first use"""
+    global _species_cache
+    if _species_cache is None:
+        _species_cache = SpeciesCache()
+    return _species_cache
+
+
+async def fetch_pokeapi_species_data(pokemon_id: int) -> Dict[str, any]:
+    """Get height, weight, and category for a Pokemon from the species cache
+
+    Args:
+        pokemon_id: The Pokemon's national dex number
+
+    Returns:
+        Dict with keys: height, weight, category (defaults while an uncached
+        entry is being fetched in the background)
+    """
+    return await get_species_cache().get(pokemon_id)
+
+
+async def fetch_pokeapi_species_data_bulk(pokemon_ids: List[int]) -> Dict[int, Dict[str, any]]:
+    """Fetch PokeAPI species data for many Pokemon concurrently
+
+    Args:
+        pokemon_ids: National dex numbers to fetch
+
+    Returns:
+        Dict mapping each ID to the fetch_pokeapi_species_data result
+    """
+    unique_ids = list(dict.fromkeys(pokemon_ids))
+    if not unique_ids:
+        return {}
+
+    # In-flight requests are capped per host by the shared HTTP client
+    results = await asyncio.gather(*(fetch_pokeapi_species_data(pid) for pid in unique_ids))
+    return dict(zip(unique_ids, results))
+
+
+def main():
+    """CLI: python -m services.pokeapi_service prefetch [--first N --last M]"""
+    parser = argparse.ArgumentParser(description="PokeAPI species cache tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    prefetch = subparsers.add_parser("prefetch", help="Download all missing species entries")
+    prefetch.add_argument("--first", type=int, help="First national dex number")
+    prefetch.add_argument("--last", type=int, help="Last national dex number")
+    prefetch.add_argument("--concurrency", type=int, default=POKEAPI_MAX_CONCURRENCY)
+    prefetch.add_argument("--base-url", default=POKEAPI_BASE_URL)
+    prefetch.add_argument("--cache-path", default=POKEAPI_CACHE_PATH)
+
+    subparsers.add_parser("stats", help="Show cache size")
+
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        print(SpeciesCache().stats())
+        return
+
+    if args.first is not None and args.last is not None:
+        pokemon_ids = range(args.first, args.last + 1)
+    else:
+        # Default to every Pokemon in the Turtle data
+        from services.memory_store import load_store
+        pokemon_ids = list(load_store().ids)
+
+    cache = SpeciesCache(path=args.cache_path, base_url=args.base_url)
+
+    async def run():
+        try:
+            return await cache.prefetch(pokemon_ids, concurrency=args.concurrency)
+        finally:
+            await close_http_client()
+
+    started = time.perf_counter()
+    summary = asyncio.run(run())
+    elapsed = time.perf_counter() - started
+    print(f"Prefetch done in {elapsed:.1f}s: {summary}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Type-effectiveness recommender over the ex:against_* multiplier matrix"""
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import RECOMMENDER_TOP_K
+from services.dataset import register_reload_hook
+from services.memory_store import AGAINST_TYPES, NO_TYPE, PokedexStore, against_column, get_store
+
+
+logger = logging.getLogger(__name__)
+
+
+# Immunities (0x) are clamped to this before taking log2 so scores stay finite
+IMMUNITY_FLOOR = 0.125
+
+
+class Recommender:
+    """Best and worst counters for every Pokemon, precomputed at load time
+
+    A[i, t] is the damage multiplier Pokemon i takes from attack type t. For a
+    target i and candidate j (using each Pokemon's base-form types):
+
+    - offense[i, j]: best multiplier j's own types deal to i (max over j's types of A[i, t])
+    - defense[i, j]: best multiplier i's own types deal to j, i.e. offense[j, i]
+
+    score = log2(offense) - log2(defense), so a candidate hitting for 2x while
+    resisting the target's types (0.5x) scores +2, and the worst counters are
+    the candidates the target hits hard while shrugging off their attacks.
+    """
+
+    def __init__(self, store: PokedexStore, top_k: int = RECOMMENDER_TOP_K):
+        n = len(store)
+        self.ids = np.frombuffer(store.ids, dtype=np.uint16).astype(np.int64)
+        self.names = [store.form_names[store.form_offsets[row]] for row in range(n)]
+        self.top_k = top_k
+
+        matrix = np.frombuffer(store.against, dtype=np.float32).reshape(n, len(AGAINST_TYPES))
+        # Pokemon without a known type take neutral damage from everything
+        self.against = np.nan_to_num(matrix, nan=1.0)
+
+        type1 = np.empty(n, dtype=np.int64)
+        type2 = np.empty(n, dtype=np.int64)
+        columns = [against_column(name) for name in store.type_names]
+        for row in range(n):
+            code1 = store.type1[row]
+            code2 = store.form_type2[store.form_offsets[row]]
+            type1[row] = columns[code1] if code1 != NO_TYPE and columns[code1] is not None else -1
+            type2[row] = columns[code2] if code2 != NO_TYPE and columns[code2] is not None else type1[row]
+
+        # Gather both STAB columns for every (target, candidate) pair in one go;
+        # typeless rows attack neutrally
+        padded = np.concatenate([self.against, np.ones((n, 1), dtype=np.float32)], axis=1)
+        self.offense = np.maximum(padded[:, type1], padded[:, type2])
+        self.defense = self.offense.T
+        self.score = (
+            np.log2(np.maximum(self.offense, IMMUNITY_FLOOR))
+            - np.log2(np.maximum(self.defense, IMMUNITY_FLOOR))
+        )
+
+        self._rows = {int(pokemon_id): row for row, pokemon_id in enumerate(self.ids)}
+        self._best: List[List[dict]] = []
+        self._worst: List[List[dict]] = []
+        self._precompute()
+
+    def _precompute(self):
+        n = len(self.ids)
+        k = min(self.top_k, max(n - 1, 0))
+        candidate_ids = np.broadcast_to(self.ids, (n, n))
+
+        # np.lexsort sorts by the last key first: score, then offense, then id
+        best_order = np.lexsort((candidate_ids, -self.offense, -self.score), axis=1)
+        worst_order = np.lexsort((candidate_ids, self.offense, self.score), axis=1)
+
+        for row in range(n):
+            self._best.append(self._entries(row, best_order[row], k))
+            self._worst.append(self._entries(row, worst_order[row], k))
+
+    def _entries(self, row: int, order: np.ndarray, k: int) -> List[dict]:
+        entries = []
+        for candidate in order:
+            if candidate == row:
+                continue
+            entries.append({
+                "id": int(self.ids[candidate]),
+                "name": self.names[candidate],
+                "score": round(float(self.score[row, candidate]), 3),
+                "offense": float(self.offense[row, candidate]),
+                "defense": float(self.defense[row, candidate]),
+            })
+            if len(entries) >= k:
+                break
+        return entries
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def recommend(self, pokemon_id: int, limit: int = 5) -> Optional[Dict[str, any]]:
+        """Best and worst counters for a Pokemon
+
+        Args:
+            pokemon_id: The target's national dex number
+            limit: Number of entries per list (capped at top_k)
+
+        Returns:
+            Dict with keys: target {id, name}, best and worst lists of
+            {id, name, score, offense, defense}, or None if the id is unknown
+        """
+        row = self._rows.get(pokemon_id)
+        if row is None:
+            return None
+        return {
+            "target": {"id": pokemon_id, "name": self.names[row]},
+            "best": self._best[row][:limit],
+            "worst": self._worst[row][:limit],
+        }
+
+
+_recommender: Optional[Recommender] = None
+
+
+@register_reload_hook
+async def rebuild_recommender() -> Recommender:
+    """(Re)build the global recommender from the loaded Pokedex store"""
+    global _recommender
+    store = get_store()
+    _recommender = await asyncio.to_thread(Recommender, store)
+    logger.info("Built recommender: top %d for %d Pokemon", _recommender.top_k, len(_recommender))
+    return _recommender
+
+
+async def get_recommender() -> Recommender:
+    """Return the global recommender, building it on first use"""
+    if _recommender is None:
+        return await rebuild_recommender()
+    return _recommender
@@ -0,0 +1,218 @@
+"""Dataset-versioned HTTP response cache with ETags and conditional GETs"""
+import hashlib
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from config import (
+    RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_MAX_ENTRY_BYTES, RESPONSE_CACHE_MAX_AGE
+)
+from services.dataset import dataset_version
+
+
+# Requests under these prefixes are never cached
+UNCACHED_PREFIXES = ("/api/admin",)
+
+# Per-request flag an endpoint can raise when its response must not be reused
+# (e.g. it contains placeholder data while an upstream fetch is in flight)
+_uncacheable: ContextVar[Optional[dict]] = ContextVar("response_uncacheable", default=None)
+
+
+def mark_uncacheable():
+    """Keep the current request's response out of the response cache"""
+    flag = _uncacheable.get()
+    if flag is not None:
+        flag["uncacheable"] = True
+
+
+class CachedResponse(NamedTuple):
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    etag: bytes
+
+
+class ResponseCache:
+    """LRU of response bodies bounded by total body size
+
+    Keys carry the dataset version, and entries from an older version are
+    dropped as soon as the version changes, so a reload (or an explicit
+    version bump) invalidates everything at once.
+    """
+
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+                 max_entry_bytes: int = RESPONSE_CACHE_MAX_ENTRY_BYTES):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+        self.size = 0
+        self.version = dataset_version()
+        self._entries: "OrderedDict[tuple, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _check_version(self):
+        version = dataset_version()
+        if version != self.version:
+            self._entries.clear()
+            self.size = 0
+            self.version = version
+
+    def get(self, key: tuple) -> Optional[CachedResponse]:
+        with self._lock:
+            self._check_version()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: tuple, entry: CachedResponse):
+        if len(entry.body) > self.max_entry_bytes:
+            return
+        with self._lock:
+            self._check_version()
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous.body)
+            self._entries[key] = entry
+            self.size += len(entry.body)
+            while self.size > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted.body)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        """Counters for sizing the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "datasetVersion": self.version,
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "maxBytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "notModified": self.not_modified,
+                "evictions": self.evictions,
+            }
+
+
+response_cache = ResponseCache()
+
+
+def _make_etag(version: int, body: bytes) -> bytes:
+    return f'"v{version}-{hashlib.sha1(body).hexdigest()[:20]}"'.encode()
+
+
+def _etag_matches(if_none_match: Optional[bytes], etag: bytes) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(b",")]
+    return b"*" in candidates or etag in candidates
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware serving cached GET /api/* JSON responses
+
+    Successful JSON responses are stored per (dataset version, path, query);
+    every cacheable response carries a strong ETag and Cache-Control, and an
+    If-None-Match that matches the current ETag is answered with 304.
+    """
+
+    def __init__(self, app, cache: ResponseCache = response_cache):
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if (scope["type"] != "http" or scope["method"] != "GET"
+                or not path.startswith("/api/") or path.startswith(UNCACHED_PREFIXES)):
+            await self.app(scope, receive, send)
+            return
+
+        request_headers: Dict[bytes, bytes] = dict(scope["headers"])
+        if_none_match = request_headers.get(b"if-none-match")
+        query = b"&".join(sorted(scope.get("query_string", b"").split(b"&")))
+        version = dataset_version()
+        key = (version, path, query)
+
+        entry = self.cache.get(key)
+        if entry is not None:
+            await self._send_cached(entry, if_none_match, send, b"HIT")
+            return
+
+        flag = {"uncacheable": False}
+        token = _uncacheable.set(flag)
+        start_message = None
+        buffering = False
+        chunks = []
+
+        async def capture(message):
+            nonlocal start_message, buffering
+            if message["type"] == "http.response.start":
+                content_type = dict(
+                    (name.lower(), value) for name, value in message["headers"]
+                ).get(b"content-type", b"")
+                # Only successful JSON is buffered; anything else (errors,
+                # streamed exports) passes straight through
+                buffering = message["status"] == 200 and content_type.startswith(b"application/json")
+                if buffering:
+                    start_message = message
+                else:
+                    await send(message)
+            elif message["type"] == "http.response.body" and buffering:
+                chunks.append(message.get("body", b""))
+            else:
+                await send(message)
+
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            _uncacheable.reset(token)
+
+        if start_message is None:
+            return
+
+        body = b"".join(chunks)
+        headers = [
+            (name, value) for name, value in start_message["headers"]
+            if name.lower() not in (b"etag", b"cache-control")
+        ]
+        if flag["uncacheable"] or version != dataset_version():
+            await send({"type": "http.response.start", "status": start_message["status"],
+                        "headers": headers + [(b"cache-control", b"no-store")]})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        entry = CachedResponse(start_message["status"], headers, body, _make_etag(version, body))
+        self.cache.put(key, entry)
+        await self._send_cached(entry, if_none_match, send, b"MISS")
+
+    async def _send_cached(self, entry: CachedResponse, if_none_match: Optional[bytes],
+                           send, cache_status: bytes):
+        headers = entry.headers + [
+            (b"etag", entry.etag),
+            (b"cache-control", f"public, max-age={RESPONSE_CACHE_MAX_AGE}".encode()),
+            (b"x-cache", cache_status),
+        ]
+        if _etag_matches(if_none_match, entry.etag):
+            self.cache.not_modified += 1
+            headers = [(n, v) for n, v in headers if n.lower() not in (b"content-length", b"content-type")]
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await send({"type": "http.response.start", "status": entry.status, "headers": headers})
+        await send({"type": "http.response.body", "body": entry.body})
@@ -0,0 +1,233 @@
+"""Typeahead search index over Pokemon names and forms"""
+import logging
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from config import DATA_BACKEND
+from domain.records import SearchEntry
+from services.dataset import register_reload_hook
+from services.memory_store import get_store
+from services.sparql_service import get_search_list_from_sparql
+
+
+logger = logging.getLogger(__name__)
+
+
+# Match tiers, best first
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING, FUZZY = range(5)
+MATCH_NAMES = ["exact", "prefix", "prefix", "substring", "fuzzy"]
+
+# Minimum Dice similarity between trigram sets for a fuzzy match
+FUZZY_THRESHOLD = 0.5
+# Queries shorter than this have too few trigrams to match fuzzily
+FUZZY_MIN_LENGTH = 3
+
+# Upper bound on rows fetched from GraphDB when building the index
+_SOURCE_ROW_LIMIT = 100000
+
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z])(?=[A-Z])")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace
+
+    "Flabébé" -> "flabebe", "Mr. Mime" -> "mr mime"
+    """
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def trigrams(term: str) -> Set[str]:
+    """Padded character trigrams of a normalized term"""
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """Prefix trie plus trigram index over the search-list entries
+
+    Form names are stored as "<Species><Form label>" (e.g. "CharizardMega
+    Charizard X"); the camel-case boundary is split so both the full name and
+    the form label ("mega charizard x") are searchable. Every word suffix of a
+    name is inserted into the trie, and each trie node keeps its matching
+    entries pre-sorted by rank, so a prefix lookup is one walk down the trie
+    plus a slice.
+    """
+
+    def __init__(self, entries: Iterable[SearchEntry]):
+        self.entries: List[SearchEntry] = list(entries)
+        self.keys: List[str] = []
+        self._exact: Dict[str, List[int]] = {}
+        self._trie: List[Dict[str, int]] = [{}]
+        self._postings: List[List[Tuple[int, int]]] = [[]]
+        self._trigram_terms: Dict[str, List[int]] = {}
+        self._terms: List[Tuple[str, int]] = []
+        self._term_sizes: List[int] = []
+
+        # Within a tier: base forms first (search lists are ordered base-first
+        # per ID), then national dex order
+        self._order = []
+        seen_ids = set()
+        for i, entry in enumerate(self.entries):
+            self._order.append((entry.id in seen_ids, entry.id, i))
+            seen_ids.add(entry.id)
+
+        for i, entry in enumerate(self.entries):
+            self._add_entry(i, entry.name)
+        self._finish_postings()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _add_entry(self, entry_index: int, name: str):
+        parts = _CAMEL_BOUNDARY.split(name, maxsplit=1)
+        key = normalize(" ".join(parts))
+        self.keys.append(key)
+
+        self._exact.setdefault(key, []).append(entry_index)
+        if len(parts) > 1:
+            self._exact.setdefault(normalize(parts[1]), []).append(entry_index)
+
+        words = key.split(" ")
+        for start in range(len(words)):
+            self._insert(" ".join(words[start:]), entry_index, PREFIX if start == 0 else WORD_PREFIX)
+
+        for term in dict.fromkeys([key, *words]):
+            term_id = len(self._terms)
+            term_trigrams = trigrams(term)
+            self._terms.append((term, entry_index))
+            self._term_sizes.append(len(term_trigrams))
+            for trigram in term_trigrams:
+                self._trigram_terms.setdefault(trigram, []).append(term_id)
+
+    def _insert(self, key: str, entry_index: int, tier: int):
+        node = 0
+        for char in key:
+            child = self._trie[node].get(char)
+            if child is None:
+                child = len(self._trie)
+                self._trie[node][char] = child
+                self._trie.append({})
+                self._postings.append([])
+            node = child
+            self._postings[node].append((tier, entry_index))
+
+    def _finish_postings(self):
+        # Keep each entry once per node, at its best tier, in rank order
+        for node, postings in enumerate(self._postings):
+            best: Dict[int, int] = {}
+            for tier, entry_index in postings:
+                if tier < best.get(entry_index, FUZZY + 1):
+                    best[entry_index] = tier
+            self._postings[node] = sorted(
+                ((tier, entry_index) for entry_index, tier in best.items()),
+                key=lambda p: (p[0], self._order[p[1]])
+            )
+
+    def _prefix(self, query: str) -> List[Tuple[int, int]]:
+        node = 0
+        for char in query:
+            node = self._trie[node].get(char)
+            if node is None:
+                return []
+        return self._postings[node]
+
+    def _fuzzy(self, query: str) -> List[int]:
+        query_trigrams = trigrams(query)
+        shared: Dict[int, int] = {}
+        for trigram in query_trigrams:
+            for term_id in self._trigram_terms.get(trigram, ()):
+                shared[term_id] = shared.get(term_id, 0) + 1
+
+        scores: Dict[int, float] = {}
+        for term_id, count in shared.items():
+            score = 2 * count / (len(query_trigrams) + self._term_sizes[term_id])
+            if score >= FUZZY_THRESHOLD:
+                entry_index = self._terms[term_id][1]
+                scores[entry_index] = max(scores.get(entry_index, 0.0), score)
+
+        return sorted(scores, key=lambda i: (-scores[i], self._order[i]))
+
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        """Rank entries matching a typeahead query
+
+        Exact matches come first, then prefix matches on the full name, then
+        prefix matches on a later word, then substring matches; fuzzy trigram
+        matches are only consulted when those do not fill the limit.
+
+        Args:
+            query: Raw user input
+            limit: Maximum number of results
+
+        Returns:
+            Search-list entries (id, name, types, imageUrl) with a "match" key
+        """
+        query = normalize(query)
+        if not query or limit <= 0:
+            return []
+
+        ranked: List[Tuple[int, int]] = []
+        seen: Set[int] = set()
+
+        def take(tier: int, entry_index: int) -> bool:
+            if entry_index not in seen:
+                seen.add(entry_index)
+                ranked.append((tier, entry_index))
+            return len(ranked) >= limit
+
+        done = False
+        for entry_index in sorted(self._exact.get(query, ()), key=self._order.__getitem__):
+            if take(EXACT, entry_index):
+                done = True
+                break
+
+        if not done:
+            for tier, entry_index in self._prefix(query):
+                if take(tier, entry_index):
+                    done = True
+                    break
+
+        if not done:
+            substring = [i for i, key in enumerate(self.keys) if query in key and i not in seen]
+            for entry_index in sorted(substring, key=self._order.__getitem__):
+                if take(SUBSTRING, entry_index):
+                    done = True
+                    break
+
+        if not done and len(query) >= FUZZY_MIN_LENGTH:
+            for entry_index in self._fuzzy(query):
+                if take(FUZZY, entry_index):
+                    break
+
+        return [
+            {**self.entries[entry_index].to_dict(), "match": MATCH_NAMES[tier]}
+            for tier, entry_index in ranked
+        ]
+
+
+_index: Optional[SearchIndex] = None
+
+
+async def _load_entries() -> List[SearchEntry]:
+    if DATA_BACKEND == "memory":
+        return get_store().search_list(_SOURCE_ROW_LIMIT)
+    return await get_search_list_from_sparql(_SOURCE_ROW_LIMIT)
+
+
+@register_reload_hook
+async def rebuild_search_index() -> SearchIndex:
+    """(Re)build the global search index from the configured data backend"""
+    global _index
+    _index = SearchIndex(await _load_entries())
+    logger.info("Built search index: %d names", len(_index))
+    return _index
+
+
+async def get_search_index() -> SearchIndex:
+    """Return the global search index, building it on first use"""
+    if _index is None:
+        return await rebuild_search_index()
+    return _index
@@ -0,0 +1,42 @@
+"""Fast JSON responses (orjson) for records and large lists"""
+from typing import Any, Iterable
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+
+from domain.records import SearchEntry
+
+
+def _default(obj: Any):
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is not None:
+        return to_dict()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content (dicts, lists, records, NumPy scalars/arrays) to JSON bytes"""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson; understands records (anything with to_dict())
+
+    Used as the app's default response class. Routes returning records must
+    return the response directly (json_response), since FastAPI's
+    jsonable_encoder does not know about slotted records.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(content: Any, status_code: int = 200) -> FastJSONResponse:
+    """Wrap route output so it skips jsonable_encoder"""
+    return FastJSONResponse(content, status_code=status_code)
+
+
+def search_list_response(entries: Iterable[SearchEntry]) -> Response:
+    """JSON array response built from the entries' cached fragments"""
+    body = b"[" + b",".join(entry.encoded() for entry in entries) + b"]"
+    return Response(body, media_type="application/json")
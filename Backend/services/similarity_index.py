@@ -0,0 +1,132 @@
+"""Nearest-neighbour index over base-stat vectors for "similar Pokemon" queries"""
+import logging
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from services.dataset import register_reload_hook
+from services.memory_store import NO_TYPE, PokedexStore, get_store
+
+
+logger = logging.getLogger(__name__)
+
+
+class StatIndex:
+    """Exact k-NN over z-score normalized base stats
+
+    The dataset is small enough (~700 x 6) to precompute the full pairwise
+    distance matrix and each Pokemon's neighbour order at load time; a query
+    is then a filtered slice of one precomputed row.
+    """
+
+    def __init__(self, store: PokedexStore):
+        n = len(store)
+        self.ids = np.frombuffer(store.ids, dtype=np.uint16).astype(np.int64)
+        self.names = [store.form_names[store.form_offsets[row]] for row in range(n)]
+        self.generation = np.frombuffer(store.generation, dtype=np.uint8).astype(np.int64)
+        self.stat_names = list(store.stats)
+        self.stats = np.stack(
+            [np.frombuffer(store.stats[key], dtype=np.uint16) for key in self.stat_names], axis=1
+        ).astype(np.float32)
+
+        # Every type the Pokemon resource carries (type1 and all type2 values)
+        self.type_names = list(store.type_names)
+        self._type_codes = {name.lower(): code for code, name in enumerate(self.type_names)}
+        self.has_type = np.zeros((n, len(self.type_names)), dtype=bool)
+        self.types: List[List[str]] = []
+        for row in range(n):
+            codes = [store.type1[row]] if store.type1[row] != NO_TYPE else []
+            codes += list(store.type2_values[store.type2_offsets[row]:store.type2_offsets[row + 1]])
+            self.has_type[row, codes] = True
+            self.types.append([self.type_names[c] for c in dict.fromkeys(codes)])
+
+        std = self.stats.std(axis=0)
+        std[std == 0] = 1
+        self.vectors = (self.stats - self.stats.mean(axis=0)) / std
+
+        squared = (self.vectors ** 2).sum(axis=1)
+        distances = squared[:, None] + squared[None, :] - 2 * self.vectors @ self.vectors.T
+        self.distances = np.sqrt(np.maximum(distances, 0))
+        np.fill_diagonal(self.distances, 0)
+        # Stable sort: equal distances keep national dex order
+        self.neighbours = np.argsort(self.distances, axis=1, kind="stable").astype(np.int32)
+
+        self._rows = {int(pokemon_id): row for row, pokemon_id in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def candidate_mask(self, type_name: Optional[str] = None, generations: Iterable[int] = ()) -> Optional[np.ndarray]:
+        """Boolean mask of Pokemon passing the filters (None when unfiltered)
+
+        Raises:
+            ValueError: If the type name is unknown
+        """
+        mask = None
+        if type_name:
+            code = self._type_codes.get(type_name.lower())
+            if code is None:
+                raise ValueError(f"Unknown type: {type_name}")
+            mask = self.has_type[:, code].copy()
+        generations = list(generations)
+        if generations:
+            in_generation = np.isin(self.generation, generations)
+            mask = in_generation if mask is None else mask & in_generation
+        return mask
+
+    def similar(self, pokemon_id: int, k: int = 10, mask: Optional[np.ndarray] = None) -> Optional[List[dict]]:
+        """The k Pokemon with the closest base stats
+
+        Args:
+            pokemon_id: National dex number of the query Pokemon
+            k: Number of neighbours
+            mask: Optional candidate filter from candidate_mask()
+
+        Returns:
+            Neighbour dicts (id, name, types, generation, distance, stats),
+            nearest first, or None if the id is unknown
+        """
+        row = self._rows.get(pokemon_id)
+        if row is None:
+            return None
+
+        order = self.neighbours[row]
+        if mask is not None:
+            order = order[mask[order]]
+        order = order[order != row][:k]
+
+        return [
+            {
+                "id": int(self.ids[neighbour]),
+                "name": self.names[neighbour],
+                "types": self.types[neighbour],
+                "generation": int(self.generation[neighbour]),
+                "distance": round(float(self.distances[row, neighbour]), 4),
+                "stats": dict(zip(self.stat_names, self.stats[neighbour].astype(int).tolist())),
+            }
+            for neighbour in order
+        ]
+
+    def similar_many(self, pokemon_ids: Iterable[int], k: int = 10,
+                     mask: Optional[np.ndarray] = None) -> Dict[str, Optional[List[dict]]]:
+        """similar() for many Pokemon, keyed by ID (None for unknown IDs)"""
+        return {str(pid): self.similar(pid, k, mask) for pid in dict.fromkeys(pokemon_ids)}
+
+
+_index: Optional[StatIndex] = None
+
+
+@register_reload_hook
+def rebuild_stat_index() -> StatIndex:
+    """(Re)build the global stat index from the loaded Pokedex store"""
+    global _index
+    _index = StatIndex(get_store())
+    logger.info("Built stat similarity index for %d Pokemon", len(_index))
+    return _index
+
+
+def get_stat_index() -> StatIndex:
+    """Return the global stat index, building it on first use"""
+    if _index is None:
+        return rebuild_stat_index()
+    return _index
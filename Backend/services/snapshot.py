@@ -0,0 +1,165 @@
+"""Versioned binary snapshot of the columnar store, loaded zero-copy via mmap
+
+Layout (little-endian):
+
+    header   magic "PKDXSNAP", format version, CRC32 of the payload,
+             SHA-256 of the source Turtle files, section count
+    table    one entry per section: name, array typecode, offset, length
+    payload  8-byte aligned sections
+
+Numeric sections are fixed-width arrays (typecodes as in the array module)
+and are returned as memoryviews over the mapping, so opening a snapshot
+copies nothing and every worker process shares the same page-cache pages.
+String lists are stored once in an interned string table (u32 offsets +
+UTF-8 blob) and referenced by u32 indexes.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+
+MAGIC = b"PKDXSNAP"
+# Bumped whenever a derived column changes meaning, so older snapshots are rebuilt
+# (2: base forms no longer inherit an alternate form's type2)
+FORMAT_VERSION = 2
+
+_HEADER = struct.Struct("<8sII32sI")
+_SECTION = struct.Struct("<32scxxxQQ")
+_ALIGN = 8
+
+# Typecodes are stored as-is; only fixed-width ones are accepted
+_TYPECODES = {"b", "B", "H", "I", "f"}
+
+_STRINGS_OFFSETS = "$str.offsets"
+_STRINGS_BLOB = "$str.blob"
+
+
+class SnapshotError(Exception):
+    """The snapshot is missing, corrupt, of another format version or stale"""
+
+
+class Snapshot(NamedTuple):
+    source_digest: bytes
+    columns: Dict[str, memoryview]
+    strings: Dict[str, List[str]]
+
+
+def source_digest(paths: Iterable[str]) -> bytes:
+    """SHA-256 over the names and contents of the source files"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.basename(path).encode("utf-8") + b"\0")
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.digest()
+
+
+def write_snapshot(
+    path: str,
+    digest: bytes,
+    columns: Dict[str, array],
+    strings: Dict[str, Sequence[str]]
+):
+    """Write a snapshot atomically (temp file + rename)
+
+    Args:
+        path: Output file
+        digest: source_digest() of the files the data was built from
+        columns: Section name -> array (typecodes b, B, H, I or f)
+        strings: List name -> strings (interned into one table)
+    """
+    interned: Dict[str, int] = {}
+    for values in strings.values():
+        for value in values:
+            interned.setdefault(value, len(interned))
+    offsets = array("I", [0])
+    blob = bytearray()
+    for value in interned:
+        blob += value.encode("utf-8")
+        offsets.append(len(blob))
+
+    sections = dict(columns)
+    sections[_STRINGS_OFFSETS] = offsets
+    sections[_STRINGS_BLOB] = array("B", bytes(blob))
+    for name, values in strings.items():
+        sections[f"$list.{name}"] = array("I", (interned[value] for value in values))
+
+    table_size = _HEADER.size + _SECTION.size * len(sections)
+    entries = []
+    payload = bytearray()
+    for name, values in sections.items():
+        if values.typecode not in _TYPECODES:
+            raise ValueError(f"Unsupported typecode {values.typecode!r} for section {name}")
+        if len(name.encode("utf-8")) > 32:
+            raise ValueError(f"Section name too long: {name}")
+        payload += b"\0" * (-(table_size + len(payload)) % _ALIGN)
+        data = values.tobytes()
+        entries.append(_SECTION.pack(name.encode("utf-8"), values.typecode.encode("ascii"),
+                                     table_size + len(payload), len(data)))
+        payload += data
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, zlib.crc32(payload), digest, len(sections))
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.writelines(entries)
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path: str, expected_digest: Optional[bytes] = None) -> Snapshot:
+    """Map a snapshot read-only and return its sections
+
+    Args:
+        path: Snapshot file
+        expected_digest: If given, the snapshot must have been built from
+            source files with this digest
+
+    Raises:
+        SnapshotError: If the file is missing, corrupt, of another format
+            version or built from different source files
+    """
+    try:
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        raise SnapshotError(f"Cannot map {path}: {e}") from e
+
+    view = memoryview(mapping)
+    if len(view) < _HEADER.size:
+        raise SnapshotError(f"{path} is truncated")
+    magic, version, crc, digest, count = _HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise SnapshotError(f"{path} is not a Pokedex snapshot")
+    if version != FORMAT_VERSION:
+        raise SnapshotError(f"{path} has format version {version}, expected {FORMAT_VERSION}")
+    if expected_digest is not None and digest != expected_digest:
+        raise SnapshotError(f"{path} was built from different source files")
+
+    table_end = _HEADER.size + _SECTION.size * count
+    if len(view) < table_end or zlib.crc32(view[table_end:]) != crc:
+        raise SnapshotError(f"{path} is corrupt (checksum mismatch)")
+
+    sections: Dict[str, memoryview] = {}
+    for i in range(count):
+        raw_name, typecode, offset, length = _SECTION.unpack_from(view, _HEADER.size + i * _SECTION.size)
+        name = raw_name.rstrip(b"\0").decode("utf-8")
+        sections[name] = view[offset:offset + length].cast(typecode.decode("ascii"))
+
+    offsets = sections.pop(_STRINGS_OFFSETS)
+    blob = bytes(sections.pop(_STRINGS_BLOB))
+    table = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+    columns: Dict[str, memoryview] = {}
+    strings: Dict[str, List[str]] = {}
+    for name, section in sections.items():
+        if name.startswith("$list."):
+            strings[name[len("$list."):]] = [table[i] for i in section]
+        else:
+            columns[name] = section
+    return Snapshot(digest, columns, strings)
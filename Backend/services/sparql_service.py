@@ -1,21 +1,43 @@
 """SPARQL query service for interacting with the GraphDB"""
-from typing import List
-import requests
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from string import Template
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+import httpx
 from fastapi import HTTPException
 
-from config import GRAPHDB_ENDPOINT, SPARQL_PREFIXES
+from config import (
+    ADMIN_TOKEN, GRAPHDB_ENDPOINT, SPARQL_PREFIXES, POKEMON_COM_IMAGE_BASE_URL,
+    SPARQL_CACHE_TTL, SPARQL_CACHE_MAX_ENTRIES, SPARQL_SLOW_QUERY_MS, SPARQL_SLOW_QUERY_LOG,
+    SPARQL_SLOW_QUERY_LOG_MAX_BYTES, SPARQL_SLOW_QUERY_LOG_BACKUPS
+)
+from domain.pokemon_logic import get_correct_type2_for_form
+from domain.records import SearchEntry
+from services.dataset import dataset_version, register_reload_hook
+from services.http_client import close_http_client, http_request, http_stream
+from services.memory_store import STAT_PREDICATES, PokedexStore, set_store
+from services.turtle_parser import Literal
 from utils import extract_value_from_uri, is_base_form
 
 
-# Global cache for Pokemon forms to avoid repeated SPARQL queries
-_pokemon_forms_cache = {}
+logger = logging.getLogger(__name__)
 
 
-def execute_sparql_query(query: str) -> dict:
+async def execute_sparql_query(query: str, label: Optional[str] = None) -> dict:
     """Execute SPARQL query against GraphDB
     
     Args:
         query: SPARQL query string (prefixes will be prepended automatically)
+        label: Query template name, for request tracing
         
     Returns:
         JSON response from the SPARQL endpoint
@@ -24,11 +46,14 @@ def execute_sparql_query(query: str) -> dict:
         HTTPException: If the query fails
     """
     full_query = SPARQL_PREFIXES + query
+    started = time.perf_counter()
     
     try:
-        response = requests.post(
+        response = await http_request(
+            "POST",
             GRAPHDB_ENDPOINT,
-            data=full_query,
+            label=label,
+            content=full_query.encode("utf-8"),
             headers={
                 "Content-Type": "application/sparql-query",
                 "Accept": "application/sparql-results+json"
@@ -36,118 +61,961 @@ def execute_sparql_query(query: str) -> dict:
             timeout=30
         )
         response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"SPARQL Error: {e}")
+        data = response.json()
+    except httpx.HTTPError as e:
+        logger.error("SPARQL error (%s): %s", label, e)
+        profiler.record_error(label)
         raise HTTPException(
             status_code=500, 
             detail=f"Database query failed: {str(e)}"
         )
+    
+    bindings = data["results"]["bindings"]
+    profiler.record(label, query, time.perf_counter() - started, len(response.content),
+                    len(bindings), count_results(binding.get("id", {}).get("value") for binding in bindings))
+    return data
+
+
+async def stream_sparql_query(query: str, label: Optional[str] = None) -> AsyncIterator[Dict[str, str]]:
+    """Execute a SELECT query and yield its rows as they arrive
+    
+    Results are requested as SPARQL CSV, which can be parsed line by line,
+    so memory use does not grow with the result size. Values are plain
+    strings (IRIs unabbreviated, literals without datatype); unbound
+    variables are empty strings.
+    
+    Args:
+        query: SPARQL query string (prefixes will be prepended automatically)
+        label: Query template name, for request tracing
+        
+    Yields:
+        Dict mapping each projected variable to its value (values must not
+        contain line breaks)
+        
+    Raises:
+        HTTPException: If the query fails
+    """
+    full_query = SPARQL_PREFIXES + query
+    started = time.perf_counter()
+    size = 0
+    ids = []
+    
+    try:
+        async with http_stream(
+            "POST",
+            GRAPHDB_ENDPOINT,
+            label=label,
+            content=full_query.encode("utf-8"),
+            headers={
+                "Content-Type": "application/sparql-query",
+                "Accept": "text/csv"
+            },
+            timeout=300
+        ) as response:
+            response.raise_for_status()
+            header = None
+            async for line in response.aiter_lines():
+                size += len(line.encode("utf-8")) + 1
+                if not line:
+                    continue
+                values = next(csv.reader([line]))
+                if header is None:
+                    header = values
+                    continue
+                row = dict(zip(header, values))
+                ids.append(row.get("id"))
+                yield row
+    except httpx.HTTPError as e:
+        logger.error("SPARQL error (%s): %s", label, e)
+        profiler.record_error(label)
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Database query failed: {str(e)}"
+        )
+    
+    profiler.record(label, query, time.perf_counter() - started, size, len(ids), count_results(ids))
+
+
+# ============================================================================
+# Query profiler
+# ============================================================================
+
+def count_results(ids: Iterable[Optional[str]]) -> int:
+    """Distinct ?id values among a query's rows (rows without an ?id count individually)
+    
+    rows / results is the query's row amplification: several rows per Pokemon
+    mean OPTIONAL patterns (e.g. multiple type2 or ability bindings) multiplied
+    the result set, and the rows are deduplicated in Python afterwards.
+    """
+    seen = set()
+    anonymous = 0
+    for value in ids:
+        if value:
+            seen.add(value)
+        else:
+            anonymous += 1
+    return len(seen) + anonymous
+
+
+class QueryProfile:
+    """Aggregated measurements of one query template"""
+    
+    __slots__ = ("calls", "errors", "slow", "total_ms", "max_ms", "bytes", "rows", "results")
+    
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.slow = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.bytes = 0
+        self.rows = 0
+        self.results = 0
+    
+    def add(self, ms: float, size: int, rows: int, results: int, slow: bool = False):
+        self.calls += 1
+        self.slow += slow
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.bytes += size
+        self.rows += rows
+        self.results += results
+    
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "slow": self.slow,
+            "totalMs": round(self.total_ms, 3),
+            "meanMs": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "maxMs": round(self.max_ms, 3),
+            "bytes": self.bytes,
+            "rows": self.rows,
+            "results": self.results,
+            "rowsPerResult": round(self.rows / self.results, 3) if self.results else 0.0,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "QueryProfile":
+        profile = cls()
+        profile.calls = data["calls"]
+        profile.errors = data["errors"]
+        profile.slow = data["slow"]
+        profile.total_ms = data["totalMs"]
+        profile.max_ms = data["maxMs"]
+        profile.bytes = data["bytes"]
+        profile.rows = data["rows"]
+        profile.results = data["results"]
+        return profile
+
+
+class QueryProfiler:
+    """Per-template latency, response size and row counts, plus the slow-query log
+    
+    Queries taking at least slow_ms are appended to log_path as one JSON
+    object per line (template, ms, bytes, rows, results, query); the file is
+    rotated at max_bytes with `backups` old files kept.
+    """
+    
+    def __init__(self, slow_ms: float = SPARQL_SLOW_QUERY_MS, log_path: str = SPARQL_SLOW_QUERY_LOG,
+                 max_bytes: int = SPARQL_SLOW_QUERY_LOG_MAX_BYTES, backups: int = SPARQL_SLOW_QUERY_LOG_BACKUPS):
+        self.slow_ms = slow_ms
+        self.log_path = log_path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._profiles: Dict[str, QueryProfile] = {}
+        self._log: Optional[logging.Logger] = None
+    
+    def _profile(self, name: Optional[str]) -> QueryProfile:
+        name = name or "adhoc"
+        if name not in self._profiles:
+            self._profiles[name] = QueryProfile()
+        return self._profiles[name]
+    
+    def _slow_log(self) -> Optional[logging.Logger]:
+        if self._log is None and self.log_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+            handler = RotatingFileHandler(self.log_path, maxBytes=self.max_bytes,
+                                          backupCount=self.backups, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._log = logging.getLogger(f"sparql.slow_queries.{id(self)}")
+            self._log.setLevel(logging.INFO)
+            self._log.propagate = False
+            self._log.addHandler(handler)
+        return self._log
+    
+    def record(self, name: Optional[str], query: str, seconds: float, size: int, rows: int, results: int):
+        """Record one successful query (name is the template name; None for ad-hoc queries)"""
+        ms = seconds * 1000
+        slow = ms >= self.slow_ms
+        self._profile(name).add(ms, size, rows, results, slow)
+        if slow:
+            log = self._slow_log()
+            if log is not None:
+                log.info(json.dumps({
+                    "time": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                    "template": name or "adhoc",
+                    "ms": round(ms, 3),
+                    "bytes": size,
+                    "rows": rows,
+                    "results": results,
+                    "query": query.strip(),
+                }))
+    
+    def record_error(self, name: Optional[str]):
+        self._profile(name).errors += 1
+    
+    def stats(self) -> Dict[str, dict]:
+        """Template name -> profile, by descending total time"""
+        ranked = sorted(self._profiles.items(), key=lambda item: -item[1].total_ms)
+        return {name: profile.to_dict() for name, profile in ranked}
+    
+    def reset(self):
+        self._profiles.clear()
+
+
+profiler = QueryProfiler()
 
 
-def get_pokemon_forms_from_sparql(pokemon_id: int) -> list:
-    """Get all forms for a Pokemon ID from the RDF data, sorted with base form first
+# ============================================================================
+# Prepared query registry
+# ============================================================================
+
+# Parameter kinds:
+#   "int"    - a single integer inlined into the query text (OFFSET, FILTER bounds)
+#   "limit"  - optional LIMIT clause ("LIMIT n", or nothing when omitted)
+#   "ints"   - VALUES ?<param> { "1"^^xsd:int ... }   (matches ex:number etc.)
+#   "strings"- VALUES ?<param> { "..."^^xsd:string ... }
+#   "types"  - VALUES ?<param> { type:Fire ... }      (type names bound as type IRIs)
+# VALUES and limit parameters are optional; when omitted the placeholder renders empty.
+PARAM_KINDS = ("int", "limit", "ints", "strings", "types")
+
+_TYPE_NAME = re.compile(r"^[A-Za-z]+$")
+
+
+def _escape_string(value: str) -> str:
+    return (str(value).replace("\\", "\\\\").replace('"', '\\"')
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+def format_values_clause(variable: str, values: Iterable, kind: str = "ints") -> str:
+    """Build a SPARQL VALUES block binding a variable to typed terms
     
     Args:
-        pokemon_id: The Pokemon's national dex number
+        variable: Variable name without the leading '?'
+        values: Values to bind (ints, strings or type names, depending on kind)
+        kind: One of "ints", "strings", "types"
         
     Returns:
-        List of dicts with keys: name, type2, is_base
+        VALUES clause string, e.g. 'VALUES ?id { "1"^^xsd:int "2"^^xsd:int }'
     """
-    if pokemon_id in _pokemon_forms_cache:
-        return _pokemon_forms_cache[pokemon_id]
+    if kind == "ints":
+        terms = [f'"{int(v)}"^^xsd:int' for v in values]
+    elif kind == "strings":
+        terms = [f'"{_escape_string(v)}"^^xsd:string' for v in values]
+    elif kind == "types":
+        terms = [f"type:{v}" for v in values]
+    else:
+        raise ValueError(f"Unknown VALUES kind: {kind}")
+    return f"VALUES ?{variable} {{ {' '.join(terms)} }}"
+
+
+class QueryTemplate:
+    """A named SPARQL query with typed parameters and its own result cache
     
-    query = f"""
-    SELECT DISTINCT ?name ?type2
-    WHERE {{
-      ?pokemon a ex:Pokemon ;
-               ex:number {pokemon_id} ;
-               ex:name ?name .
-      OPTIONAL {{ ?pokemon ex:type2 ?type2 . }}
-    }}
-    ORDER BY ?name
+    The template text uses $param placeholders (string.Template syntax) and is
+    checked against the declared parameters once, at registration.
     """
     
-    data = execute_sparql_query(query)
-    forms = []
+    def __init__(self, name: str, text: str, params: Dict[str, str],
+                 ttl: float = SPARQL_CACHE_TTL, max_entries: int = SPARQL_CACHE_MAX_ENTRIES):
+        self.name = name
+        self.params = params
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._template = Template(text)
+        
+        for param, kind in params.items():
+            if kind not in PARAM_KINDS:
+                raise ValueError(f"Query {name}: unknown kind {kind!r} for ${param}")
+        placeholders = set(self._template.get_identifiers())
+        if placeholders != set(params):
+            raise ValueError(f"Query {name}: placeholders {sorted(placeholders)} "
+                             f"do not match parameters {sorted(params)}")
+        
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self._cache: "OrderedDict[tuple, Tuple[float, dict]]" = OrderedDict()
     
-    for binding in data["results"]["bindings"]:
-        raw_name = binding.get("name", {}).get("value", "")
+    def normalize(self, values: Dict[str, any]) -> tuple:
+        """Validate and canonicalize parameters into a hashable cache key
         
-        # Extract type2 if present
-        type2 = None
-        if "type2" in binding:
-            type2 = extract_value_from_uri(binding["type2"]["value"])
+        Raises:
+            ValueError: If a parameter is unknown, missing or of the wrong type
+        """
+        unknown = set(values) - set(self.params)
+        if unknown:
+            raise ValueError(f"Query {self.name}: unknown parameters {sorted(unknown)}")
         
-        # Add form if not already in list (handle duplicates from cartesian products)
-        if not any(f["name"] == raw_name for f in forms):
-            forms.append({
-                "name": raw_name,
-                "type2": type2,
-                "is_base": is_base_form(raw_name)
-            })
+        key = []
+        for param, kind in sorted(self.params.items()):
+            value = values.get(param)
+            if kind == "int":
+                if value is None:
+                    raise ValueError(f"Query {self.name}: missing parameter {param}")
+                key.append((param, int(value)))
+            elif value is None:
+                key.append((param, None))
+            elif kind == "limit":
+                key.append((param, max(int(value), 0)))
+            else:
+                if isinstance(value, (str, int)):
+                    value = [value]
+                if kind == "ints":
+                    value = sorted({int(v) for v in value})
+                elif kind == "strings":
+                    value = sorted({str(v) for v in value})
+                else:
+                    value = sorted({str(v) for v in value})
+                    invalid = [v for v in value if not _TYPE_NAME.match(v)]
+                    if invalid:
+                        raise ValueError(f"Query {self.name}: invalid type names {invalid}")
+                key.append((param, tuple(value)))
+        return tuple(key)
     
-    # Sort: base forms first, then alphabetically
-    forms.sort(key=lambda x: (not x["is_base"], x["name"]))
+    def render(self, key: tuple) -> str:
+        """Query text for normalized parameters"""
+        substitutions = {}
+        for param, value in key:
+            kind = self.params[param]
+            if kind == "int":
+                substitutions[param] = str(value)
+            elif value is None:
+                substitutions[param] = ""
+            elif kind == "limit":
+                substitutions[param] = f"LIMIT {value}"
+            else:
+                substitutions[param] = format_values_clause(param, value, kind)
+        return self._template.substitute(substitutions)
     
-    _pokemon_forms_cache[pokemon_id] = forms
-    return forms
+    def cached(self, key: tuple) -> Optional[dict]:
+        entry = self._cache.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry[1]
+    
+    def store(self, key: tuple, result: dict):
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        self._cache[key] = (time.monotonic() + self.ttl, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+    
+    def clear(self):
+        self._cache.clear()
+    
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._cache),
+            "maxEntries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared,
+        }
+
 
+_queries: Dict[str, QueryTemplate] = {}
+_inflight: Dict[tuple, asyncio.Task] = {}
 
-def get_evolution_chain_from_sparql(pokemon_id: int) -> List[int]:
-    """Get the complete evolution chain for a Pokemon
+
+def register_query(name: str, text: str, params: Optional[Dict[str, str]] = None, **options) -> QueryTemplate:
+    """Register a named query template (see QueryTemplate for options)"""
+    if name in _queries:
+        raise ValueError(f"Query {name} is already registered")
+    template = QueryTemplate(name, text, params or {}, **options)
+    _queries[name] = template
+    return template
+
+
+async def run_query(name: str, /, **params) -> dict:
+    """Run a registered query, serving repeats from its result cache
+    
+    Identical queries already in flight are shared instead of being sent
+    again. Results are shared between callers and must not be mutated.
     
     Args:
-        pokemon_id: The Pokemon's national dex number
+        name: Registered query name
+        **params: Template parameters
         
     Returns:
-        List of Pokemon IDs in the evolution chain, ordered from base to final
+        JSON response from the SPARQL endpoint
+        
+    Raises:
+        ValueError: If the parameters do not match the template
+        HTTPException: If the query fails
+    """
+    template = _queries[name]
+    key = template.normalize(params)
+    # Keyed on the dataset version too, so a version bump bypasses stale results
+    version = dataset_version()
+    cache_key = (version, key)
+    
+    result = template.cached(cache_key)
+    if result is not None:
+        template.hits += 1
+        return result
+    
+    inflight_key = (name, cache_key)
+    task = _inflight.get(inflight_key)
+    if task is not None and task.get_loop() is asyncio.get_running_loop():
+        template.shared += 1
+        return await asyncio.shield(task)
+    
+    template.misses += 1
+    task = asyncio.get_running_loop().create_task(execute_sparql_query(template.render(key), name))
+    _inflight[inflight_key] = task
+    
+    def finished(done: asyncio.Task):
+        _inflight.pop(inflight_key, None)
+        # Results of a query that straddled a reload belong to the old dataset
+        if not done.cancelled() and done.exception() is None and version == dataset_version():
+            template.store(cache_key, done.result())
+    
+    task.add_done_callback(finished)
+    return await asyncio.shield(task)
+
+
+async def stream_query(name: str, /, **params) -> AsyncIterator[Dict[str, str]]:
+    """Stream a registered query's rows (see stream_sparql_query); never cached
+    
+    Raises:
+        ValueError: If the parameters do not match the template
+        HTTPException: If the query fails
+    """
+    template = _queries[name]
+    template.misses += 1
+    async for row in stream_sparql_query(template.render(template.normalize(params)), name):
+        yield row
+
+
+@register_reload_hook
+def clear_query_cache():
+    """Drop every cached query result (the data may have changed)"""
+    for template in _queries.values():
+        template.clear()
+
+
+def query_cache_stats() -> Dict[str, dict]:
+    """Per-template result cache counters"""
+    return {name: template.stats() for name, template in _queries.items()}
+
+
+def template_params(name: str, raw: Dict[str, str]) -> Dict[str, any]:
+    """Template parameters from strings (e.g. URL query parameters); lists are comma-separated
+    
+    Raises:
+        KeyError: If no query is registered under name
+        ValueError: If a value cannot be converted (the rest is checked when the query is run)
     """
-    query = f"""
+    kinds = _queries[name].params
+    params = {}
+    for param, value in raw.items():
+        kind = kinds.get(param)
+        if kind in ("int", "limit"):
+            params[param] = int(value)
+        elif kind is not None:
+            params[param] = [v.strip() for v in value.split(",") if v.strip()]
+        else:
+            params[param] = value
+    return params
+
+
+async def explain_query(name: str, /, **params) -> str:
+    """Fetch the store's explain plan for a registered query (Blazegraph's ?explain=details, HTML)
+    
+    Raises:
+        KeyError: If no query is registered under name
+        ValueError: If the parameters do not match the template
+        HTTPException: If the store rejects the request
+    """
+    template = _queries[name]
+    full_query = SPARQL_PREFIXES + template.render(template.normalize(params))
+    try:
+        response = await http_request(
+            "POST",
+            GRAPHDB_ENDPOINT,
+            label="explain",
+            data={"query": full_query, "explain": "details"},
+            headers={"Accept": "text/html"},
+            timeout=60
+        )
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        logger.error("SPARQL explain error (%s): %s", name, e)
+        raise HTTPException(
+            status_code=502,
+            detail=f"Explain failed: {str(e)}"
+        )
+    return response.text
+
+
+# ============================================================================
+# Shared query templates
+# ============================================================================
+
+POKEMON_DETAILS = register_query("pokemon_details", """
+    SELECT DISTINCT ?id ?name ?type1 ?type2
+           ?hp ?attack ?defense ?spAttack ?spDefense ?speed
+           (GROUP_CONCAT(DISTINCT ?abilityName; separator=",") AS ?abilities)
+    WHERE {
+      $id
+      $name
+      ?pokemon a ex:Pokemon ;
+               ex:number ?id ;
+               ex:name ?name .
+      
+      OPTIONAL { ?pokemon ex:type1 ?type1 . }
+      OPTIONAL { ?pokemon ex:type2 ?type2 . }
+      OPTIONAL { ?pokemon ex:hp ?hp . }
+      OPTIONAL { ?pokemon ex:attack ?attack . }
+      OPTIONAL { ?pokemon ex:defense ?defense . }
+      OPTIONAL { ?pokemon ex:sp_attack ?spAttack . }
+      OPTIONAL { ?pokemon ex:sp_defense ?spDefense . }
+      OPTIONAL { ?pokemon ex:speed ?speed . }
+      OPTIONAL { 
+        ?ability a ex:Ability ;
+                 ex:possessedBy ?pokemon ;
+                 ex:abilityName ?abilityName .
+      }
+    }
+    GROUP BY ?id ?name ?type1 ?type2 ?hp ?attack ?defense ?spAttack ?spDefense ?speed
+    ORDER BY ?id ?name
+    """, {"id": "ints", "name": "strings"})
+
+POKEMON_ROWS = register_query("pokemon_rows", """
+    SELECT ?id ?name ?type1 ?type2
+    WHERE {
+      $id
+      ?pokemon a ex:Pokemon ;
+               ex:number ?id ;
+               ex:name ?name .
+      
+      OPTIONAL { ?pokemon ex:type1 ?type1 . }
+      OPTIONAL { ?pokemon ex:type2 ?type2 . }
+    }
+    ORDER BY ?id ?name
+    $limit
+    """, {"id": "ints", "limit": "limit"})
+
+POKEMON_FORMS = register_query("pokemon_forms", """
+    SELECT DISTINCT ?id ?name ?type2
+    WHERE {
+      $id
+      ?pokemon a ex:Pokemon ;
+               ex:number ?id ;
+               ex:name ?name .
+      OPTIONAL { ?pokemon ex:type2 ?type2 . }
+    }
+    ORDER BY ?id ?name
+    """, {"id": "ints"})
+
+POKEMON_PAGE_IDS = register_query("pokemon_page_ids", """
+    SELECT DISTINCT ?id
+    WHERE {
+      ?pokemon a ex:Pokemon ;
+               ex:number ?id .
+      FILTER(?id > $after_id)
+    }
+    ORDER BY ?id
+    OFFSET $offset
+    $limit
+    """, {"after_id": "int", "offset": "int", "limit": "limit"})
+
+# Every triple of the Pokemon and Ability resources except the stored
+# effectiveness data, which the store derives from the type chart; too big to cache
+DATASET_TRIPLES = register_query("dataset_triples", """
+    SELECT ?s ?p ?o
+    WHERE {
+      { ?s a ex:Pokemon . } UNION { ?s a ex:Ability . }
+      ?s ?p ?o .
+      FILTER(?p NOT IN (ex:weakTo, ex:resistantTo) && !STRSTARTS(STR(?p), STR(ex:against_)))
+    }
+    """, ttl=0)
+
+POKEMON_BY_TYPE = register_query("pokemon_by_type", """
+    SELECT DISTINCT ?id ?name ?type1 ?type2
+    WHERE {
+      $type
+      ?pokemon a ex:Pokemon ;
+               ex:number ?id ;
+               ex:name ?name .
+      
+      { ?pokemon ex:type1 ?type . }
+      UNION
+      { ?pokemon ex:type2 ?type . }
+      
+      OPTIONAL { ?pokemon ex:type1 ?type1 . }
+      OPTIONAL { ?pokemon ex:type2 ?type2 . }
+    }
+    ORDER BY ?id ?name
+    """, {"type": "types"})
+
+EVOLUTION_LINKS = register_query("evolution_links", """
     SELECT DISTINCT ?fromId ?toId
-    WHERE {{
-      ?link a ex:EvolutionLink ;
-            ex:evolvesFrom ?from ;
-            ex:evolvesTo ?to .
+    WHERE {
+      ?from ex:evolvesTo ?to .
       ?from ex:number ?fromId .
       ?to ex:number ?toId .
-    }}
+    }
+    """)
+
+POKEMON_COUNT = register_query("pokemon_count", """
+    SELECT (COUNT(DISTINCT ?pokemon) AS ?count)
+    WHERE {
+      ?pokemon a ex:Pokemon .
+    }
+    """)
+
+
+# One row per Pokemon resource with every exported column; multi-valued
+# names, type2s and abilities are "|"-joined, multi-valued stats keep the
+# base (minimum) value like the in-memory store. Effectiveness is not queried:
+# it is derived from the types (domain.type_chart)
+POKEMON_EXPORT = register_query("pokemon_export", """
+    SELECT ?id
+           (SAMPLE(?generation) AS ?gen) (SAMPLE(STR(?type1)) AS ?t1)
+           (GROUP_CONCAT(DISTINCT ?name; separator="|") AS ?names)
+           (GROUP_CONCAT(DISTINCT STR(?type2); separator="|") AS ?type2s)
+           (GROUP_CONCAT(DISTINCT ?abilityName; separator="|") AS ?abilities)
+""" + "".join(f"           (MIN(?{key}) AS ?stat_{key})\n" for key in STAT_PREDICATES) + """
+    WHERE {
+      ?pokemon a ex:Pokemon ;
+               ex:number ?id ;
+               ex:name ?name .
+      OPTIONAL { ?pokemon ex:generation ?generation . }
+      OPTIONAL { ?pokemon ex:type1 ?type1 . }
+      OPTIONAL { ?pokemon ex:type2 ?type2 . }
+      OPTIONAL {
+        ?ability a ex:Ability ;
+                 ex:possessedBy ?pokemon ;
+                 ex:abilityName ?abilityName .
+      }
+""" + "".join(f"      OPTIONAL {{ ?pokemon ex:{predicate} ?{key} . }}\n" for key, predicate in STAT_PREDICATES.items()) + """
+    }
+    GROUP BY ?id
+    ORDER BY ?id
+    """, ttl=0)
+
+
+# ============================================================================
+# Query helpers
+# ============================================================================
+
+def resolve_forms(names: Iterable[str], type2s: Iterable[str]) -> list:
+    """Forms list for one Pokemon from its names and all of its type2 values
+    
+    A Pokemon's forms share one resource, so its type2 values are not tied to
+    names; each form gets the type2 resolved by get_correct_type2_for_form
+    from all of them (the same rule as the in-memory store).
+    
+    Returns:
+        List of dicts with keys: name, type2, is_base (base forms first)
+    """
+    type2s = set(type2s)
+    forms = [
+        {"name": name, "type2": get_correct_type2_for_form(name, type2s), "is_base": is_base_form(name)}
+        for name in dict.fromkeys(names)
+    ]
+    
+    # Sort: base forms first, then alphabetically
+    forms.sort(key=lambda x: (not x["is_base"], x["name"]))
+    return forms
+
+
+def forms_from_bindings(bindings: List[dict]) -> list:
+    """Build the sorted forms list for one Pokemon from ?name/?type2 bindings
+    
+    Args:
+        bindings: SPARQL bindings for a single Pokemon
+        
+    Returns:
+        List of dicts with keys: name, type2, is_base (base forms first)
     """
+    return resolve_forms(
+        (binding.get("name", {}).get("value", "") for binding in bindings),
+        (extract_value_from_uri(binding["type2"]["value"]) for binding in bindings if "type2" in binding)
+    )
+
+
+async def get_pokemon_rows_bulk(pokemon_ids: List[int]) -> Dict[int, List[dict]]:
+    """Fetch name/type bindings for many Pokemon in a single query
     
-    data = execute_sparql_query(query)
+    Args:
+        pokemon_ids: National dex numbers to fetch
+        
+    Returns:
+        Dict mapping each found ID to its bindings (keys: id, name, type1, type2),
+        ordered by name
+    """
+    if not pokemon_ids:
+        return {}
     
-    # Build evolution graph
-    evolution_map = {}
-    reverse_map = {}
+    data = await run_query("pokemon_rows", id=pokemon_ids)
+    rows = {}
     
     for binding in data["results"]["bindings"]:
-        from_id = int(binding["fromId"]["value"])
-        to_id = int(binding["toId"]["value"])
+        pokemon_id = int(binding["id"]["value"])
+        rows.setdefault(pokemon_id, []).append(binding)
+    
+    return rows
+
+
+async def load_store_from_sparql() -> PokedexStore:
+    """(Re)load the global columnar store from the triples in GraphDB
+    
+    With the SPARQL backend the type-effectiveness engines (recommender, team
+    builder, similarity, export) still run on a PokedexStore; building it
+    from the same data the routes query keeps them consistent and removes
+    the need to deploy the Turtle files next to the API.
+    """
+    started = time.perf_counter()
+    data = await run_query("dataset_triples")
+    triples = [
+        (
+            row["s"]["value"],
+            row["p"]["value"],
+            Literal(row["o"]["value"], row["o"].get("datatype", ""))
+            if row["o"]["type"] in ("literal", "typed-literal") else row["o"]["value"],
+        )
+        for row in data["results"]["bindings"]
+    ]
+    # Building the columns is CPU-bound; keep the event loop responsive
+    store = set_store(await asyncio.to_thread(PokedexStore.from_triples, triples))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info("Loaded in-memory Pokedex store: %d Pokemon from %s in %.1f ms", len(store), GRAPHDB_ENDPOINT, elapsed_ms)
+    return store
+
+
+async def get_pokemon_details_bulk(pokemon_ids: List[int]) -> Dict[int, List[dict]]:
+    """Fetch stats, types and abilities for many Pokemon in a single query
+    
+    Args:
+        pokemon_ids: National dex numbers to fetch
         
-        if from_id not in evolution_map:
-            evolution_map[from_id] = []
-        evolution_map[from_id].append(to_id)
-        reverse_map[to_id] = from_id
+    Returns:
+        Dict mapping each found ID to the detail bindings of its alphabetically
+        first form (one per type2 value), the same row shape as the
+        single-Pokemon detail query
+    """
+    if not pokemon_ids:
+        return {}
     
-    # Find the base of the chain
-    current = pokemon_id
-    while current in reverse_map:
-        current = reverse_map[current]
-    base_pokemon = current
+    data = await run_query("pokemon_details", id=pokemon_ids)
+    details: Dict[int, List[dict]] = {}
     
-    # Build chain from base forward
-    chain = [base_pokemon]
-    current = base_pokemon
+    for binding in data["results"]["bindings"]:
+        rows = details.setdefault(int(binding["id"]["value"]), [])
+        if not rows or rows[0]["name"]["value"] == binding["name"]["value"]:
+            rows.append(binding)
     
-    while current in evolution_map:
-        # Take first evolution (handles branching by picking first path)
-        next_evolution = evolution_map[current][0]
-        chain.append(next_evolution)
-        current = next_evolution
+    return details
+
+
+async def get_pokemon_details_by_name(pokemon_name: str) -> List[dict]:
+    """Detail bindings (one per type2 value) for the forms with an exact name
+    
+    Args:
+        pokemon_name: Formatted form name, e.g. "Mega Charizard X"
+        
+    Returns:
+        Detail bindings ordered by ID (empty if no form has that name)
+    """
+    data = await run_query("pokemon_details", name=[pokemon_name])
+    return data["results"]["bindings"]
+
+
+async def get_pokemon_forms_bulk_from_sparql(pokemon_ids: Optional[List[int]] = None) -> Dict[int, list]:
+    """Get the forms of many Pokemon (or of every Pokemon) in a single query
+    
+    Args:
+        pokemon_ids: National dex numbers to fetch, or None for all
+        
+    Returns:
+        Dict mapping each found ID to its forms (see forms_from_bindings)
+    """
+    if pokemon_ids is not None and not pokemon_ids:
+        return {}
+    
+    data = await run_query("pokemon_forms", id=pokemon_ids)
+    rows = {}
+    
+    for binding in data["results"]["bindings"]:
+        rows.setdefault(int(binding["id"]["value"]), []).append(binding)
+    
+    return {pokemon_id: forms_from_bindings(bindings) for pokemon_id, bindings in rows.items()}
+
+
+async def get_evolution_links_from_sparql() -> List[Tuple[int, int]]:
+    """Get every evolution link in the database in a single query
+    
+    Returns:
+        List of (from_id, to_id) national dex number pairs
+    """
+    data = await run_query("evolution_links")
+    
+    return [
+        (int(binding["fromId"]["value"]), int(binding["toId"]["value"]))
+        for binding in data["results"]["bindings"]
+    ]
+
+
+async def get_search_list_from_sparql(limit: int) -> List[SearchEntry]:
+    """All distinct forms with their display types and image URLs
+
+    Args:
+        limit: Maximum number of (name x type2) rows fetched from GraphDB
+
+    Returns:
+        List of SearchEntry records, ordered by ID then form (base form first)
+    """
+    data = await run_query("pokemon_rows", limit=limit)
+    
+    # One pass: type1 and type2 values per (id, name), names per ID in first-seen order
+    type1s: Dict[Tuple[int, str], Optional[str]] = {}
+    type2s: Dict[Tuple[int, str], set] = {}
+    names_by_id: Dict[int, List[str]] = {}
+    
+    for binding in data["results"]["bindings"]:
+        pokemon_id = int(binding.get("id", {}).get("value", 0))
+        pokemon_name = binding.get("name", {}).get("value", "Unknown")
+        key = (pokemon_id, pokemon_name)
+        
+        if key not in type1s:
+            type1s[key] = None
+            type2s[key] = set()
+            names_by_id.setdefault(pokemon_id, []).append(pokemon_name)
+        
+        if "type1" in binding and not type1s[key]:
+            type1s[key] = extract_value_from_uri(binding["type1"]["value"])
+        if "type2" in binding:
+            type2s[key].add(extract_value_from_uri(binding["type2"]["value"]))
+    
+    results = []
+    for pokemon_id in sorted(names_by_id):
+        # Base form first, then alphabetically; the position picks the image
+        form_order = sorted(names_by_id[pokemon_id], key=lambda name: (not is_base_form(name), name))
+        base_url = f"{POKEMON_COM_IMAGE_BASE_URL}/{pokemon_id:03d}"
+        
+        for form_index, pokemon_name in enumerate(form_order):
+            key = (pokemon_id, pokemon_name)
+            types = [type1s[key]] if type1s[key] else []
+            
+            correct_type2 = get_correct_type2_for_form(pokemon_name, type2s[key])
+            if correct_type2:
+                types.append(correct_type2)
+            
+            image_url = f"{base_url}.png" if form_index == 0 else f"{base_url}_f{form_index + 1}.png"
+            results.append(SearchEntry(pokemon_id, pokemon_name, types, image_url))
+    
+    return results
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def _read_slow_log(path: str) -> Dict[str, QueryProfile]:
+    """Aggregate a slow-query log and its rotated backups into per-template profiles"""
+    profiles: Dict[str, QueryProfile] = {}
+    paths = [path] + [f"{path}.{i}" for i in range(1, SPARQL_SLOW_QUERY_LOG_BACKUPS + 1)]
+    for log_path in paths:
+        if not os.path.exists(log_path):
+            continue
+        with open(log_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                profile = profiles.setdefault(entry["template"], QueryProfile())
+                profile.add(entry["ms"], entry["bytes"], entry["rows"], entry["results"], slow=True)
+    return profiles
+
+
+def _print_ranking(title: str, profiles: Dict[str, QueryProfile], key, top: int):
+    print(title)
+    print(f"  {'template':<20} {'calls':>6} {'total ms':>10} {'mean ms':>9} {'max ms':>9} "
+          f"{'rows':>8} {'rows/result':>11} {'KiB/call':>9} {'slow':>5} {'errors':>6}")
+    for name, profile in sorted(profiles.items(), key=lambda item: key(item[1]), reverse=True)[:top]:
+        stats = profile.to_dict()
+        print(f"  {name:<20} {stats['calls']:>6} {stats['totalMs']:>10.1f} {stats['meanMs']:>9.1f} "
+              f"{stats['maxMs']:>9.1f} {stats['rows']:>8} {stats['rowsPerResult']:>11.2f} "
+              f"{stats['bytes'] / max(stats['calls'], 1) / 1024:>9.1f} {stats['slow']:>5} {stats['errors']:>6}")
+
+
+def main():
+    """CLI: python -m services.sparql_service report [--url URL | --log PATH] / explain NAME [param=value ...]"""
+    parser = argparse.ArgumentParser(description="SPARQL query profiler tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    report = subparsers.add_parser("report", help="Rank query templates by total time and row amplification")
+    report.add_argument("--url", help="Running API to read the live profile from (e.g. http://localhost:5000)")
+    report.add_argument("--log", default=SPARQL_SLOW_QUERY_LOG,
+                        help="Slow-query log to aggregate when --url is not given (default: %(default)s)")
+    report.add_argument("--token", default=ADMIN_TOKEN,
+                        help="X-Admin-Token for --url (default: the ADMIN_TOKEN setting)")
+    report.add_argument("--top", type=int, default=20)
+    
+    explain = subparsers.add_parser("explain", help="Print the store's explain plan for a query template")
+    explain.add_argument("name", choices=sorted(_queries))
+    explain.add_argument("params", nargs="*", metavar="param=value",
+                         help="Template parameters; lists are comma-separated (e.g. id=1,4,25)")
+    
+    args = parser.parse_args()
+    
+    if args.command == "explain":
+        try:
+            params = template_params(args.name, dict(param.split("=", 1) for param in args.params))
+        except ValueError as e:
+            parser.error(f"Invalid parameters: {e}")
+        
+        async def run():
+            try:
+                return await explain_query(args.name, **params)
+            finally:
+                await close_http_client()
+        
+        try:
+            print(asyncio.run(run()))
+        except HTTPException as e:
+            raise SystemExit(e.detail)
+        return
+    
+    if args.url:
+        response = httpx.get(f"{args.url.rstrip('/')}/api/admin/sparql-profile",
+                             headers={"X-Admin-Token": args.token}, timeout=10)
+        response.raise_for_status()
+        profiles = {name: QueryProfile.from_dict(data) for name, data in response.json().items()}
+        source = f"live profile from {args.url}"
+    else:
+        profiles = _read_slow_log(args.log)
+        source = f"slow-query log {args.log} (queries over {SPARQL_SLOW_QUERY_MS:g} ms only)"
     
-    return chain
+    if not profiles:
+        print(f"No queries recorded in {source}")
+        return
+    print(f"Source: {source}\n")
+    _print_ranking("By total time", profiles, lambda p: p.total_ms, args.top)
+    print()
+    _print_ranking("By rows per result (row amplification)", profiles,
+                   lambda p: p.rows / p.results if p.results else 0.0, args.top)
 
 
-def clear_forms_cache():
-    """Clear the Pokemon forms cache (useful for testing or data updates)"""
-    _pokemon_forms_cache.clear()
+if __name__ == "__main__":
+    main()
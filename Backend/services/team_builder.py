@@ -0,0 +1,282 @@
+"""Team coverage builder: greedy plus local search over 18-bit type masks"""
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from config import TEAM_BUILDER_BUDGET_MS
+from domain.type_chart import CHART, TYPE_NAMES
+from services.dataset import register_reload_hook
+from services.memory_store import AGAINST_TYPES, NO_TYPE, PokedexStore, against_column, get_store
+
+
+logger = logging.getLogger(__name__)
+
+
+TEAM_SIZE = 6
+ALL_TYPES = (1 << len(AGAINST_TYPES)) - 1
+
+# Objective weights: offensive hits, resisted threat types, threat types the
+# team is weak to with nobody resisting, and such weaknesses shared by 2+ members
+HIT_WEIGHT = 3.0
+RESIST_WEIGHT = 2.0
+UNCOVERED_WEIGHT = 2.0
+STACKED_WEIGHT = 1.0
+# Prefer stronger Pokemon among equally covering candidates
+BASE_TOTAL_WEIGHT = 1e-4
+
+
+def type_mask_names(mask: int) -> List[str]:
+    """Display type names (e.g. "Fighting") for the bits set in a mask"""
+    return [name for bit, name in enumerate(TYPE_NAMES) if mask >> bit & 1]
+
+
+class TeamBuilder:
+    """Per-Pokemon type masks over AGAINST_TYPES, computed once from the store
+
+    - weak: attack types dealing more than 1x (the ex:weakTo set)
+    - resist: attack types dealing less than 1x, immunities included (ex:resistantTo)
+    - stab: the Pokemon's own types (base form), i.e. the attacks it hits hardest with
+
+    Searches only touch these arrays, so building a team never queries GraphDB.
+    """
+
+    def __init__(self, store: PokedexStore):
+        n = len(store)
+        bits = np.uint32(1) << np.arange(len(AGAINST_TYPES), dtype=np.uint32)
+        against = np.frombuffer(store.against, dtype=np.float32).reshape(n, len(AGAINST_TYPES))
+        known = ~np.isnan(against)
+
+        self.ids = np.frombuffer(store.ids, dtype=np.uint16).astype(np.int64)
+        self.names = [store.form_names[store.form_offsets[row]] for row in range(n)]
+        self.generation = np.frombuffer(store.generation, dtype=np.uint8).astype(np.int64)
+        self.base_total = sum(
+            np.frombuffer(column, dtype=np.uint16).astype(np.int64) for column in store.stats.values()
+        )
+        self.weak = np.bitwise_or.reduce(np.where(known & (against > 1), bits, 0), axis=1).astype(np.uint32)
+        self.resist = np.bitwise_or.reduce(np.where(known & (against < 1), bits, 0), axis=1).astype(np.uint32)
+
+        columns = [against_column(name) for name in store.type_names]
+        self.stab = np.zeros(n, dtype=np.uint32)
+        for row in range(n):
+            for code in (store.type1[row], store.form_type2[store.form_offsets[row]]):
+                if code != NO_TYPE and columns[code] is not None:
+                    self.stab[row] |= np.uint32(1 << columns[code])
+
+        # Weakness mask of each single type, straight from the chart; used as
+        # the offensive targets when there is no opposing team
+        self.type_weak = np.bitwise_or.reduce(np.where(CHART.T > 1, bits, 0), axis=1).astype(np.uint32)
+
+        self._rows = {int(pokemon_id): row for row, pokemon_id in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def row_of(self, pokemon_id: int) -> Optional[int]:
+        return self._rows.get(pokemon_id)
+
+    def _hits(self, target_weak: np.ndarray) -> np.ndarray:
+        """Bitmask per Pokemon of the targets its STAB types hit super-effectively"""
+        hits = np.zeros(len(self.ids), dtype=np.uint32)
+        for bit, weak in enumerate(target_weak):
+            hits |= np.where(self.stab & weak, np.uint32(1 << bit), np.uint32(0))
+        return hits
+
+    def build(
+        self,
+        team: Iterable[int] = (),
+        opponents: Iterable[int] = (),
+        generations: Iterable[int] = (),
+        max_base_total: Optional[int] = None,
+        exclude: Iterable[int] = (),
+        size: int = TEAM_SIZE,
+        budget_ms: float = TEAM_BUILDER_BUDGET_MS
+    ) -> Dict[str, any]:
+        """Complete a team for the best type coverage
+
+        With opponents, the team should hit every opponent super-effectively
+        and resist the opponents' types; without, it should hit every single
+        type and resist as many attack types as possible. Empty slots are
+        filled greedily, then single-member swaps are applied until no swap
+        improves the score or the latency budget runs out. Slots still empty
+        when the budget runs out are filled by base stat total alone.
+
+        Args:
+            team: IDs already on the team (kept as-is)
+            opponents: Opposing team IDs (at most 32)
+            generations: Only pick candidates from these generations
+            max_base_total: Only pick candidates with at most this base stat total
+            exclude: IDs never to pick
+            size: Final team size
+            budget_ms: Time budget for the whole search
+
+        Returns:
+            Dict with keys: team (member dicts), score, coverage, searchMs and
+            converged (False if the budget ran out before a local optimum)
+
+        Raises:
+            ValueError: If an ID is unknown or too many IDs are given
+        """
+        started = time.perf_counter()
+        deadline = started + budget_ms / 1000
+
+        team_rows = self._rows_for(team)
+        opponent_rows = self._rows_for(opponents)
+        if len(team_rows) > size:
+            raise ValueError(f"team already has more than {size} members")
+        if len(opponent_rows) > 32:
+            raise ValueError("at most 32 opponents are supported")
+
+        if opponent_rows:
+            threat = int(np.bitwise_or.reduce(self.stab[opponent_rows]))
+            hits = self._hits(self.weak[opponent_rows])
+            targets = len(opponent_rows)
+        else:
+            threat = ALL_TYPES
+            hits = self._hits(self.type_weak)
+            targets = len(AGAINST_TYPES)
+
+        allowed = np.ones(len(self.ids), dtype=bool)
+        if generations:
+            allowed &= np.isin(self.generation, list(generations))
+        if max_base_total is not None:
+            allowed &= self.base_total <= max_base_total
+        allowed[self._rows_for(exclude, strict=False)] = False
+        allowed[team_rows] = False
+
+        bonus = self.base_total * BASE_TOTAL_WEIGHT
+
+        def state(rows: List[int]):
+            hit = resist = weak1 = weak2 = 0
+            for row in rows:
+                hit |= int(hits[row])
+                resist |= int(self.resist[row])
+                weak2 |= weak1 & int(self.weak[row])
+                weak1 |= int(self.weak[row])
+            return hit, resist, weak1, weak2
+
+        def scores(rows: List[int]) -> np.ndarray:
+            """Team score after adding each candidate to rows (vectorized over all Pokemon)"""
+            hit, resist, weak1, weak2 = state(rows)
+            new_resist = self.resist | np.uint32(resist)
+            exposed = ~new_resist & np.uint32(threat)
+            new_weak1 = self.weak | np.uint32(weak1)
+            new_weak2 = (self.weak & np.uint32(weak1)) | np.uint32(weak2)
+            return (
+                HIT_WEIGHT * np.bitwise_count(hits | np.uint32(hit))
+                + RESIST_WEIGHT * np.bitwise_count(new_resist & np.uint32(threat))
+                - UNCOVERED_WEIGHT * np.bitwise_count(new_weak1 & exposed)
+                - STACKED_WEIGHT * np.bitwise_count(new_weak2 & exposed)
+                + bonus
+            )
+
+        def best_addition(rows: List[int]) -> Optional[int]:
+            candidates = allowed.copy()
+            candidates[rows] = False
+            if not candidates.any():
+                return None
+            # argmax keeps the lowest dex number among ties
+            return int(np.argmax(np.where(candidates, scores(rows), -np.inf)))
+
+        members = list(team_rows)
+        converged = True
+        while len(members) < size:
+            if time.perf_counter() >= deadline:
+                converged = False
+                candidates = allowed.copy()
+                candidates[members] = False
+                strongest = np.argsort(-self.base_total, kind="stable")
+                members += [int(row) for row in strongest[candidates[strongest]][:size - len(members)]]
+                break
+            row = best_addition(members)
+            if row is None:
+                break
+            members.append(row)
+
+        current = self._score(state(members), threat) + float(bonus[members].sum())
+        improved = converged
+        while improved:
+            improved = False
+            for slot in range(len(team_rows), len(members)):
+                if time.perf_counter() >= deadline:
+                    converged = False
+                    break
+                rest = members[:slot] + members[slot + 1:]
+                row = best_addition(rest)
+                if row is None or row == members[slot]:
+                    continue
+                candidate = self._score(state(rest + [row]), threat) + float(bonus[rest + [row]].sum())
+                if candidate > current + 1e-9:
+                    members[slot] = row
+                    current = candidate
+                    improved = True
+            if not converged:
+                break
+
+        hit, resist, weak1, weak2 = state(members)
+        return {
+            "team": [self._member(row, fixed=i < len(team_rows)) for i, row in enumerate(members)],
+            "score": round(current, 4),
+            "coverage": {
+                "targetsHit": bin(hit).count("1"),
+                "targets": targets,
+                "resisted": type_mask_names(resist & threat),
+                "uncoveredWeaknesses": type_mask_names(weak1 & ~resist & threat),
+            },
+            "searchMs": round((time.perf_counter() - started) * 1000, 3),
+            "converged": converged,
+        }
+
+    @staticmethod
+    def _score(team_state, threat: int) -> float:
+        hit, resist, weak1, weak2 = team_state
+        exposed = ~resist & threat
+        return (
+            HIT_WEIGHT * bin(hit).count("1")
+            + RESIST_WEIGHT * bin(resist & threat).count("1")
+            - UNCOVERED_WEIGHT * bin(weak1 & exposed).count("1")
+            - STACKED_WEIGHT * bin(weak2 & exposed).count("1")
+        )
+
+    def _rows_for(self, pokemon_ids: Iterable[int], strict: bool = True) -> List[int]:
+        rows = []
+        for pokemon_id in dict.fromkeys(pokemon_ids):
+            row = self._rows.get(pokemon_id)
+            if row is None:
+                if strict:
+                    raise ValueError(f"Pokemon with ID {pokemon_id} not found")
+                continue
+            rows.append(row)
+        return rows
+
+    def _member(self, row: int, fixed: bool) -> dict:
+        return {
+            "id": int(self.ids[row]),
+            "name": self.names[row],
+            "types": type_mask_names(int(self.stab[row])),
+            "baseTotal": int(self.base_total[row]),
+            "weakTo": type_mask_names(int(self.weak[row])),
+            "resistantTo": type_mask_names(int(self.resist[row])),
+            "fixed": fixed,
+        }
+
+
+_builder: Optional[TeamBuilder] = None
+
+
+@register_reload_hook
+async def rebuild_team_builder() -> TeamBuilder:
+    """(Re)build the global team builder from the loaded Pokedex store"""
+    global _builder
+    store = get_store()
+    _builder = TeamBuilder(store)
+    logger.info("Built team builder masks for %d Pokemon", len(_builder))
+    return _builder
+
+
+async def get_team_builder() -> TeamBuilder:
+    """Return the global team builder, building it on first use"""
+    if _builder is None:
+        return await rebuild_team_builder()
+    return _builder
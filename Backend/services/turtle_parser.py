@@ -0,0 +1,156 @@
+"""Minimal streaming Turtle reader for the Pokedex data files"""
+import re
+from typing import Dict, Iterator, NamedTuple, Tuple, Union
+
+
+RDF_TYPE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+
+
+class Literal(NamedTuple):
+    """An RDF literal with its lexical form and (optional) datatype IRI"""
+    lexical: str
+    datatype: str = ""
+
+
+Term = Union[str, Literal]
+Triple = Tuple[str, str, Term]
+
+
+# The data files are written by rdflib's Turtle serializer, so only the subset
+# it emits is supported: @prefix, IRIs, prefixed names, typed/plain literals
+# and ';' / ',' lists.
+_TOKEN_RE = re.compile(r"""
+      (?P<ws>\s+|\#[^\n]*)
+    | (?P<prefix>@prefix|PREFIX)
+    | (?P<iri><[^>]*>)
+    | (?P<literal>"(?:[^"\\]|\\.)*")(?:\^\^(?P<dtype><[^>]*>|[A-Za-z][\w\-]*:[\w\-]*)|@(?P<lang>[A-Za-z\-]+))?
+    | (?P<number>[+\-]?\d+(?:\.\d+)?(?![\w:]))
+    | (?P<pname>(?:[A-Za-z][\w\-]*)?:(?:[\w\-]|\.(?=[\w\-]))*)
+    | (?P<a>a(?=[\s<]))
+    | (?P<punct>[;,.])
+""", re.VERBOSE)
+
+_ESCAPES = {"t": "\t", "n": "\n", "r": "\r", '"': '"', "'": "'", "\\": "\\"}
+_XSD = "http://www.w3.org/2001/XMLSchema#"
+
+
+def _unescape(raw: str) -> str:
+    if "\\" not in raw:
+        return raw
+    return re.sub(r"\\(.)", lambda m: _ESCAPES.get(m.group(1), m.group(1)), raw)
+
+
+def _tokenize(text: str) -> Iterator[Tuple[str, object]]:
+    pos = 0
+    length = len(text)
+    while pos < length:
+        match = _TOKEN_RE.match(text, pos)
+        if not match:
+            snippet = text[pos:pos + 40].split("\n")[0]
+            raise ValueError(f"Unexpected Turtle input at offset {pos}: {snippet!r}")
+        pos = match.end()
+        kind = match.lastgroup
+        if kind == "ws":
+            continue
+        if kind in ("literal", "dtype", "lang"):
+            yield "literal", (match.group("literal")[1:-1], match.group("dtype"))
+        else:
+            yield kind, match.group(kind)
+
+
+def iter_triples(text: str) -> Iterator[Triple]:
+    """Parse Turtle text into (subject, predicate, object) triples
+
+    Args:
+        text: Turtle document contents
+
+    Returns:
+        Iterator of triples; IRIs are expanded to full strings and literals
+        are returned as `Literal` tuples
+    """
+    prefixes: Dict[str, str] = {}
+
+    def expand(kind: str, value) -> Term:
+        if kind == "iri":
+            return value[1:-1]
+        if kind == "pname":
+            prefix, _, local = value.partition(":")
+            if prefix not in prefixes:
+                raise ValueError(f"Undeclared prefix '{prefix}:'")
+            return prefixes[prefix] + local
+        if kind == "a":
+            return RDF_TYPE
+        if kind == "number":
+            return Literal(value, _XSD + ("decimal" if "." in value else "integer"))
+        if kind == "literal":
+            lexical, dtype = value
+            if dtype is None:
+                datatype = ""
+            elif dtype.startswith("<"):
+                datatype = dtype[1:-1]
+            else:
+                datatype = expand("pname", dtype)
+            return Literal(_unescape(lexical), datatype)
+        raise ValueError(f"Unexpected token {value!r}")
+
+    tokens = _tokenize(text)
+    for kind, value in tokens:
+        if kind == "prefix":
+            _, name = next(tokens)
+            _, iri = next(tokens)
+            prefixes[name.rstrip(":")] = iri[1:-1]
+            if value == "@prefix":
+                next(tokens)  # trailing '.'
+            continue
+
+        subject = expand(kind, value)
+        predicate = None
+        for kind, value in tokens:
+            if kind == "punct":
+                if value == ".":
+                    break
+                if value == ";":
+                    predicate = None
+                continue
+            term = expand(kind, value)
+            if predicate is None:
+                predicate = term
+            else:
+                yield subject, predicate, term
+
+
+def read_triples(path: str) -> Iterator[Triple]:
+    """Read and parse a Turtle file
+
+    Args:
+        path: Path to a .ttl file
+
+    Returns:
+        Iterator of triples, see `iter_triples`
+    """
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    return iter_triples(text)
+
+
+_NT_ESCAPES = {"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r", "\t": "\\t"}
+_NT_ESCAPE_RE = re.compile(r'[\\"\n\r\t]')
+
+
+def format_term(term: Term) -> str:
+    """N-Triples form of a term: <iri> or "lexical"^^<datatype>"""
+    if isinstance(term, Literal):
+        lexical = _NT_ESCAPE_RE.sub(lambda m: _NT_ESCAPES[m.group(0)], term.lexical)
+        if term.datatype:
+            return f'"{lexical}"^^<{term.datatype}>'
+        return f'"{lexical}"'
+    return f"<{term}>"
+
+
+def format_triple(triple: Triple) -> str:
+    """One N-Triples statement (without the trailing newline)
+
+    N-Triples is also valid inside SPARQL INSERT DATA / DELETE DATA blocks.
+    """
+    subject, predicate, obj = triple
+    return f"{format_term(subject)} {format_term(predicate)} {format_term(obj)} ."
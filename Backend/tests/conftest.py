@@ -0,0 +1,5 @@
+"""Shared test setup: modules are imported the way the app imports them (from Backend/)"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
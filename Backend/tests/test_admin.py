@@ -0,0 +1,102 @@
+"""Admin token on the mutating admin endpoints"""
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from services.dataset import dataset_version
+
+
+@pytest.fixture
+def client(monkeypatch):
+    reloads = []
+
+    async def reload_dataset():
+        reloads.append(True)
+
+    monkeypatch.setattr(main, "reload_dataset", reload_dataset)
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "s3cret")
+    client = TestClient(main.app)
+    client.reloads = reloads
+    return client
+
+
+@pytest.mark.parametrize("headers", [{}, {"X-Admin-Token": "wrong"}, {"X-Admin-Token": ""}])
+def test_reload_rejects_missing_or_wrong_token(client, headers):
+    response = client.post("/api/admin/reload", headers=headers)
+
+    assert response.status_code == 403
+    assert client.reloads == []
+
+
+def test_reload_with_token(client):
+    response = client.post("/api/admin/reload", headers={"X-Admin-Token": "s3cret"})
+
+    assert response.status_code == 200
+    assert client.reloads == [True]
+
+
+def test_reload_disabled_without_configured_token(client, monkeypatch):
+    monkeypatch.setattr(main, "ADMIN_TOKEN", "")
+
+    assert client.post("/api/admin/reload", headers={"X-Admin-Token": ""}).status_code == 403
+    assert client.reloads == []
+
+
+
+def test_cache_invalidate_requires_token(client):
+    version = dataset_version()
+
+    assert client.post("/api/admin/cache/invalidate").status_code == 403
+    assert dataset_version() == version
+
+    response = client.post("/api/admin/cache/invalidate", headers={"X-Admin-Token": "s3cret"})
+
+    assert response.status_code == 200
+    assert response.json()["datasetVersion"] == dataset_version() != version
+
+
+def test_sparql_profile_reset_requires_token(client, monkeypatch):
+    resets = []
+    monkeypatch.setattr(main.profiler, "reset", lambda: resets.append(True))
+
+    assert client.get("/api/admin/sparql-profile").status_code == 403
+    assert client.post("/api/admin/sparql-profile/reset").status_code == 403
+    assert resets == []
+
+    response = client.post("/api/admin/sparql-profile/reset", headers={"X-Admin-Token": "s3cret"})
+
+    assert response.status_code == 200
+    assert resets == [True]
+
+
+def test_sparql_explain_requires_token(client, monkeypatch):
+    explained = []
+
+    async def explain_query(name, **params):
+        explained.append(name)
+        return "<plan/>"
+
+    monkeypatch.setattr(main, "explain_query", explain_query)
+
+    assert client.get("/api/admin/sparql-explain/pokemon_count").status_code == 403
+    assert explained == []
+
+    response = client.get("/api/admin/sparql-explain/pokemon_count", headers={"X-Admin-Token": "s3cret"})
+
+    assert response.status_code == 200
+    assert explained == ["pokemon_count"]
+
+
+@pytest.mark.parametrize("path", ["/api/admin/cache", "/api/admin/forms-index", "/api/admin/sparql-cache"])
+def test_admin_stats_require_token(client, path):
+    assert client.get(path).status_code == 403
+    assert client.get(path, headers={"X-Admin-Token": "wrong"}).status_code == 403
+    assert client.get(path, headers={"X-Admin-Token": "s3cret"}).status_code == 200
+
+
+def test_every_admin_route_requires_token():
+    admin_routes = [route for route in main.app.routes if getattr(route, "path", "").startswith("/api/admin")]
+
+    assert admin_routes
+    for route in admin_routes:
+        assert main.require_admin_token in [d.call for d in route.dependant.dependencies], route.path
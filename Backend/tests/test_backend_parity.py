@@ -0,0 +1,119 @@
+"""The in-memory store and the SPARQL row builders return the same records
+
+SPARQL rows are generated from the Turtle files the way the registered
+queries produce them: one row per combination of a resource's multi-valued
+properties (names, type2s, stats), in no particular order within a name.
+"""
+import itertools
+import os
+import random
+from collections import defaultdict
+
+import pytest
+
+import main
+from config import TTL_DATA_DIR, TTL_DATA_FILES
+from services.memory_store import EX, PokedexStore
+from services.turtle_parser import Literal, read_triples
+from utils import extract_value_from_uri
+
+# Charizard, Butterfree, Pinsir, Mewtwo, Wormadam, Rotom, Darmanitan, Meloetta
+POKEMON_IDS = [6, 12, 127, 150, 413, 479, 555, 648]
+
+STAT_PREDICATES = {
+    "hp": "hp", "attack": "attack", "defense": "defense",
+    "spAttack": "sp_attack", "spDefense": "sp_defense", "speed": "speed",
+}
+
+
+@pytest.fixture(scope="module")
+def store():
+    return PokedexStore.from_turtle()
+
+
+@pytest.fixture(scope="module")
+def resources():
+    """Pokemon id -> predicate -> values, plus "abilities" -> names"""
+    props = defaultdict(lambda: defaultdict(list))
+    holders = defaultdict(list)
+    ability_names = {}
+    for file_name in TTL_DATA_FILES:
+        for s, p, o in read_triples(os.path.join(TTL_DATA_DIR, file_name)):
+            if p == EX + "possessedBy":
+                holders[s].append(o)
+            elif p == EX + "abilityName":
+                ability_names[s] = o.lexical
+            elif p.startswith(EX):
+                props[s][p[len(EX):]].append(o.lexical if isinstance(o, Literal) else o)
+    for ability, pokemon in holders.items():
+        for uri in pokemon:
+            props[uri]["abilities"].append(ability_names[ability])
+    return {int(p["number"][0]): p for p in props.values() if "number" in p}
+
+
+def rows(resource, pokemon_id, stats=False):
+    """Rows of the detail query (stats=True) or the card/type queries, shuffled per name"""
+    columns = {"type1": resource.get("type1", []), "type2": resource.get("type2", [])}
+    if stats:
+        columns.update({var: resource.get(predicate, []) for var, predicate in STAT_PREDICATES.items()})
+    result = []
+    for name in sorted(set(resource["name"])):
+        values = [[(var, v) for v in sorted(set(vs))] or [(var, None)] for var, vs in columns.items()]
+        combinations = list(itertools.product(*values))
+        random.Random(name).shuffle(combinations)
+        for combination in combinations:
+            binding = {"id": {"value": str(pokemon_id)}, "name": {"value": name}}
+            binding.update({var: {"value": v} for var, v in combination if v is not None})
+            if stats and resource.get("abilities"):
+                abilities = list(dict.fromkeys(resource["abilities"]))
+                random.Random(name).shuffle(abilities)
+                binding["abilities"] = {"value": ",".join(abilities)}
+            result.append(binding)
+    return result
+
+
+def as_json(records):
+    return [record.to_dict() for record in records]
+
+
+@pytest.mark.parametrize("pokemon_id", POKEMON_IDS)
+def test_forms_detail(store, resources, pokemon_id):
+    forms = store.forms(store.row_of(pokemon_id))
+    sparql = main.forms_from_detail_bindings(pokemon_id, rows(resources[pokemon_id], pokemon_id, True), forms)
+
+    assert as_json(sparql) == as_json(store.forms_detail(pokemon_id))
+
+
+@pytest.mark.parametrize("pokemon_id", POKEMON_IDS)
+def test_card(store, resources, pokemon_id):
+    forms = store.forms(store.row_of(pokemon_id))
+    sparql = main.record_from_bindings(rows(resources[pokemon_id], pokemon_id))
+    sparql.image_url = main.get_pokemon_image_url(pokemon_id, sparql.name, forms)
+
+    assert sparql.to_dict() == store.card(pokemon_id).to_dict()
+
+
+@pytest.mark.parametrize("pokemon_id", POKEMON_IDS)
+def test_named_form(store, resources, pokemon_id):
+    bindings = rows(resources[pokemon_id], pokemon_id, True)
+    for name in sorted({b["name"]["value"] for b in bindings}):
+        form_bindings = [b for b in bindings if b["name"]["value"] == name]
+
+        assert (main.record_from_bindings(form_bindings, include_stats=True).to_dict()
+                == store.named_form(pokemon_id, name).to_dict())
+
+
+@pytest.mark.parametrize("type_name", ["Fighting", "Psychic", "Flying", "Dragon"])
+def test_by_type(store, resources, type_name):
+    bindings = []
+    all_forms = {}
+    for pokemon_id in sorted(resources):
+        resource = resources[pokemon_id]
+        types = resource.get("type1", []) + resource.get("type2", [])
+        if type_name in [extract_value_from_uri(t) for t in types]:
+            bindings.extend(rows(resource, pokemon_id))
+            all_forms[pokemon_id] = store.forms(store.row_of(pokemon_id))
+    sparql = main.records_by_type(bindings, type_name, all_forms)
+
+    assert as_json(sparql) == as_json(store.by_type(type_name))
+    assert ("Mewtwo" in [record.name for record in sparql]) == (type_name == "Psychic")
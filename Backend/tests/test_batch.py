@@ -0,0 +1,97 @@
+"""POST /api/pokemon/batch: request order, duplicates, misses and levels"""
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from services.evolution_index import EvolutionIndex
+from services.memory_store import PokedexStore
+
+SPECIES = {"height": 2.0, "weight": 122.0, "category": "Genetic"}
+
+
+@pytest.fixture(scope="module")
+def store():
+    return PokedexStore.from_turtle()
+
+
+@pytest.fixture
+def client(monkeypatch, store):
+    evolution = EvolutionIndex(store.evolution_links())
+    species_requests = []
+
+    async def fetch_species_bulk(pokemon_ids):
+        species_requests.append(pokemon_ids)
+        return {pokemon_id: SPECIES for pokemon_id in pokemon_ids}
+
+    async def get_evolution_chain(pokemon_id):
+        return evolution.chain(pokemon_id)
+
+    monkeypatch.setattr(main, "memory_store", lambda: store)
+    monkeypatch.setattr(main, "fetch_pokeapi_species_data_bulk", fetch_species_bulk)
+    monkeypatch.setattr(main, "get_evolution_chain", get_evolution_chain)
+    client = TestClient(main.app)
+    client.species_requests = species_requests
+    return client
+
+
+def batch(client, ids, level=None):
+    body = {"ids": ids} if level is None else {"ids": ids, "level": level}
+    response = client.post("/api/pokemon/batch", json=body)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_cards_follow_request_order_with_duplicates_and_misses(client, store):
+    result = batch(client, [150, 9999, 1, 150])
+
+    assert result["level"] == "card"
+    assert [(r["id"], r["status"]) for r in result["results"]] == [(150, 200), (9999, 404), (1, 200), (150, 200)]
+    assert result["results"][0]["data"] == store.card(150).to_dict()
+    assert result["results"][3]["data"] == result["results"][0]["data"]
+    assert result["results"][1]["error"] == "Pokemon with ID 9999 not found"
+
+
+def test_details_are_enriched_once_per_pokemon(client):
+    result = batch(client, [134, 133, 134], "detail")
+
+    eevee = result["results"][1]["data"]
+    assert (eevee["name"], eevee["category"], eevee["evolutionChain"]) == ("Eevee", "Genetic", [133, 134])
+    assert result["results"][0]["data"]["evolutionChain"] == [133, 134]
+    assert client.species_requests == [[134, 133]]
+
+
+def test_forms_level(client):
+    result = batch(client, [150], "forms")
+
+    forms = result["results"][0]["data"]
+    assert [(form["name"], form["types"]) for form in forms] == [
+        ("Mewtwo", ["Psychic"]),
+        ("MewtwoMega Mewtwo X", ["Psychic", "Fighting"]),
+        ("MewtwoMega Mewtwo Y", ["Psychic"]),
+    ]
+    assert forms[0]["category"] == "Genetic"
+    assert all(form["evolutionChain"] == [150] for form in forms)
+
+
+@pytest.mark.parametrize("body", [
+    {"ids": []},
+    {"ids": list(range(1, main.BATCH_MAX_IDS + 2))},
+    {"ids": [1], "level": "everything"},
+])
+def test_invalid_requests_are_rejected(client, body):
+    assert client.post("/api/pokemon/batch", json=body).status_code == 422
+
+
+def test_sparql_backend_uses_one_query_for_all_ids(client, monkeypatch, store):
+    requested = []
+
+    async def get_pokemon_rows_bulk(pokemon_ids):
+        requested.append(pokemon_ids)
+        return {}
+
+    monkeypatch.setattr(main, "memory_store", lambda: None)
+    monkeypatch.setattr(main, "get_pokemon_rows_bulk", get_pokemon_rows_bulk)
+    result = batch(client, [4, 5, 4])
+
+    assert requested == [[4, 5]]
+    assert [r["status"] for r in result["results"]] == [404, 404, 404]
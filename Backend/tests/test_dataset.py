@@ -0,0 +1,75 @@
+"""Dataset reload: the SPARQL backend builds the columnar store from GraphDB"""
+import asyncio
+
+import pytest
+
+from services import dataset, memory_store, sparql_service
+
+EX = "http://example.org/"
+XSD_INT = "http://www.w3.org/2001/XMLSchema#int"
+
+
+def uri(value):
+    return {"type": "uri", "value": value}
+
+
+def literal(value, datatype=""):
+    term = {"type": "literal", "value": value}
+    if datatype:
+        term["datatype"] = datatype
+    return term
+
+
+def row(s, p, o):
+    return {"s": uri(s), "p": uri(p), "o": o}
+
+
+TRIPLES = [
+    row(f"{EX}pokemon/1", "http://www.w3.org/1999/02/22-rdf-syntax-ns#type", uri(f"{EX}Pokemon")),
+    row(f"{EX}pokemon/1", f"{EX}number", literal("1", XSD_INT)),
+    row(f"{EX}pokemon/1", f"{EX}name", literal("Bulbasaur")),
+    row(f"{EX}pokemon/1", f"{EX}type1", uri(f"{EX}types/Grass")),
+    row(f"{EX}pokemon/1", f"{EX}type2", uri(f"{EX}types/Poison")),
+    row(f"{EX}pokemon/1", f"{EX}hp", literal("45", XSD_INT)),
+    row(f"{EX}pokemon/1", f"{EX}evolvesTo", uri(f"{EX}pokemon/2")),
+    row(f"{EX}pokemon/2", "http://www.w3.org/1999/02/22-rdf-syntax-ns#type", uri(f"{EX}Pokemon")),
+    row(f"{EX}pokemon/2", f"{EX}number", literal("2", XSD_INT)),
+    row(f"{EX}pokemon/2", f"{EX}name", literal("Ivysaur")),
+    row(f"{EX}pokemon/2", f"{EX}type1", uri(f"{EX}types/Grass")),
+    row(f"{EX}ability/overgrow", "http://www.w3.org/1999/02/22-rdf-syntax-ns#type", uri(f"{EX}Ability")),
+    row(f"{EX}ability/overgrow", f"{EX}abilityName", literal("overgrow")),
+    row(f"{EX}ability/overgrow", f"{EX}possessedBy", uri(f"{EX}pokemon/1")),
+]
+
+
+@pytest.fixture
+def sparql_backend(monkeypatch):
+    queries = []
+
+    async def run_query(name, **params):
+        queries.append(name)
+        return {"results": {"bindings": TRIPLES}}
+
+    monkeypatch.setattr(dataset, "DATA_BACKEND", "sparql")
+    monkeypatch.setattr(dataset, "_reload_hooks", [])
+    monkeypatch.setattr(memory_store, "DATA_BACKEND", "sparql")
+    monkeypatch.setattr(memory_store, "_store", None)
+    monkeypatch.setattr(sparql_service, "run_query", run_query)
+    monkeypatch.setattr(dataset, "load_store", lambda: pytest.fail("Turtle files loaded"))
+    return queries
+
+
+def test_sparql_reload_builds_store_without_turtle_files(sparql_backend):
+    asyncio.run(dataset.reload_dataset())
+
+    store = memory_store.get_store()
+    assert sparql_backend == ["dataset_triples"]
+    assert list(store.ids) == [1, 2]
+    assert store.card(1).types == ["Grass", "Poison"]
+    assert store.abilities(0) == ["Overgrow"]
+    assert store.evolution_links() == [(1, 2)]
+
+
+def test_sparql_store_is_not_loaded_from_turtle(sparql_backend):
+    with pytest.raises(RuntimeError):
+        memory_store.get_store()
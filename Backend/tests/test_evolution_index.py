@@ -0,0 +1,46 @@
+"""Evolution index: families, chains and branching trees"""
+import pytest
+
+from services.evolution_index import EvolutionIndex
+from services.memory_store import PokedexStore
+
+EEVEELUTIONS = [134, 135, 136, 196, 197, 470, 471, 700]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return EvolutionIndex(PokedexStore.from_turtle().evolution_links())
+
+
+def test_eevee_tree_branches_into_every_eeveelution(index):
+    tree = index.tree(133)
+
+    assert tree["familyId"] == 133
+    assert tree["members"] == [133] + EEVEELUTIONS
+    assert tree["stages"] == {"133": 0, **{str(i): 1 for i in EEVEELUTIONS}}
+    assert tree["roots"] == [{"id": 133, "evolvesTo": [{"id": i, "evolvesTo": []} for i in EEVEELUTIONS]}]
+
+
+@pytest.mark.parametrize("pokemon_id", EEVEELUTIONS)
+def test_branch_is_part_of_its_own_chain(index, pokemon_id):
+    assert index.chain(pokemon_id) == [133, pokemon_id]
+    assert index.tree(pokemon_id) == index.tree(133)
+
+
+def test_linear_chain(index):
+    assert index.chain(2) == [1, 2, 3]
+    assert index.family(3) == [1, 2, 3]
+    assert index.stage_of[3] == 2
+
+
+def test_pokemon_without_evolutions(index):
+    assert index.family_id(132) == 132
+    assert index.chain(132) == [132]
+    assert index.tree(132)["roots"] == [{"id": 132, "evolvesTo": []}]
+
+
+def test_duplicate_links_are_ignored():
+    index = EvolutionIndex([(1, 2), (1, 2), (2, 3)])
+
+    assert index.children == {1: [2], 2: [3]}
+    assert index.family(1) == [1, 2, 3]
@@ -0,0 +1,102 @@
+"""NDJSON export: one record per form, projections, gzip and chunking"""
+import asyncio
+import zlib
+
+import orjson
+import pytest
+
+from services import export, memory_store
+from services.evolution_index import EvolutionIndex
+from services.export import ndjson_stream, parse_fields
+from services.memory_store import PokedexStore
+
+TYPES = "http://example.org/types/"
+
+
+@pytest.fixture(scope="module")
+def store():
+    return PokedexStore.from_turtle()
+
+
+@pytest.fixture(scope="module")
+def evolution(store):
+    return EvolutionIndex(store.evolution_links())
+
+
+@pytest.fixture
+def memory_backend(monkeypatch, store):
+    monkeypatch.setattr(export, "DATA_BACKEND", "memory")
+    monkeypatch.setattr(memory_store, "_store", store)
+
+
+def collect(stream) -> bytes:
+    async def run():
+        return [chunk async for chunk in stream]
+    return b"".join(asyncio.run(run()))
+
+
+def lines(body: bytes) -> list:
+    assert body.endswith(b"\n")
+    return [orjson.loads(line) for line in body.splitlines()]
+
+
+def test_one_line_per_form(memory_backend, store, evolution):
+    records = lines(collect(ndjson_stream(evolution)))
+
+    assert len(records) == sum(len(store.forms(row)) for row in range(len(store.ids)))
+    assert [r["id"] for r in records] == sorted(r["id"] for r in records)
+    mewtwo = [r for r in records if r["id"] == 150]
+    assert [(r["name"], r["formIndex"], r["isBaseForm"], r["types"]) for r in mewtwo] == [
+        ("Mewtwo", 0, True, ["Psychic"]),
+        ("MewtwoMega Mewtwo X", 1, False, ["Psychic", "Fighting"]),
+        ("MewtwoMega Mewtwo Y", 2, False, ["Psychic"]),
+    ]
+    eevee = next(r for r in records if r["id"] == 133)
+    assert eevee["familyId"] == 133 and eevee["evolutionFamily"][:2] == [133, 134]
+    assert eevee["against"]["fight"] == 2.0 and eevee["against"]["ghost"] == 0.0
+
+
+def test_fields_projection(memory_backend, evolution):
+    records = lines(collect(ndjson_stream(evolution, parse_fields("name, id,name"))))
+
+    assert records[0] == {"name": "Bulbasaur", "id": 1}
+
+
+def test_unknown_fields_are_rejected():
+    assert parse_fields("") is None
+    with pytest.raises(ValueError, match="weight"):
+        parse_fields("id,weight")
+
+
+def test_gzip_and_chunking(memory_backend, evolution):
+    plain = collect(ndjson_stream(evolution))
+
+    async def run():
+        return [chunk async for chunk in ndjson_stream(evolution, gzip=True, chunk_bytes=4096)]
+    chunks = asyncio.run(run())
+
+    assert len(chunks) > 1
+    assert zlib.decompress(b"".join(chunks), 31) == plain
+
+
+def test_sparql_rows_match_the_memory_store(monkeypatch, memory_backend, store, evolution):
+    row = store.row_of(150)
+    sparql_row = {
+        "id": "150",
+        "gen": str(store.generation[row]),
+        "t1": TYPES + "Psychic",
+        "names": "|".join(form["name"] for form in store.forms(row)),
+        "type2s": "|".join(TYPES + t for t in store.type2_names(row)),
+        "abilities": "|".join(store.abilities(row)),
+        **{f"stat_{key}": str(value) for key, value in store.stats_of(row).items()},
+    }
+
+    async def stream_query(name):
+        assert name == "pokemon_export"
+        yield sparql_row
+
+    memory = [r for r in lines(collect(ndjson_stream(evolution))) if r["id"] == 150]
+    monkeypatch.setattr(export, "DATA_BACKEND", "sparql")
+    monkeypatch.setattr(export, "stream_query", stream_query)
+
+    assert lines(collect(ndjson_stream(evolution))) == memory
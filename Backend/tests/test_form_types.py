@@ -0,0 +1,94 @@
+"""Per-form type2 resolution in the in-memory store and the SPARQL row builders
+
+A Pokemon's forms share one resource, so a base form must not pick up the
+type2 of an alternate form (Mewtwo is Psychic, only Mega Mewtwo X is
+Psychic/Fighting).
+"""
+import pytest
+
+import main
+from services.memory_store import PokedexStore
+from services.sparql_service import resolve_forms
+
+EX = "http://example.org/pokemon/"
+
+EXPECTED = {
+    6: {
+        "Charizard": ["Fire", "Flying"],
+        "CharizardMega Charizard X": ["Fire", "Dragon"],
+        "CharizardMega Charizard Y": ["Fire", "Flying"],
+    },
+    150: {
+        "Mewtwo": ["Psychic"],
+        "MewtwoMega Mewtwo X": ["Psychic", "Fighting"],
+        "MewtwoMega Mewtwo Y": ["Psychic"],
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def store():
+    return PokedexStore.from_turtle()
+
+
+def detail_bindings(pokemon_id):
+    """Rows of the detail query: one per form name and type2 of the shared resource"""
+    forms = EXPECTED[pokemon_id]
+    type1 = next(iter(forms.values()))[0]
+    type2s = sorted({types[1] for types in forms.values() if len(types) > 1})
+    return [
+        {
+            "id": {"value": str(pokemon_id)},
+            "name": {"value": name},
+            "type1": {"value": f"{EX}{type1}"},
+            "type2": {"value": f"{EX}{type2}"},
+        }
+        for name in sorted(forms)
+        for type2 in type2s
+    ]
+
+
+@pytest.mark.parametrize("pokemon_id", sorted(EXPECTED))
+def test_memory_store_forms(store, pokemon_id):
+    records = store.forms_detail(pokemon_id)
+
+    assert {record.name: record.types for record in records} == EXPECTED[pokemon_id]
+    for form in store.forms(store.row_of(pokemon_id)):
+        assert form["type2"] == (EXPECTED[pokemon_id][form["name"]] + [None])[1]
+
+
+@pytest.mark.parametrize("pokemon_id", sorted(EXPECTED))
+def test_memory_store_card(store, pokemon_id):
+    card = store.card(pokemon_id)
+
+    assert card.types == EXPECTED[pokemon_id][card.name]
+
+
+@pytest.mark.parametrize("pokemon_id", sorted(EXPECTED))
+def test_sparql_forms_detail(pokemon_id):
+    bindings = detail_bindings(pokemon_id)
+    records = main.forms_from_detail_bindings(pokemon_id, bindings, [])
+
+    assert {record.name: record.types for record in records} == EXPECTED[pokemon_id]
+
+
+@pytest.mark.parametrize("pokemon_id", sorted(EXPECTED))
+def test_sparql_card(pokemon_id):
+    bindings = detail_bindings(pokemon_id)
+    first = [binding for binding in bindings if binding["name"] == bindings[0]["name"]]
+    card = main.record_from_bindings(first)
+
+    assert card.types == EXPECTED[pokemon_id][card.name]
+
+
+@pytest.mark.parametrize("pokemon_id", sorted(EXPECTED))
+def test_sparql_forms_index(pokemon_id):
+    bindings = detail_bindings(pokemon_id)
+    forms = resolve_forms(
+        (binding["name"]["value"] for binding in bindings),
+        (binding["type2"]["value"].rsplit("/", 1)[-1] for binding in bindings),
+    )
+
+    assert {form["name"]: form["type2"] for form in forms} == {
+        name: (types + [None])[1] for name, types in EXPECTED[pokemon_id].items()
+    }
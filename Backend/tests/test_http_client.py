@@ -0,0 +1,73 @@
+"""Lifecycle of the shared upstream HTTP client"""
+import asyncio
+import threading
+
+import pytest
+
+from services import http_client
+
+
+@pytest.fixture(autouse=True)
+def reset_client(monkeypatch):
+    monkeypatch.setattr(http_client, "_client", None)
+    monkeypatch.setattr(http_client, "_client_loop", None)
+
+
+async def current_client():
+    return http_client.get_http_client()
+
+
+def test_client_is_reused_on_the_same_loop():
+    async def run():
+        first = await http_client.open_http_client()
+        second = http_client.get_http_client()
+        await http_client.close_http_client()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first is second
+    assert first.is_closed
+    assert http_client._client is None
+
+
+def test_loop_change_closes_the_client_of_a_running_loop():
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        old = asyncio.run_coroutine_threadsafe(current_client(), other_loop).result(5)
+
+        async def run():
+            client = http_client.get_http_client()
+            # The old client is closed on its own loop
+            for _ in range(100):
+                if old.is_closed:
+                    break
+                await asyncio.sleep(0.01)
+            await http_client.close_http_client()
+            return client
+
+        new = asyncio.run(run())
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join(5)
+        other_loop.close()
+
+    assert new is not old
+    assert old.is_closed
+
+
+def test_client_of_an_ended_loop_is_dropped_with_a_warning(caplog):
+    old = asyncio.run(current_client())
+
+    async def run():
+        client = http_client.get_http_client()
+        await http_client.close_http_client()
+        return client
+
+    with caplog.at_level("WARNING", logger=http_client.__name__):
+        new = asyncio.run(run())
+
+    assert new is not old
+    assert "event loop has ended" in caplog.text
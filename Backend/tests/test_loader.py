@@ -0,0 +1,132 @@
+"""ingest.loader against the in-memory SPARQL stand-in"""
+import asyncio
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from ingest.loader import Loader
+from ingest.sparql_standin import StandinHandler, TripleStore
+
+
+PREFIXES = "@prefix ex: <http://example.org/ontology/> .\n@prefix pokemon: <http://example.org/pokemon/> .\n"
+
+
+def write_turtle(path, count: int, start: int = 0) -> str:
+    lines = [f'pokemon:p{i} ex:name "Pokemon {i}" ; ex:hp {i} .' for i in range(start, start + count)]
+    path.write_text(PREFIXES + "\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+class ScriptedStore(TripleStore):
+    """TripleStore that can silently drop statements, to provoke verification mismatches"""
+
+    def __init__(self):
+        super().__init__()
+        self.dropped = set()
+        self.updates = 0
+
+    def update(self, update: str) -> int:
+        self.updates += 1
+        changed = super().update(update)
+        with self.lock:
+            self.statements -= self.dropped
+        return changed
+
+
+class ScriptedHandler(StandinHandler):
+    """Answers the first `failures` requests with 503"""
+
+    quiet = True
+    failures = 0
+
+    def _handle(self, params: dict):
+        with self.store.lock:
+            fail = type(self).failures > 0
+            type(self).failures -= fail
+        if fail:
+            self._send(503, b"scripted failure")
+            return
+        super()._handle(params)
+
+
+@pytest.fixture
+def standin():
+    handler = type("Standin", (ScriptedHandler,), {"store": ScriptedStore()})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    handler.endpoint = "http://127.0.0.1:%d/sparql" % server.server_address[1]
+    yield handler
+    server.shutdown()
+    server.server_close()
+
+
+def load_files(standin, paths, batch_size: int, **options):
+    options = {"concurrency": 2, "max_retries": 3, "backoff_base": 0.01, **options}
+
+    async def run():
+        async with Loader(standin.endpoint, **options) as loader:
+            return [await loader.load_file(path, batch_size) for path in paths]
+
+    return asyncio.run(run())
+
+
+def test_batches_and_verifies_each_file(standin, tmp_path):
+    first = write_turtle(tmp_path / "first.ttl", 7)
+    second = write_turtle(tmp_path / "second.ttl", 2, start=100)
+
+    reports = load_files(standin, [first, second], batch_size=5)
+
+    # Two triples per subject
+    assert [(r.triples, r.batches, r.verified, r.ok) for r in reports] == [(14, 3, 14, True), (4, 1, 4, True)]
+    assert standin.store.updates == 4
+    assert len(standin.store.statements) == 18
+    assert ('<http://example.org/pokemon/p3> <http://example.org/ontology/hp> '
+            '"3"^^<http://www.w3.org/2001/XMLSchema#integer> .') in standin.store.statements
+
+
+def test_retries_503(standin, tmp_path):
+    path = write_turtle(tmp_path / "data.ttl", 5)
+    standin.failures = 3
+
+    report, = load_files(standin, [path], batch_size=4)
+
+    assert (report.triples, report.failed_batches, report.verified, report.ok) == (10, 0, 10, True)
+    assert standin.failures == 0
+
+
+def test_batch_failing_after_retries_is_reported(standin, tmp_path):
+    path = write_turtle(tmp_path / "data.ttl", 2)
+    standin.failures = 2
+
+    report, = load_files(standin, [path], batch_size=10, concurrency=1, max_retries=1)
+
+    assert (report.batches, report.failed_batches, report.verified, report.ok) == (1, 1, 0, False)
+
+
+def test_verification_reports_missing_triples(standin, tmp_path):
+    path = write_turtle(tmp_path / "data.ttl", 4)
+    standin.store.dropped.add('<http://example.org/pokemon/p2> <http://example.org/ontology/name> "Pokemon 2" .')
+
+    report, = load_files(standin, [path], batch_size=3)
+
+    assert (report.triples, report.failed_batches, report.verified, report.ok) == (8, 0, 7, False)
+
+
+def test_failing_handler_does_not_hang(standin, tmp_path):
+    # Far more batches than the bounded queue holds
+    path = write_turtle(tmp_path / "data.ttl", 50)
+    handled = []
+
+    async def handle(batch):
+        handled.append(batch)
+        raise RuntimeError("handler bug")
+
+    async def run():
+        async with Loader(standin.endpoint, concurrency=2) as loader:
+            await asyncio.wait_for(loader._run(path, 1, handle), timeout=10)
+
+    with pytest.raises(RuntimeError, match="handler bug"):
+        asyncio.run(run())
+    assert len(handled) <= 2
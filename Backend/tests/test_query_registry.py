@@ -0,0 +1,116 @@
+"""Prepared query registry: parameter binding, escaping, caching and in-flight sharing"""
+import asyncio
+
+import pytest
+
+from services import sparql_service
+from services.dataset import bump_dataset_version
+from services.sparql_service import QueryTemplate, format_values_clause, register_query, run_query, template_params
+
+TEXT = "SELECT ?id WHERE { $ids $names $types ?s ex:number ?id } OFFSET $offset $limit"
+PARAMS = {"ids": "ints", "names": "strings", "types": "types", "offset": "int", "limit": "limit"}
+
+
+@pytest.fixture
+def template():
+    return QueryTemplate("test", TEXT, PARAMS)
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    """Isolated registry whose (slow) SPARQL calls are recorded"""
+    calls = []
+
+    async def execute_sparql_query(query, label=None):
+        calls.append((label, query))
+        await asyncio.sleep(0.01)
+        return {"results": {"bindings": [{"query": len(calls)}]}}
+
+    monkeypatch.setattr(sparql_service, "_queries", {})
+    monkeypatch.setattr(sparql_service, "_inflight", {})
+    monkeypatch.setattr(sparql_service, "execute_sparql_query", execute_sparql_query)
+    register_query("test", TEXT, PARAMS)
+    register_query("uncached", TEXT, PARAMS, ttl=0)
+    return calls
+
+
+def test_values_clauses():
+    assert format_values_clause("id", [1, "2"]) == 'VALUES ?id { "1"^^xsd:int "2"^^xsd:int }'
+    assert format_values_clause("t", ["Fire"], "types") == "VALUES ?t { type:Fire }"
+    with pytest.raises(ValueError):
+        format_values_clause("id", [1], "floats")
+
+
+def test_string_values_are_escaped():
+    clause = format_values_clause("name", ['Say "hi"\\', "two\nlines"], "strings")
+
+    assert clause == r'VALUES ?name { "Say \"hi\"\\"^^xsd:string "two\nlines"^^xsd:string }'
+
+
+def test_normalize_canonicalizes_the_cache_key(template):
+    key = template.normalize({"ids": [3, "1", 3], "names": "Mew", "offset": "5", "limit": -1})
+
+    assert key == (("ids", (1, 3)), ("limit", 0), ("names", ("Mew",)), ("offset", 5), ("types", None))
+    assert key == template.normalize({"ids": ["3", 1], "names": ["Mew"], "offset": 5, "limit": 0})
+
+
+def test_render_omits_missing_optional_parameters(template):
+    query = template.render(template.normalize({"offset": 0, "ids": 7}))
+
+    assert query == 'SELECT ?id WHERE { VALUES ?ids { "7"^^xsd:int }   ?s ex:number ?id } OFFSET 0 '
+
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"offset": 0, "unknown": 1},
+    {"offset": "zero"},
+    {"offset": 0, "ids": ["1; DROP"]},
+    {"offset": 0, "types": ["Fire } ?s ?p ?o {"]},
+])
+def test_invalid_parameters_are_rejected(template, params):
+    with pytest.raises(ValueError):
+        template.normalize(params)
+
+
+def test_placeholders_must_match_parameters():
+    with pytest.raises(ValueError):
+        QueryTemplate("bad", "SELECT * WHERE { $ids }", {"ids": "ints", "limit": "limit"})
+    with pytest.raises(ValueError):
+        QueryTemplate("bad", "SELECT * WHERE { $ids }", {"ids": "floats"})
+
+
+def test_template_params_from_strings(queries):
+    assert template_params("test", {"ids": "1, 2,", "offset": "3", "limit": "10"}) == {
+        "ids": ["1", "2"], "offset": 3, "limit": 10,
+    }
+
+
+def test_concurrent_identical_queries_share_one_request(queries):
+    async def run():
+        return await asyncio.gather(*(run_query("test", offset=0, ids=[1, 2]) for _ in range(5)),
+                                    run_query("test", offset=0, ids=[2, 1]))
+
+    results = asyncio.run(run())
+
+    assert len(queries) == 1
+    assert all(result is results[0] for result in results)
+    stats = sparql_service.query_cache_stats()["test"]
+    assert (stats["misses"], stats["shared"], stats["entries"]) == (1, 5, 1)
+
+
+def test_results_are_cached_per_dataset_version(queries):
+    first = asyncio.run(run_query("test", offset=0))
+
+    assert asyncio.run(run_query("test", offset=0)) is first
+    assert asyncio.run(run_query("test", offset=1)) is not first
+    bump_dataset_version()
+    assert asyncio.run(run_query("test", offset=0)) is not first
+    assert len(queries) == 3
+
+
+def test_zero_ttl_is_never_cached(queries):
+    asyncio.run(run_query("uncached", offset=0))
+    asyncio.run(run_query("uncached", offset=0))
+
+    assert len(queries) == 2
+    assert sparql_service.query_cache_stats()["uncached"]["entries"] == 0
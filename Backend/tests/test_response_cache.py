@@ -0,0 +1,132 @@
+"""Response cache: ETags, conditional GETs and dataset-version invalidation"""
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from services.dataset import bump_dataset_version
+from services.response_cache import CachedResponse, ResponseCache, ResponseCacheMiddleware, mark_uncacheable
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    calls = []
+
+    @app.get("/api/items")
+    async def items(page: int = 1):
+        calls.append(page)
+        return {"page": page}
+
+    @app.get("/api/placeholder")
+    async def placeholder():
+        mark_uncacheable()
+        return {"pending": True}
+
+    @app.get("/api/text")
+    async def text():
+        calls.append("text")
+        return PlainTextResponse("plain")
+
+    @app.get("/api/admin/stats")
+    async def admin_stats():
+        calls.append("admin")
+        return {"ok": True}
+
+    cache = ResponseCache()
+    app.add_middleware(ResponseCacheMiddleware, cache=cache)
+    client = TestClient(app)
+    client.calls = calls
+    client.cache = cache
+    return client
+
+
+def test_second_request_is_served_from_cache(client):
+    first = client.get("/api/items")
+    second = client.get("/api/items")
+
+    assert first.headers["x-cache"] == "MISS"
+    assert second.headers["x-cache"] == "HIT"
+    assert second.json() == first.json()
+    assert second.headers["etag"] == first.headers["etag"]
+    assert first.headers["cache-control"].startswith("public, max-age=")
+    assert client.calls == [1]
+
+
+def test_query_parameter_order_shares_an_entry(client):
+    client.get("/api/items?page=2&x=1")
+    response = client.get("/api/items?x=1&page=2")
+
+    assert response.headers["x-cache"] == "HIT"
+    assert client.get("/api/items?page=3").headers["x-cache"] == "MISS"
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_matching_etag_is_answered_with_304(client, cached):
+    etag = client.get("/api/items").headers["etag"]
+    if not cached:
+        client.cache.clear()
+
+    response = client.get("/api/items", headers={"If-None-Match": f'"other", {etag}'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert client.cache.stats()["notModified"] == 1
+
+
+def test_stale_etag_gets_the_full_response(client):
+    response = client.get("/api/items", headers={"If-None-Match": '"v0-stale"'})
+
+    assert response.status_code == 200
+    assert response.json()["page"] == 1
+
+
+def test_version_bump_invalidates_entries_and_etags(client):
+    etag = client.get("/api/items").headers["etag"]
+
+    bump_dataset_version()
+    response = client.get("/api/items", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["x-cache"] == "MISS"
+    assert response.headers["etag"] != etag
+    assert client.calls == [1, 1]
+    assert client.cache.stats()["entries"] == 1
+
+
+def test_uncacheable_responses_are_not_stored(client):
+    for _ in range(2):
+        response = client.get("/api/placeholder")
+
+        assert response.headers["cache-control"] == "no-store"
+        assert "etag" not in response.headers
+    assert client.cache.stats()["entries"] == 0
+
+
+@pytest.mark.parametrize("path", ["/api/text", "/api/admin/stats"])
+def test_non_json_and_admin_responses_pass_through(client, path):
+    client.get(path)
+    response = client.get(path)
+
+    assert "x-cache" not in response.headers
+    assert len(client.calls) == 2
+
+
+def entry(body):
+    return CachedResponse(200, [], body, b'"etag"')
+
+
+def test_lru_is_bounded_by_body_size():
+    cache = ResponseCache(max_bytes=10, max_entry_bytes=8)
+    cache.put(("a",), entry(b"12345"))
+    cache.put(("b",), entry(b"12345"))
+    cache.put(("c",), entry(b"123456789"))
+    cache.put(("d",), entry(b"1234"))
+
+    assert cache.get(("a",)) is None
+    assert cache.get(("c",)) is None
+    assert cache.get(("b",)) is not None and cache.get(("d",)) is not None
+    assert cache.stats()["bytes"] == 9
+    assert cache.evictions == 1
+
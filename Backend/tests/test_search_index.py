@@ -0,0 +1,79 @@
+"""Typeahead ranking: exact, prefix, word prefix, substring, then fuzzy"""
+import pytest
+
+from domain.records import SearchEntry
+from services.memory_store import PokedexStore
+from services.search_index import SearchIndex, normalize
+
+
+@pytest.fixture(scope="module")
+def index():
+    return SearchIndex(PokedexStore.from_turtle().search_list(100000))
+
+
+def ranked(index, query, limit=10):
+    return [(result["name"], result["match"]) for result in index.search(query, limit)]
+
+
+def test_normalize():
+    assert normalize("Flabébé") == "flabebe"
+    assert normalize("  Mr. Mime ") == "mr mime"
+
+
+def test_exact_match_comes_first(index):
+    assert ranked(index, "Pikachu", 2) == [("Pikachu", "exact"), ("Pichu", "fuzzy")]
+    assert ranked(index, "flabebe", 1) == [("Flabébé", "exact")]
+    assert ranked(index, "mr. mime", 1) == [("Mr. Mime", "exact")]
+
+
+def test_prefix_matches_in_dex_order(index):
+    assert ranked(index, "char", 5) == [
+        ("Charmander", "prefix"),
+        ("Charmeleon", "prefix"),
+        ("Charizard", "prefix"),
+        ("CharizardMega Charizard X", "prefix"),
+        ("CharizardMega Charizard Y", "prefix"),
+    ]
+
+
+def test_name_prefixes_rank_above_word_prefixes_and_substrings(index):
+    assert [name for name, _ in ranked(index, "x", 5)] == [
+        "Xatu", "Xerneas", "CharizardMega Charizard X", "MewtwoMega Mewtwo X", "Vulpix",
+    ]
+    assert ranked(index, "x", 5)[-1] == ("Vulpix", "substring")
+
+
+def test_form_label_is_searchable(index):
+    assert ranked(index, "mega charizard", 2) == [
+        ("CharizardMega Charizard X", "prefix"),
+        ("CharizardMega Charizard Y", "prefix"),
+    ]
+
+
+@pytest.mark.parametrize("query, expected", [("bulbsaur", "Bulbasaur"), ("charzard", "Charizard")])
+def test_typos_match_fuzzily(index, query, expected):
+    assert ranked(index, query, 1) == [(expected, "fuzzy")]
+
+
+def test_short_queries_are_not_fuzzy():
+    index = SearchIndex([SearchEntry(1, "Abra", ["Psychic"], "")])
+
+    assert index.search("ab") == [{**index.entries[0].to_dict(), "match": "prefix"}]
+    assert index.search("zz") == []
+
+
+def test_base_form_ranks_before_other_forms():
+    index = SearchIndex([
+        SearchEntry(2, "Rotom", ["Electric", "Ghost"], ""),
+        SearchEntry(2, "RotomHeat Rotom", ["Electric", "Fire"], ""),
+        SearchEntry(1, "Rotomish", ["Normal"], ""),
+    ])
+
+    assert [result["name"] for result in index.search("rot")] == ["Rotomish", "Rotom", "RotomHeat Rotom"]
+    assert [result["name"] for result in index.search("heat")] == ["RotomHeat Rotom"]
+
+
+def test_limit(index):
+    assert len(index.search("a", 3)) == 3
+    assert index.search("a", 0) == []
+    assert index.search("  ") == []
@@ -0,0 +1,115 @@
+"""Binary store snapshot: round trip, and rejection of stale or damaged files"""
+import os
+import shutil
+import struct
+from array import array
+
+import pytest
+
+from config import TTL_DATA_DIR, TTL_DATA_FILES
+from services import memory_store
+from services.memory_store import PokedexStore, load_store
+from services.snapshot import FORMAT_VERSION, MAGIC, SnapshotError, read_snapshot, source_digest, write_snapshot
+
+DIGEST = b"\x01" * 32
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = str(tmp_path / "test.snapshot")
+    write_snapshot(
+        path, DIGEST,
+        {"ids": array("H", [1, 2, 150]), "weights": array("f", [0.5, 1.0, 2.0]), "empty": array("b")},
+        {"names": ["Bulbasaur", "Ivysaur", "Mewtwo"], "again": ["Mewtwo", "Flabébé"]},
+    )
+    return path
+
+
+def test_round_trip(snapshot_path):
+    snapshot = read_snapshot(snapshot_path, DIGEST)
+
+    assert snapshot.source_digest == DIGEST
+    assert list(snapshot.columns["ids"]) == [1, 2, 150]
+    assert list(snapshot.columns["weights"]) == [0.5, 1.0, 2.0]
+    assert len(snapshot.columns["empty"]) == 0
+    assert snapshot.strings == {"names": ["Bulbasaur", "Ivysaur", "Mewtwo"], "again": ["Mewtwo", "Flabébé"]}
+
+
+def test_stale_digest_is_rejected(snapshot_path):
+    with pytest.raises(SnapshotError, match="different source files"):
+        read_snapshot(snapshot_path, b"\x02" * 32)
+    assert read_snapshot(snapshot_path).source_digest == DIGEST
+
+
+def test_other_format_version_is_rejected(snapshot_path):
+    with open(snapshot_path, "r+b") as f:
+        f.seek(len(MAGIC))
+        f.write(struct.pack("<I", FORMAT_VERSION - 1))
+
+    with pytest.raises(SnapshotError, match="format version"):
+        read_snapshot(snapshot_path, DIGEST)
+
+
+def test_corrupt_payload_is_rejected(snapshot_path):
+    with open(snapshot_path, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+
+    with pytest.raises(SnapshotError, match="checksum"):
+        read_snapshot(snapshot_path, DIGEST)
+
+
+@pytest.mark.parametrize("content", [None, b"", b"PKDX", b"NOTASNAP" + b"\0" * 64])
+def test_missing_or_foreign_files_are_rejected(tmp_path, content):
+    path = str(tmp_path / "other.snapshot")
+    if content is not None:
+        with open(path, "wb") as f:
+            f.write(content)
+
+    with pytest.raises(SnapshotError):
+        read_snapshot(path)
+
+
+def test_unsupported_typecode_is_refused(tmp_path):
+    with pytest.raises(ValueError):
+        write_snapshot(str(tmp_path / "bad.snapshot"), DIGEST, {"ids": array("d", [1.0])}, {})
+
+
+def test_store_round_trip(tmp_path):
+    store = PokedexStore.from_turtle()
+    path = str(tmp_path / "pokedex.snapshot")
+    store.save_snapshot(path, DIGEST)
+    mapped = PokedexStore.from_snapshot(read_snapshot(path, DIGEST))
+
+    assert len(mapped) == len(store)
+    assert mapped.evolution_links() == store.evolution_links()
+    for pokemon_id in (1, 6, 133, 150, 479):
+        card = store.card(pokemon_id, include_stats=True)
+        assert mapped.card(pokemon_id, include_stats=True).to_dict() == card.to_dict()
+        assert ([r.to_dict() for r in mapped.forms_detail(pokemon_id)]
+                == [r.to_dict() for r in store.forms_detail(pokemon_id)])
+
+
+def test_load_store_rebuilds_a_stale_snapshot(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for name in TTL_DATA_FILES:
+        shutil.copy(os.path.join(TTL_DATA_DIR, name), data_dir)
+    digest = lambda: source_digest(os.path.join(data_dir, name) for name in TTL_DATA_FILES)
+    path = str(tmp_path / "pokedex.snapshot")
+    monkeypatch.setattr(memory_store, "_store", None)
+
+    load_store(str(data_dir), path)
+    original = digest()
+    assert read_snapshot(path, original).source_digest == original
+
+    with open(data_dir / TTL_DATA_FILES[0], "a") as f:
+        f.write("\n# edited\n")
+    with pytest.raises(SnapshotError):
+        read_snapshot(path, digest())
+    store = load_store(str(data_dir), path)
+
+    assert read_snapshot(path, digest()).source_digest == digest() != original
+    assert store.card(150).name == "Mewtwo"
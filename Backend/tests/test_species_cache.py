@@ -0,0 +1,141 @@
+"""SpeciesCache against the benchmark PokeAPI stand-in"""
+import asyncio
+import json
+import threading
+
+import pytest
+
+from benchmarks.standin import FixtureStore, Standin
+from services.http_client import close_http_client
+from services.pokeapi_service import DEFAULT_SPECIES_DATA, SpeciesCache
+from services.response_cache import _uncacheable
+
+
+# Nothing listens here, so any network access fails fast
+UNREACHABLE_URL = "http://127.0.0.1:9/api/v2"
+
+BULBASAUR = {"height": 7, "weight": 69, "category": "Seed Pokémon"}
+
+
+def _write_fixture(root, resource: str, body: dict):
+    path = root / "pokeapi" / f"{resource}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(body), encoding="utf-8")
+
+
+@pytest.fixture
+def standin(tmp_path):
+    root = tmp_path / "fixtures"
+    for pokemon_id, name, height, weight, genus in [(1, "bulbasaur", 7, 69, "Seed Pokémon"),
+                                                     (4, "charmander", 6, 85, "Lizard Pokémon")]:
+        _write_fixture(root, f"pokemon/{pokemon_id}", {"id": pokemon_id, "name": name,
+                                                       "height": height, "weight": weight})
+        _write_fixture(root, f"pokemon-species/{pokemon_id}", {
+            "id": pokemon_id,
+            "genera": [{"genus": f"{genus}-ja", "language": {"name": "ja"}},
+                       {"genus": genus, "language": {"name": "en"}}],
+        })
+    with Standin(FixtureStore(str(root))) as running:
+        yield running
+
+
+def run(coroutine):
+    """Run a coroutine on a fresh loop, closing the shared HTTP client afterwards"""
+    async def wrapper():
+        try:
+            return await coroutine
+        finally:
+            await close_http_client()
+    return asyncio.run(wrapper())
+
+
+def test_miss_schedules_one_background_refresh(standin, tmp_path):
+    cache = SpeciesCache(str(tmp_path / "species.sqlite"), standin.pokeapi_base_url)
+
+    async def scenario():
+        flag = {}
+        token = _uncacheable.set(flag)
+        try:
+            first, second = await asyncio.gather(cache.get(1, blocking=False), cache.get(1, blocking=False))
+        finally:
+            _uncacheable.reset(token)
+        assert len(cache._inflight) == 1
+        await cache._inflight[1]
+        return first, second, flag
+
+    first, second, flag = run(scenario())
+
+    assert first == second == DEFAULT_SPECIES_DATA
+    assert flag == {"uncacheable": True}
+    # One species and one pokemon request, despite two concurrent misses
+    assert standin.store.snapshot()["pokeapi"] == 2
+    assert cache.get_cached(1) == BULBASAUR
+    assert cache.stats() == {"stored": 1, "inMemory": 1, "hits": 0, "misses": 2}
+
+
+def test_blocking_miss_returns_fetched_data(standin, tmp_path):
+    cache = SpeciesCache(str(tmp_path / "species.sqlite"), standin.pokeapi_base_url)
+
+    async def scenario():
+        flag = {}
+        token = _uncacheable.set(flag)
+        try:
+            return await cache.get(1, blocking=True), flag
+        finally:
+            _uncacheable.reset(token)
+
+    data, flag = run(scenario())
+
+    assert data == BULBASAUR
+    assert flag == {}
+
+
+def test_failed_refresh_keeps_defaults(standin, tmp_path):
+    cache = SpeciesCache(str(tmp_path / "species.sqlite"), standin.pokeapi_base_url)
+
+    data = run(cache.get(9999, blocking=True))
+
+    assert data == DEFAULT_SPECIES_DATA
+    assert cache.get_cached(9999) is None
+
+
+def test_warm_cache_serves_with_network_down(standin, tmp_path):
+    path = str(tmp_path / "species.sqlite")
+    run(SpeciesCache(path, standin.pokeapi_base_url).prefetch([1, 4]))
+
+    # A new process: empty memory tier, SQLite file on disk, upstream gone
+    offline = SpeciesCache(path, UNREACHABLE_URL, memory_size=1)
+
+    async def scenario():
+        return [await offline.get(pokemon_id, blocking=True) for pokemon_id in (1, 4, 1)]
+
+    assert run(scenario())[0] == BULBASAUR
+    assert offline.stats() == {"stored": 2, "inMemory": 1, "hits": 3, "misses": 0}
+    assert offline._inflight == {}
+
+
+def test_prefetch_counts(standin, tmp_path):
+    cache = SpeciesCache(str(tmp_path / "species.sqlite"), standin.pokeapi_base_url)
+    cache.put(1, BULBASAUR)
+
+    summary = run(cache.prefetch([1, 4, 4, 9999], concurrency=2))
+
+    assert summary == {"requested": 3, "cached": 1, "fetched": 1, "failed": 1}
+    assert cache.get_cached(4) == {"height": 6, "weight": 85, "category": "Lizard Pokémon"}
+    assert run(cache.prefetch([1, 4])) == {"requested": 2, "cached": 2, "fetched": 0, "failed": 0}
+
+
+def test_refresh_writes_off_the_event_loop(standin, tmp_path):
+    cache = SpeciesCache(str(tmp_path / "species.sqlite"), standin.pokeapi_base_url)
+    put = cache.put
+    writers = []
+
+    def recording_put(pokemon_id, data):
+        writers.append(threading.current_thread())
+        put(pokemon_id, data)
+
+    cache.put = recording_put
+
+    assert run(cache.refresh(1)) == BULBASAUR
+    assert writers and writers[0] is not threading.main_thread()
+    assert cache.get_cached(1) == BULBASAUR
@@ -0,0 +1,43 @@
+"""Team builder masks and search budget"""
+import pytest
+
+from domain.type_chart import AGAINST_TYPES
+from services.memory_store import PokedexStore
+from services.team_builder import TEAM_SIZE, TeamBuilder, type_mask_names
+
+
+@pytest.fixture(scope="module")
+def builder():
+    return TeamBuilder(PokedexStore.from_turtle())
+
+
+def test_type_weak_comes_from_the_chart(builder):
+    weak = dict(zip(AGAINST_TYPES, (type_mask_names(int(mask)) for mask in builder.type_weak)))
+
+    assert weak["fight"] == ["Fairy", "Flying", "Psychic"]
+    assert weak["normal"] == ["Fighting"]
+    assert weak["steel"] == ["Fighting", "Fire", "Ground"]
+
+
+def test_members_use_display_type_names(builder):
+    result = builder.build(team=[68, 150], size=2)
+
+    assert [member["types"] for member in result["team"]] == [["Fighting"], ["Psychic"]]
+    assert "Psychic" in result["team"][0]["weakTo"]
+    assert "Fighting" in result["team"][1]["resistantTo"]
+
+
+def test_team_is_completed_within_budget(builder):
+    result = builder.build(team=[25])
+
+    assert len(result["team"]) == TEAM_SIZE
+    assert result["team"][0]["id"] == 25 and result["team"][0]["fixed"]
+    assert result["converged"]
+
+
+def test_exhausted_budget_still_fills_the_team(builder):
+    result = builder.build(team=[25], exclude=[493], budget_ms=0)
+
+    assert not result["converged"]
+    assert len(result["team"]) == TEAM_SIZE
+    assert 493 not in [member["id"] for member in result["team"]]
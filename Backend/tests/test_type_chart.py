@@ -0,0 +1,26 @@
+"""Derived type-chart multipliers vs the stored effectiveness triples"""
+from config import TTL_DATA_DIR
+from domain import pokemon_logic
+from ingest.check_type_chart import compare, read_stored
+from services.memory_store import PokedexStore
+
+
+def test_derived_multipliers_match_stored_triples():
+    store = PokedexStore.from_turtle()
+    stored = read_stored(TTL_DATA_DIR)
+
+    matching, inconsistent = compare(store, stored)
+
+    assert inconsistent == []
+    assert matching == len(set(store.ids) & set(stored))
+
+
+def test_wrong_base_form_type2_is_inconsistent(monkeypatch):
+    monkeypatch.setitem(pokemon_logic.FORM_TYPE2, "Mewtwo", "Fighting")
+    store = PokedexStore.from_turtle()
+
+    _, inconsistent = compare(store, read_stored(TTL_DATA_DIR))
+
+    assert [(pokemon_id, name, types) for pokemon_id, name, types, _ in inconsistent] == [
+        (150, "Mewtwo", ["Psychic"])
+    ]
@@ -0,0 +1,56 @@
+"""Helpers for IRIs, form names and image URLs shared by the services and routes"""
+import re
+from typing import List, Optional
+
+from config import POKEMON_COM_IMAGE_BASE_URL
+
+
+# Alternate forms are stored as "<Species><Form>" (e.g. "CharizardMega Charizard X"),
+# so a lowercase letter directly followed by an uppercase one marks a form suffix
+_FORM_SUFFIX_RE = re.compile(r"(?<=[a-z])(?=[A-Z])")
+
+# Form suffixes pokemon.com shows first for Pokemon that have no plain-named form
+DEFAULT_FORM_SUFFIXES = (
+    "Normal Forme", "Altered Forme", "Land Forme", "Incarnate Forme", "Ordinary Forme",
+    "Aria Forme", "Shield Forme", "Standard Mode", "Average Size", "Plant Cloak",
+    "Hoopa Confined", "Male",
+)
+
+
+def extract_value_from_uri(uri: str) -> str:
+    """Local name of an IRI (e.g. "http://example.org/types/Fire" -> "Fire")"""
+    return re.split(r"[/#]", uri.rstrip("/"))[-1]
+
+
+def is_base_form(name: str) -> bool:
+    """Whether a form name is the Pokemon's default form (listed first, plain image)"""
+    if name.endswith(DEFAULT_FORM_SUFFIXES):
+        return True
+    return _FORM_SUFFIX_RE.search(name) is None
+
+
+def format_pokemon_name(name: str) -> str:
+    """Display name of a form name
+
+    "CharizardMega Charizard X" -> "Mega Charizard X", "DeoxysAttack Forme" ->
+    "Deoxys Attack Forme"; plain names are returned unchanged.
+    """
+    parts = _FORM_SUFFIX_RE.split(name, maxsplit=1)
+    if len(parts) == 1:
+        return name
+    species, form = parts
+    return form if species in form else f"{species} {form}"
+
+
+def get_pokemon_image_url(pokemon_id: int, name: str, forms: Optional[List[dict]] = None) -> str:
+    """pokemon.com image of a form: NNN.png for the first form, NNN_fK.png for the K-th
+
+    Args:
+        pokemon_id: National dex number
+        name: Form name
+        forms: The Pokemon's forms (dicts with a "name" key), base form first
+    """
+    base_url = f"{POKEMON_COM_IMAGE_BASE_URL}/{pokemon_id:03d}"
+    names = [form["name"] for form in forms or []]
+    form_index = names.index(name) if name in names else 0
+    return f"{base_url}.png" if form_index == 0 else f"{base_url}_f{form_index + 1}.png"
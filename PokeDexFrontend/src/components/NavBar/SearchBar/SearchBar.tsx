@@ -1,6 +1,6 @@
 import {useState, useEffect, useRef} from 'react';
 import {usePokemon} from '../../../contexts/PokemonContext';
-import { getSearchList, getPokemonByName } from '../../../services/PokemonApiService';
+import { searchPokemon, getPokemonByName } from '../../../services/PokemonApiService';
 import type {Pokemon} from '../../../Types/Pokemon';
 import TypeCard from '../../Shared/TypeCard/TypeCard';
 import './SearchBar.css';
@@ -10,31 +10,29 @@ function SearchBar() {
     const {setSelectedPokemon} = usePokemon();
     const [searchText, setSearchText] = useState('');
     const [showDropdown, setShowDropdown] = useState(false);
-    const [allPokemon, setAllPokemon] = useState<Pokemon[]>([]);
-    const [loading, setLoading] = useState(true);
+    const [filteredPokemon, setFilteredPokemon] = useState<Pokemon[]>([]);
+    const [loading, setLoading] = useState(false);
     const searchRef = useRef<HTMLDivElement>(null);
 
-    // Load Pokemon search list on component mount (lightweight)
+    // Ask the backend typeahead index for suggestions as the user types
     useEffect(() => {
-        async function loadPokemon() {
-            try {
-                const pokemon = await getSearchList(1000);
-                console.log('Loaded search list count:', pokemon.length);
-                setAllPokemon(pokemon);
-            } catch (error) {
-                console.error('Failed to load search list:', error);
-            } finally {
-                setLoading(false);
-            }
+        const query = searchText.trim();
+        if (!query) {
+            setFilteredPokemon([]);
+            return;
         }
-        loadPokemon();
-    }, []);
 
-    const filteredPokemon = searchText.trim() 
-        ? allPokemon
-            .filter(pokemon => pokemon.name.toLowerCase().includes(searchText.toLowerCase()))
-            .slice(0, 20) // Limit to 20 results for performance
-        : [];
+        let cancelled = false;
+        setLoading(true);
+        searchPokemon(query, 20).then(results => {
+            // Ignore responses for text the user has already changed
+            if (!cancelled) {
+                setFilteredPokemon(results);
+                setLoading(false);
+            }
+        });
+        return () => { cancelled = true; };
+    }, [searchText]);
 
     // Handle click outside to close dropdown
     useEffect(() => {
@@ -1,7 +1,7 @@
 import "./EvolutionChain.css";
 import EvolutionCard from "../../Shared/PokemonCard/Pokemoncard";
 import { usePokemon } from "../../../contexts/PokemonContext";
-import { getPokemonCardById, searchPokemonById } from "../../../services/PokemonApiService";
+import { getPokemonCardsBatch, searchPokemonById } from "../../../services/PokemonApiService";
 import { getTypeColor } from "../../../Types/PokemonType";
 import { useState, useEffect } from "react";
 
@@ -26,13 +26,10 @@ export default function EvolutionChain() {
       if (!selectedPokemon?.evolutionChain) return;
       
       try {
-        // Load card data for each Pokemon in the evolution chain
-        const cards = await Promise.all(
-          selectedPokemon.evolutionChain.map(async (id) => {
-            const card = await getPokemonCardById(id);
-            return card || { id, name: 'Unknown', types: [], imageUrl: '' };
-          })
-        );
+        // Load card data for the whole evolution chain in one request
+        const chain = selectedPokemon.evolutionChain;
+        const batch = await getPokemonCardsBatch(chain);
+        const cards = chain.map((id, i) => batch[i] || { id, name: 'Unknown', types: [], imageUrl: '' });
         setEvolutionChain(cards);
       } catch (error) {
         console.error('Failed to load evolution chain:', error);
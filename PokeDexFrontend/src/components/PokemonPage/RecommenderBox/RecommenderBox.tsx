@@ -3,7 +3,7 @@ import PokemonCard from "../../Shared/PokemonCard/Pokemoncard";
 import { useState, useEffect } from "react";
 
 import { usePokemon } from "../../../contexts/PokemonContext";
-import { getRecommendations, getPokemonCardById, searchPokemonById } from "../../../services/PokemonApiService";
+import { getRecommendations, getPokemonCardsBatch, searchPokemonById } from "../../../services/PokemonApiService";
 import { getTypeColor } from "../../../Types/PokemonType";
 
 const MAX_RECOMMENDATIONS = 5;
@@ -24,20 +24,14 @@ export default function RecommenderBox() {
             try {
                 const recommendations = await getRecommendations(selectedPokemon.id, MAX_RECOMMENDATIONS);
                 
-                // Load card data for each recommendation
-                const bestCards = await Promise.all(
-                    recommendations.best.map(async (rec) => {
-                        const card = await getPokemonCardById(rec.id);
-                        return card || { id: rec.id, name: rec.name, types: [], imageUrl: '' };
-                    })
-                );
-                
-                const worstCards = await Promise.all(
-                    recommendations.worst.map(async (rec) => {
-                        const card = await getPokemonCardById(rec.id);
-                        return card || { id: rec.id, name: rec.name, types: [], imageUrl: '' };
-                    })
+                // Load card data for all recommendations in one request
+                const recs = [...recommendations.best, ...recommendations.worst];
+                const cards = await getPokemonCardsBatch(recs.map((rec) => rec.id));
+                const allCards = recs.map((rec, i) =>
+                    cards[i] || { id: rec.id, name: rec.name, types: [], imageUrl: '' }
                 );
+                const bestCards = allCards.slice(0, recommendations.best.length);
+                const worstCards = allCards.slice(recommendations.best.length);
                 
                 setBestMatches(bestCards);
                 setWorstMatches(worstCards);
@@ -59,6 +59,22 @@ export async function getSearchList(limit: number = 1000): Promise<Pokemon[]> {
   }
 }
 
+/**
+ * Get ranked typeahead suggestions for a (partial) Pokemon name
+ * @param query - Text typed by the user
+ * @param limit - Maximum number of suggestions (default: 20)
+ */
+export async function searchPokemon(query: string, limit: number = 20): Promise<Pokemon[]> {
+  try {
+    const response = await fetch(`${API_BASE_URL}/pokemon/typeahead?q=${encodeURIComponent(query)}&limit=${limit}`);
+    const data = await handleResponse<any[]>(response);
+    return data.map(toPokemon);
+  } catch (error) {
+    console.error('Error fetching search suggestions:', error);
+    return [];
+  }
+}
+
 /**
  * Get all Pokemon from the API
  * @param limit - Maximum number of Pokemon to fetch (default: 151)
@@ -145,6 +161,31 @@ export async function getPokemonCardById(id: number): Promise<{ id: number; name
   }
 }
 
+/**
+ * Get card data for many Pokemon in a single request
+ * @param ids - Pokemon IDs (at most a few hundred)
+ * @returns Cards in request order; undefined for IDs that were not found
+ */
+export async function getPokemonCardsBatch(ids: number[]): Promise<({ id: number; name: string; types: string[]; imageUrl: string } | undefined)[]> {
+  if (ids.length === 0) return [];
+  try {
+    const response = await fetch(`${API_BASE_URL}/pokemon/batch`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ ids, level: 'card' })
+    });
+    const data = await handleResponse<{ results: { id: number; status: number; data?: any }[] }>(response);
+    return data.results.map((result) =>
+      result.status === 200 && result.data
+        ? { id: result.data.id, name: result.data.name, types: result.data.types, imageUrl: result.data.imageUrl }
+        : undefined
+    );
+  } catch (error) {
+    console.error('Error fetching Pokemon cards batch:', error);
+    return ids.map(() => undefined);
+  }
+}
+
 /**
  * Search for Pokemon by name (case-insensitive, partial match)
  * @param name - The name to search for
@@ -229,8 +270,8 @@ export async function getRecommendations(
   limit: number = 5
 ): Promise<{
   target: { id: number; name: string };
-  best: Array<{ id: number; name: string; score: number }>;
-  worst: Array<{ id: number; name: string; score: number }>;
+  best: Array<{ id: number; name: string; score: number; offense: number; defense: number }>;
+  worst: Array<{ id: number; name: string; score: number; offense: number; defense: number }>;
 }> {
   try {
     const response = await fetch(
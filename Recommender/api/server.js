@@ -1,5 +1,6 @@
 import express from "express";
 import cors from "cors";
+import { resistantTo, weakTo } from "./typeChart.js";
 
 const app = express();
 app.use(cors());
@@ -29,6 +30,7 @@ async function sparql(query) {
 const PREFIXES = `
 PREFIX ex: <http://example.org/>
 PREFIX poke_simple: <http://example.org/pokemon/simple/>
+PREFIX type: <http://example.org/types/>
 `;
 
 // turns data into array rows
@@ -54,14 +56,33 @@ LIMIT ${Number(limit)}
   return sparql(q);
 }
 
-// Recommendation query builder
-function recommendQuery({ targetId, relation, limit }) {
+// Types of the target (weaknesses are derived from these with the type chart)
+async function findPokemonTypes(id) {
+  const q = `
+${PREFIXES}
+SELECT ?t1 ?t2
+WHERE {
+  poke_simple:${Number(id)} ex:type1 ?t1 .
+  OPTIONAL { poke_simple:${Number(id)} ex:type2 ?t2 . }
+}
+`;
+  const bindings = (await sparql(q)).results.bindings;
+  const local = (uri) => uri.split("/").pop();
+  const type1 = bindings.map(b => local(b.t1.value))[0];
+  const type2s = [...new Set(bindings.filter(b => b.t2).map(b => local(b.t2.value)))];
+  // Alternate forms share one resource; several type2 values cannot be tied
+  // to the base form, so only an unambiguous type2 is used
+  return [type1, ...(type2s.length === 1 ? type2s : [])].filter(Boolean);
+}
+
+// Recommendation query builder (types: type names the candidates should have)
+function recommendQuery({ targetId, types, limit }) {
   return `
 ${PREFIXES}
 SELECT ?candId ?candName (SUM(?match) AS ?score)
 WHERE {
   BIND(poke_simple:${Number(targetId)} AS ?target)
-  ?target ex:${relation} ?type .
+  VALUES ?type { ${types.map(t => `type:${t}`).join(" ")} }
 
   ?cand a ex:Pokemon ;
         ex:number ?candId ;
@@ -125,9 +146,14 @@ app.get("/api/recommend", async (req, res) => {
     name: pokemon.name.value
   };
 
+  const types = await findPokemonTypes(target.id);
+  const empty = { results: { bindings: [] } };
+  const recommend = (typeList) =>
+    typeList.length ? sparql(recommendQuery({ targetId: target.id, types: typeList, limit })) : empty;
+
   const [best, worst] = await Promise.all([ //waits until both queries are done
-    sparql(recommendQuery({ targetId: target.id, relation: "weakTo", limit })),  //query for best 
-    sparql(recommendQuery({ targetId: target.id, relation: "resistantTo", limit })) //query for worst 
+    recommend(weakTo(types)),  //query for best 
+    recommend(resistantTo(types)) //query for worst 
   ]);
 
  //takes the SPARQL result data and convert each row to a simple JS object for frontend
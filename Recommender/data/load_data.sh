@@ -7,7 +7,6 @@ FILES=(
   "pokemon_simple.ttl"
   "pokemon_evolution_links.ttl"
   "pokemon_abilities_aligned.ttl"
-  "pokemon_type_effectiveness_aligned.ttl"
   "poke_ontology.ttl"
 )
 
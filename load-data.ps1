@@ -19,8 +19,7 @@ Write-Host ""
 $files = @(
     "Recommender\data\pokemon_simple.ttl",
     "Recommender\data\pokemon_abilities_aligned.ttl",
-    "Recommender\data\pokemon_evolution_links.ttl",
-    "Recommender\data\pokemon_type_effectiveness_aligned.ttl"
+    "Recommender\data\pokemon_evolution_links.ttl"
 )
 
 # Load each file
@@ -0,0 +1,373 @@
+"""Concurrent, rate-limited, resumable PokeAPI crawler for the stats Turtle file
+
+Replaces the sequential loop that used to live in info.py. Every raw
+response is written to an on-disk cache (one JSON file per resource), and
+a checkpoint file records which ids are done, so an interrupted run picks
+up where it stopped and a finished run can rebuild the Turtle file without
+touching the network.
+
+Usage:
+    python crawler.py                                  # crawl pokeapi.co
+    python crawler.py --concurrency 16 --rate 20       # faster, still polite
+    python crawler.py --base-url http://127.0.0.1:8765 # offline, see replay_server.py
+
+The cache directory has the same layout as the replay server's fixtures
+(<cache>/pokemon/<id>.json), so a recorded crawl can be replayed as-is.
+
+Requires httpx (and rdflib for the Turtle output).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+import httpx
+
+
+DEFAULT_BASE_URL = "https://pokeapi.co/api/v2"
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Async token bucket: at most `rate` requests per second, bursts up to `burst`"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def _write_json_atomic(path: str, data):
+    """Write JSON via a temp file + rename so a crash never leaves half a file"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+class RawCache:
+    """Raw API responses on disk: <root>/<resource path>.json"""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, resource: str) -> str:
+        return os.path.join(self.root, *resource.strip("/").split("/")) + ".json"
+
+    def get(self, resource: str) -> Optional[dict]:
+        try:
+            with open(self.path(resource), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, resource: str, data: dict):
+        _write_json_atomic(self.path(resource), data)
+
+
+class Checkpoint:
+    """Crawl progress on disk: total, completed ids and ids that gave up"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.total: Optional[int] = None
+        self.done: Set[int] = set()
+        self.failed: Dict[int, str] = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+            self.total = state.get("total")
+            # Failed ids are not loaded back: the next run simply retries them
+            self.done = set(state.get("done", []))
+
+    def save(self):
+        _write_json_atomic(self.path, {
+            "total": self.total,
+            "done": sorted(self.done),
+            "failed": {str(pokemon_id): reason for pokemon_id, reason in sorted(self.failed.items())},
+        })
+
+
+class Progress:
+    """Periodic progress/throughput line: done, cache hits, failures, req/s, ETA"""
+
+    def __init__(self, total: int, interval: float = 2.0):
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self.fetched = 0
+        self.cached = 0
+        self.failed = 0
+        self.retries = 0
+        self.started = time.monotonic()
+        self._last_report = self.started
+
+    def tick(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._last_report < self.interval:
+            return
+        self._last_report = now
+        elapsed = max(now - self.started, 1e-9)
+        rate = self.done / elapsed
+        remaining = self.total - self.done
+        eta = f"{remaining / rate:.0f}s" if rate > 0 and remaining else "-"
+        print(f"[{self.done}/{self.total}] fetched={self.fetched} cached={self.cached} "
+              f"failed={self.failed} retries={self.retries} "
+              f"{rate:.1f} ids/s ({self.fetched / elapsed:.1f} req/s) eta={eta}")
+
+
+class Crawler:
+    """Bounded-concurrency PokeAPI client with rate limiting, backoff and a raw cache
+
+    Args:
+        base_url: API root (PokeAPI or a replay server)
+        cache_dir: Directory for raw responses
+        concurrency: Maximum requests in flight
+        rate: Maximum requests per second (0 disables the limiter)
+        max_retries: Retries per resource on 429/5xx/connection errors
+        backoff_base: First backoff delay in seconds (doubled on every retry, with jitter)
+        backoff_max: Cap on a single backoff delay
+        timeout: Per-request timeout in seconds
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        cache_dir: str = "pokeapi_cache",
+        concurrency: int = 8,
+        rate: float = 10.0,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        timeout: float = 30.0
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.cache = RawCache(cache_dir)
+        self.concurrency = max(1, concurrency)
+        self.limiter = TokenBucket(rate, burst=self.concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.progress: Optional[Progress] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "Crawler":
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        self._client = httpx.AsyncClient(timeout=self.timeout, limits=limits, follow_redirects=True)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+        self._client = None
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Delay before retry number `attempt` (Retry-After wins when the server sends one)"""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        delay = min(self.backoff_base * (2 ** attempt), self.backoff_max)
+        return random.uniform(delay / 2, delay)
+
+    async def get_json(self, resource: str, params: Optional[dict] = None) -> dict:
+        """GET base_url/resource with rate limiting and retries
+
+        Raises:
+            httpx.HTTPError: When the request still fails after max_retries
+        """
+        url = f"{self.base_url}/{resource.strip('/')}"
+        attempt = 0
+        while True:
+            await self.limiter.acquire()
+            try:
+                response = await self._client.get(url, params=params)
+                if response.status_code not in RETRY_STATUS:
+                    response.raise_for_status()
+                    return response.json()
+                retry_after = response.headers.get("Retry-After")
+                error: Exception = httpx.HTTPStatusError(
+                    f"HTTP {response.status_code} for {url}", request=response.request, response=response
+                )
+            except httpx.TransportError as e:
+                retry_after = None
+                error = e
+
+            if attempt >= self.max_retries:
+                raise error
+            if self.progress:
+                self.progress.retries += 1
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+            attempt += 1
+
+    async def fetch(self, resource: str) -> dict:
+        """Cached GET: the raw cache is consulted first and filled on success"""
+        data = self.cache.get(resource)
+        if data is not None:
+            if self.progress:
+                self.progress.cached += 1
+            return data
+        data = await self.get_json(resource)
+        self.cache.put(resource, data)
+        if self.progress:
+            self.progress.fetched += 1
+        return data
+
+    async def pokemon_count(self) -> int:
+        return (await self.get_json("pokemon", params={"limit": 1}))["count"]
+
+    async def crawl(self, ids: Iterable[int], checkpoint: Checkpoint, save_every: int = 25):
+        """Fetch /pokemon/{id} for every id not yet in the checkpoint
+
+        Work is spread over `concurrency` workers pulling from a queue, so
+        memory stays flat however many ids there are. The checkpoint is
+        saved every `save_every` completions and at the end (also on
+        Ctrl+C / cancellation).
+        """
+        pending = [pokemon_id for pokemon_id in ids if pokemon_id not in checkpoint.done]
+        self.progress = Progress(len(pending))
+        queue: asyncio.Queue = asyncio.Queue()
+        for pokemon_id in pending:
+            queue.put_nowait(pokemon_id)
+        since_save = 0
+
+        async def worker():
+            nonlocal since_save
+            while True:
+                try:
+                    pokemon_id = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    await self.fetch(f"pokemon/{pokemon_id}")
+                    checkpoint.done.add(pokemon_id)
+                    checkpoint.failed.pop(pokemon_id, None)
+                except (httpx.HTTPError, ValueError) as e:
+                    reason = f"HTTP {e.response.status_code}" if isinstance(e, httpx.HTTPStatusError) else repr(e)
+                    checkpoint.failed[pokemon_id] = reason
+                    self.progress.failed += 1
+                    print(f"Failed Pokemon ID {pokemon_id}: {reason}")
+                self.progress.done += 1
+                since_save += 1
+                if since_save >= save_every:
+                    since_save = 0
+                    checkpoint.save()
+                self.progress.tick()
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(pending)) or 1)))
+        finally:
+            checkpoint.save()
+            self.progress.tick(force=True)
+
+
+def build_stats_graph(cache: RawCache, ids: Iterable[int]):
+    """rdflib Graph with one ex:Pokemon + base stats per cached /pokemon/{id} response"""
+    from rdflib import Graph, Literal, Namespace, URIRef
+    from rdflib.namespace import RDF, XSD
+
+    POKEMON = Namespace("http://example.org/pokemon/")
+    EX = Namespace("http://example.org/ontology/")
+
+    g = Graph()
+    g.bind("pokemon", POKEMON)
+    g.bind("ex", EX)
+
+    for pokemon_id in ids:
+        data = cache.get(f"pokemon/{pokemon_id}")
+        if data is None:
+            continue
+        name = data["name"]
+        pokemon_uri = URIRef(POKEMON[name])
+
+        g.add((pokemon_uri, RDF.type, EX.Pokemon))
+        g.add((pokemon_uri, EX.name, Literal(name, datatype=XSD.string)))
+
+        for stat in data["stats"]:
+            stat_name = stat["stat"]["name"].replace("-", "_")
+            g.add((pokemon_uri, EX[stat_name], Literal(stat["base_stat"], datatype=XSD.integer)))
+    return g
+
+
+async def run(args: argparse.Namespace) -> int:
+    checkpoint = Checkpoint(args.checkpoint)
+    async with Crawler(
+        base_url=args.base_url,
+        cache_dir=args.cache_dir,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        max_retries=args.max_retries,
+        backoff_base=args.backoff,
+    ) as crawler:
+        if args.limit:
+            total = args.limit
+        elif checkpoint.total:
+            total = checkpoint.total
+        else:
+            total = await crawler.pokemon_count()
+        checkpoint.total = total
+        print(f"Total Pokemon found: {total} ({len(checkpoint.done)} already done)")
+
+        ids: List[int] = list(range(1, total + 1))
+        started = time.monotonic()
+        await crawler.crawl(ids, checkpoint)
+        elapsed = time.monotonic() - started
+        progress = crawler.progress
+        print(f"Crawled {progress.done} ids in {elapsed:.1f}s "
+              f"({progress.fetched} fetched, {progress.cached} from cache, {progress.failed} failed)")
+
+    if checkpoint.failed:
+        print(f"{len(checkpoint.failed)} ids failed; rerun to retry them: {sorted(checkpoint.failed)}")
+
+    if args.output:
+        g = build_stats_graph(crawler.cache, ids)
+        g.serialize(destination=args.output, format="turtle")
+        print(f"RDF saved to {args.output}")
+        print("Total triples:", len(g))
+
+    return 1 if checkpoint.failed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Crawl PokeAPI /pokemon/{id} into a stats Turtle file")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="API root (default: %(default)s)")
+    parser.add_argument("--cache-dir", default="pokeapi_cache", help="Raw response cache directory")
+    parser.add_argument("--checkpoint", default="crawl_checkpoint.json", help="Checkpoint file")
+    parser.add_argument("--output", default="pokemon_stats_all.ttl",
+                        help="Turtle output file (empty string to skip)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight")
+    parser.add_argument("--rate", type=float, default=10.0, help="Max requests per second (0 = unlimited)")
+    parser.add_argument("--max-retries", type=int, default=5, help="Retries per id on 429/5xx/errors")
+    parser.add_argument("--backoff", type=float, default=0.5, help="Initial backoff delay in seconds")
+    parser.add_argument("--limit", type=int, default=0, help="Only crawl ids 1..LIMIT")
+    args = parser.parse_args(argv)
+
+    try:
+        return asyncio.run(run(args))
+    except KeyboardInterrupt:
+        print(f"Interrupted; progress saved to {args.checkpoint}")
+        return 130
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,105 @@
+"""Offline stand-in for PokeAPI that replays recorded JSON fixtures
+
+Serves <fixtures>/<path>.json for GET /<path> (e.g. /pokemon/25 ->
+fixtures/pokemon/25.json), and answers GET /pokemon?limit=N with a count
+of the recorded Pokemon, which is all crawler.py needs. A crawler cache
+directory is a valid fixtures directory, so a real crawl can be recorded
+once and replayed any number of times.
+
+Faults can be injected to exercise the crawler's retry/backoff path.
+
+Usage:
+    python replay_server.py --port 8765
+    python replay_server.py --port 8765 --fail-rate 0.2 --latency 0.05
+    python crawler.py --base-url http://127.0.0.1:8765 --cache-dir /tmp/replay_cache
+
+Standard library only.
+"""
+import argparse
+import json
+import os
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pokeapi")
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    fixtures_dir = DEFAULT_FIXTURES
+    fail_rate = 0.0
+    latency = 0.0
+    quiet = False
+
+    def _send_json(self, status: int, data, headers: dict = None):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _pokemon_count(self) -> int:
+        directory = os.path.join(self.fixtures_dir, "pokemon")
+        if not os.path.isdir(directory):
+            return 0
+        ids = [int(name[:-5]) for name in os.listdir(directory)
+               if name.endswith(".json") and name[:-5].isdigit()]
+        return max(ids, default=0)
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail_rate and random.random() < self.fail_rate:
+            status = random.choice((429, 503))
+            headers = {"Retry-After": "0"} if status == 429 else None
+            self._send_json(status, {"detail": "injected failure"}, headers)
+            return
+
+        path = urlsplit(self.path).path.strip("/")
+        if path == "pokemon":
+            self._send_json(200, {"count": self._pokemon_count(), "results": []})
+            return
+
+        file_path = os.path.join(self.fixtures_dir, *path.split("/")) + ".json"
+        fixtures_root = os.path.abspath(self.fixtures_dir)
+        if not os.path.abspath(file_path).startswith(fixtures_root + os.sep) or not os.path.isfile(file_path):
+            self._send_json(404, {"detail": "Not Found"})
+            return
+        with open(file_path, encoding="utf-8") as f:
+            self._send_json(200, json.load(f))
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded PokeAPI JSON fixtures")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="Fixtures (or crawler cache) directory")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered 429/503")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of delay per request")
+    parser.add_argument("--quiet", action="store_true", help="Do not log requests")
+    args = parser.parse_args()
+
+    ReplayHandler.fixtures_dir = args.fixtures
+    ReplayHandler.fail_rate = args.fail_rate
+    ReplayHandler.latency = args.latency
+    ReplayHandler.quiet = args.quiet
+
+    server = ThreadingHTTPServer((args.host, args.port), ReplayHandler)
+    print(f"Replaying {args.fixtures} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""Shared test setup: the scripts are imported the way they are run (from ontol_kde/)"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,160 @@
+"""Crawler and Checkpoint against the replay server"""
+import asyncio
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from crawler import Checkpoint, Crawler
+from replay_server import ReplayHandler
+
+
+def _pokemon(pokemon_id: int) -> dict:
+    return {
+        "id": pokemon_id,
+        "name": f"pokemon-{pokemon_id}",
+        "stats": [{"base_stat": 40 + pokemon_id, "stat": {"name": "hp"}}],
+    }
+
+
+class ScriptedReplayHandler(ReplayHandler):
+    """Replay handler that logs request paths and answers scripted faults first
+
+    `faults` maps a path to the statuses (and Retry-After values) to send,
+    in order, before the fixture is served.
+    """
+
+    quiet = True
+    requests: list = None
+    faults: dict = None
+
+    def do_GET(self):
+        path = self.path.split("?")[0].strip("/")
+        self.requests.append(path)
+        pending = self.faults.get(path)
+        if pending:
+            status, retry_after = pending.pop(0)
+            headers = {"Retry-After": retry_after} if retry_after is not None else None
+            self._send_json(status, {"detail": "scripted failure"}, headers)
+            return
+        super().do_GET()
+
+
+@pytest.fixture
+def replay(tmp_path):
+    fixtures = tmp_path / "fixtures"
+    (fixtures / "pokemon").mkdir(parents=True)
+    for pokemon_id in range(1, 7):
+        (fixtures / "pokemon" / f"{pokemon_id}.json").write_text(json.dumps(_pokemon(pokemon_id)))
+
+    handler = type("Replay", (ScriptedReplayHandler,),
+                   {"fixtures_dir": str(fixtures), "requests": [], "faults": {}})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    handler.fixtures = fixtures
+    handler.base_url = "http://127.0.0.1:%d" % server.server_address[1]
+    yield handler
+    server.shutdown()
+    server.server_close()
+
+
+def crawl(replay, tmp_path, ids, **options) -> Crawler:
+    """Run one crawl of `ids` with a fresh Checkpoint object (as a new process would)"""
+    options = {"concurrency": 3, "rate": 0, "max_retries": 2, "backoff_base": 0.01, **options}
+
+    async def run():
+        async with Crawler(replay.base_url, str(tmp_path / "cache"), **options) as crawler:
+            await crawler.crawl(ids, Checkpoint(str(tmp_path / "checkpoint.json")))
+            return crawler
+
+    return asyncio.run(run())
+
+
+def saved_checkpoint(tmp_path) -> dict:
+    return json.loads((tmp_path / "checkpoint.json").read_text())
+
+
+def test_crawl_fills_cache_and_checkpoint(replay, tmp_path):
+    crawler = crawl(replay, tmp_path, range(1, 7))
+
+    assert saved_checkpoint(tmp_path) == {"total": None, "done": [1, 2, 3, 4, 5, 6], "failed": {}}
+    assert crawler.cache.get("pokemon/4") == _pokemon(4)
+    assert (crawler.progress.fetched, crawler.progress.cached) == (6, 0)
+
+
+def test_resume_skips_checkpointed_ids(replay, tmp_path):
+    crawl(replay, tmp_path, range(1, 4))
+    replay.requests.clear()
+
+    crawler = crawl(replay, tmp_path, range(1, 7))
+
+    assert sorted(replay.requests) == ["pokemon/4", "pokemon/5", "pokemon/6"]
+    assert crawler.progress.total == 3
+    assert saved_checkpoint(tmp_path)["done"] == [1, 2, 3, 4, 5, 6]
+
+
+def test_cache_hits_skip_network(replay, tmp_path):
+    crawl(replay, tmp_path, range(1, 7))
+    # Lost checkpoint, intact cache: everything is served from disk
+    (tmp_path / "checkpoint.json").unlink()
+    replay.requests.clear()
+
+    crawler = crawl(replay, tmp_path, range(1, 7))
+
+    assert replay.requests == []
+    assert (crawler.progress.fetched, crawler.progress.cached) == (0, 6)
+    assert saved_checkpoint(tmp_path)["done"] == [1, 2, 3, 4, 5, 6]
+
+
+def test_retries_429_and_5xx(replay, tmp_path):
+    replay.faults.update({
+        "pokemon/1": [(429, None), (503, None)],
+        "pokemon/2": [(500, None)],
+        "pokemon/3": [(502, None), (504, None)],
+    })
+
+    crawler = crawl(replay, tmp_path, range(1, 4))
+
+    assert replay.requests.count("pokemon/1") == 3
+    assert replay.requests.count("pokemon/2") == 2
+    assert replay.requests.count("pokemon/3") == 3
+    assert crawler.progress.retries == 5
+    assert saved_checkpoint(tmp_path)["done"] == [1, 2, 3]
+
+
+def test_retry_after_overrides_backoff(replay, tmp_path):
+    replay.faults["pokemon/1"] = [(429, "0"), (429, "0")]
+
+    started = time.monotonic()
+    # Exponential backoff alone would wait a minute or more before the third attempt
+    crawl(replay, tmp_path, [1], backoff_base=60)
+
+    assert time.monotonic() - started < 10
+    assert replay.requests == ["pokemon/1"] * 3
+    assert Crawler(backoff_max=5)._backoff(0, "2") == 2.0
+    assert Crawler(backoff_max=5)._backoff(0, "120") == 5.0
+
+
+def test_failed_ids_are_retried_on_next_run(replay, tmp_path):
+    replay.faults["pokemon/2"] = [(503, None)] * 3
+    (replay.fixtures / "pokemon" / "5.json").unlink()
+
+    crawl(replay, tmp_path, range(1, 6))
+
+    assert saved_checkpoint(tmp_path) == {
+        "total": None, "done": [1, 3, 4], "failed": {"2": "HTTP 503", "5": "HTTP 404"},
+    }
+    # A missing resource is not worth retrying within a run
+    assert replay.requests.count("pokemon/5") == 1
+
+    (replay.fixtures / "pokemon" / "5.json").write_text(json.dumps(_pokemon(5)))
+    replay.requests.clear()
+
+    crawl(replay, tmp_path, range(1, 6))
+
+    assert sorted(replay.requests) == ["pokemon/2", "pokemon/5"]
+    assert saved_checkpoint(tmp_path) == {"total": None, "done": [1, 2, 3, 4, 5], "failed": {}}